@@ -0,0 +1,81 @@
+"""
+JWT authentication without a per-request user query.
+
+simplejwt's ``JWTAuthentication`` loads the whole user row on every request.
+``CachedJWTAuthentication`` instead keeps the few fields that authorization
+depends on (``is_active``, the staff flags and ``role``) in the cache for
+``AUTH_PRINCIPAL_CACHE_TTL`` seconds and builds ``request.user`` from them.
+The principal is a real ``User`` instance whose other fields are deferred,
+so it still works as a foreign key value and loads anything else on access.
+
+Saving or deleting a user drops the cached state (see ``accounts.signals``),
+so deactivation and role changes apply to the next request, as does a
+password change, which revokes earlier tokens (``CHECK_REVOKE_TOKEN``).
+Writes through ``QuerySet.update()`` send no signals; call
+``forget_principal`` after them or they take effect when the entry expires.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core import timing
+
+PRINCIPAL_FIELDS = ('username', 'role', 'is_active', 'is_staff', 'is_superuser')
+# Cached instead of ``True``/``False`` so a missing user is remembered too.
+MISSING = 'missing'
+
+
+def principal_cache_key(user_id):
+    return f'accounts:principal:{user_id}'
+
+
+def forget_principal(user_id):
+    cache.delete(principal_cache_key(user_id))
+
+
+def _load_state(user_model, user_id):
+    fields = {user_model._meta.pk.attname, api_settings.USER_ID_FIELD, *PRINCIPAL_FIELDS}
+    if api_settings.CHECK_REVOKE_TOKEN:
+        fields.add('password')
+    row = user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).values(*fields).first()
+    if row is None:
+        return MISSING
+    if 'password' in row:
+        # Only the digest the token is compared against is cached.
+        row['password'] = get_md5_hash_password(row['password'])
+    return row
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user_model = get_user_model()
+        key = principal_cache_key(user_id)
+        state = cache.get(key)
+        timing.count_cache(state is not None)
+        if state is None:
+            state = _load_state(user_model, user_id)
+            cache.set(key, state, settings.AUTH_PRINCIPAL_CACHE_TTL)
+
+        if state == MISSING:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not state['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != state.get('password')
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        # from_db() expects values in concrete field order.
+        fields = [field.attname for field in user_model._meta.concrete_fields if field.attname in state]
+        return user_model.from_db(router.db_for_read(user_model), fields, [state[name] for name in fields])
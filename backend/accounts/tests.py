@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .authentication import CachedJWTAuthentication, principal_cache_key
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+    """Cached principals are dropped as soon as the user changes."""
+
+    url = '/api/system/cache/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', password='first', is_staff=True, role='reviewer')
+
+    def setUp(self):
+        cache.clear()
+        self.token = str(AccessToken.for_user(self.user))
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+    def authenticate(self):
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        return CachedJWTAuthentication().authenticate(request)[0]
+
+    def test_cached_principal_runs_no_queries(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_deactivation_applies_to_the_next_request(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_role_change_applies_to_the_next_request(self):
+        self.assertEqual(self.authenticate().role, 'reviewer')
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.user.role = 'admin'
+        self.user.is_staff = False
+        self.user.save()
+        self.assertEqual(self.authenticate().role, 'admin')
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_password_change_revokes_tokens(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.user.set_password('second')
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.token = str(AccessToken.for_user(self.user))
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_deleted_user_is_rejected(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertIsNotNone(cache.get(principal_cache_key(self.user.pk)))
+        get_user_model().objects.filter(pk=self.user.pk).delete()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
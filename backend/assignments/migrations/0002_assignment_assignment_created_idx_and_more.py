@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0001_initial'),
+        ('organizations', '0002_institution_institution_name_idx_and_more'),
+        ('proformas', '0003_proformatemplatesnapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['created_at', 'id'], name='assignment_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='itemstatus',
+            index=models.Index(fields=['created_at', 'id'], name='itemstatus_created_idx'),
+        ),
+    ]
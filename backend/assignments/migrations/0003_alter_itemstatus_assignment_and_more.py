@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0002_assignment_assignment_created_idx_and_more'),
+        ('organizations', '0002_institution_institution_name_idx_and_more'),
+        ('proformas', '0004_alter_proformaitem_section_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='itemstatus',
+            name='assignment',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='item_statuses', to='assignments.assignment'),
+        ),
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='assignment_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='itemstatus',
+            index=models.Index(fields=['assignment', 'item'], name='itemstatus_assignment_item_idx'),
+        ),
+    ]
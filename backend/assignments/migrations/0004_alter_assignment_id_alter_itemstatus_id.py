@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:28
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0003_alter_itemstatus_assignment_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='assignment',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='itemstatus',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -16,6 +16,12 @@ class Assignment(BaseModel):
     title = models.CharField(max_length=255)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='assignment_created_idx'),
+            models.Index(fields=['status', 'created_at', 'id'], name='assignment_status_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} - {self.program.name}"
 
@@ -27,7 +33,8 @@ class ItemStatus(BaseModel):
         ('partial', 'Partial'),
     ]
     
-    assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name='item_statuses')
+    # Indexed by itemstatus_assignment_item_idx.
+    assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name='item_statuses', db_index=False)
     item = models.ForeignKey(ProformaItem, on_delete=models.CASCADE, related_name='statuses')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     comment = models.TextField(blank=True, null=True)
@@ -35,6 +42,10 @@ class ItemStatus(BaseModel):
 
     class Meta:
         verbose_name_plural = "Item Statuses"
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='itemstatus_created_idx'),
+            models.Index(fields=['assignment', 'item'], name='itemstatus_assignment_item_idx'),
+        ]
 
     def __str__(self):
         return f"{self.assignment.title} - {self.item.text[:30]} - {self.status}"
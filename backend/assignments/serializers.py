@@ -1,18 +1,22 @@
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
 from .models import Assignment, ItemStatus
 
-class ItemStatusSerializer(serializers.ModelSerializer):
+class ItemStatusSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     item_text = serializers.CharField(source='item.text', read_only=True)
     
     class Meta:
         model = ItemStatus
         fields = ['id', 'assignment', 'item', 'item_text', 'status', 'comment', 'score']
 
-class AssignmentSerializer(serializers.ModelSerializer):
+class AssignmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     program_name = serializers.CharField(source='program.name', read_only=True)
     template_title = serializers.CharField(source='template.title', read_only=True)
     item_statuses = ItemStatusSerializer(many=True, read_only=True)
+    # Annotated by AssignmentViewSet so lists can show it without expanding.
+    item_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Assignment
-        fields = ['id', 'template', 'template_title', 'program', 'program_name', 'title', 'status', 'item_statuses', 'created_at', 'updated_at']
+        fields = ['id', 'template', 'template_title', 'program', 'program_name', 'title', 'status', 'item_statuses', 'item_count', 'created_at', 'updated_at']
+        expandable_fields = ['item_statuses']
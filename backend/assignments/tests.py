@@ -0,0 +1,152 @@
+from itertools import combinations
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from core.fast_serializers import _mappers
+from modules.models import Module
+from organizations.models import Institution, Program
+from proformas.models import ProformaItem, ProformaSection, ProformaTemplate
+from .models import Assignment, ItemStatus
+from .serializers import ItemStatusSerializer
+
+
+class AssignmentQueryCountTests(APITestCase):
+    """Assignment and item status endpoints read a constant number of queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', is_staff=True)
+        module = Module.objects.create(code='PG', display_name='Postgraduate')
+        cls.template = ProformaTemplate.objects.create(module=module, code='T1', title='Template')
+        section = ProformaSection.objects.create(template=cls.template, title='Section')
+        cls.items = [ProformaItem.objects.create(section=section, text=f'Item {n}', order=n) for n in range(4)]
+        institution = Institution.objects.create(name='Institution')
+        cls.programs = [
+            Program.objects.create(name=f'Program {n}', level='Postgraduate', discipline='Medicine', institution=institution)
+            for n in range(2)
+        ]
+        cls.assignments = [cls.create_assignment(program) for program in cls.programs]
+
+    @classmethod
+    def create_assignment(cls, program):
+        assignment = Assignment.objects.create(template=cls.template, program=program, title=f'{program.name} review')
+        for item in cls.items:
+            ItemStatus.objects.create(assignment=assignment, item=item, status='compliant', score=5)
+        return assignment
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_list(self):
+        # Program and template are joined.
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/assignments/')
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['results'][0]['program_name'], 'Program 1')
+        self.assertEqual(response.data['results'][0]['item_count'], 4)
+        self.assertNotIn('item_statuses', response.data['results'][0])
+
+    def test_item_count_without_item_statuses(self):
+        Assignment.objects.create(template=self.template, program=self.programs[0], title='Empty review')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/assignments/?fields=title,item_count')
+        self.assertEqual(
+            [(row['title'], row['item_count']) for row in response.data['results']],
+            [('Empty review', 0), ('Program 1 review', 4), ('Program 0 review', 4)],
+        )
+
+    def test_list_with_item_statuses(self):
+        # Item statuses and their items in one prefetch.
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/assignments/?expand=item_statuses')
+        self.assertEqual(len(response.data['results'][0]['item_statuses']), 4)
+
+    def test_list_does_not_grow_with_assignments(self):
+        self.create_assignment(self.programs[0])
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/assignments/?expand=item_statuses')
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_retrieve(self):
+        with self.assertNumQueries(1):
+            self.client.get(f'/api/assignments/{self.assignments[0].pk}/')
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/assignments/{self.assignments[0].pk}/?expand=item_statuses')
+        self.assertEqual(len(response.data['item_statuses']), 4)
+
+    def test_item_status_list(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/assignments/item-statuses/')
+        self.assertEqual(len(response.data['results']), 8)
+        self.assertTrue(response.data['results'][0]['item_text'].startswith('Item'))
+
+    def test_item_status_list_of_an_assignment(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/assignments/item-statuses/?assignment={self.assignments[0].pk}')
+        self.assertEqual(len(response.data['results']), 4)
+
+    def test_item_status_retrieve(self):
+        item_status = self.assignments[0].item_statuses.first()
+        with self.assertNumQueries(1):
+            self.client.get(f'/api/assignments/item-statuses/{item_status.pk}/')
+
+
+class ItemStatusFastListParityTests(APITestCase):
+    """The values() list path renders the same bytes as the serializer."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', is_staff=True)
+        module = Module.objects.create(code='PG', display_name='Postgraduate')
+        template = ProformaTemplate.objects.create(module=module, code='T1', title='Template')
+        section = ProformaSection.objects.create(template=template, title='Section')
+        items = [ProformaItem.objects.create(section=section, text=f'Item {n}', order=n) for n in range(2)]
+        program = Program.objects.create(
+            name='Program', level='Postgraduate', discipline='Medicine',
+            institution=Institution.objects.create(name='Institution'),
+        )
+        cls.assignment = Assignment.objects.create(template=template, program=program, title='Review')
+        ItemStatus.objects.create(assignment=cls.assignment, item=items[0], status='compliant', comment='Seen', score=5)
+        ItemStatus.objects.create(assignment=cls.assignment, item=items[1])
+        other = Assignment.objects.create(template=template, program=program, title='Second review')
+        ItemStatus.objects.create(assignment=other, item=items[0], status='partial', score=0)
+        ItemStatus.objects.create(assignment=other, item=items[1], status='noncompliant', comment='')
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def fetch(self, url, fast):
+        with override_settings(FAST_SERIALIZERS_ENABLED=fast):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assert_parity(self, url):
+        pages = 0
+        while url:
+            expected = self.fetch(url, fast=False)
+            self.assertEqual(self.fetch(url, fast=True).content, expected.content, url)
+            url = expected.data['next']
+            pages += 1
+        return pages
+
+    def test_every_field(self):
+        # Every single field, every pair and all of them, over two-row pages.
+        fields = ['id', 'assignment', 'item', 'item_text', 'status', 'comment', 'score']
+        for selection in [None, *(
+            ','.join(names) for size in (1, 2, len(fields)) for names in combinations(fields, size)
+        )]:
+            query = f'&fields={selection}' if selection else ''
+            with self.subTest(query=query):
+                self.assertEqual(self.assert_parity(f'/api/assignments/item-statuses/?page_size=2{query}'), 2)
+        # None would mean the list quietly fell back to the serializer.
+        mappers = [mapper for (cls, _), mapper in _mappers.items() if cls is ItemStatusSerializer]
+        self.assertTrue(mappers)
+        self.assertNotIn(None, mappers)
+
+    def test_filters(self):
+        for query in (f'assignment={self.assignment.pk}', 'page_size=500'):
+            with self.subTest(query=query):
+                self.assert_parity(f'/api/assignments/item-statuses/?{query}')
@@ -2,7 +2,8 @@ from rest_framework.routers import DefaultRouter
 from .views import AssignmentViewSet, ItemStatusViewSet
 
 router = DefaultRouter()
-router.register('', AssignmentViewSet, basename='assignment')
+# Registered before the empty prefix so 'item-statuses/' is not taken as an assignment id.
 router.register('item-statuses', ItemStatusViewSet, basename='itemstatus')
+router.register('', AssignmentViewSet, basename='assignment')
 
 urlpatterns = router.urls
@@ -1,14 +1,102 @@
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from core.fast_serializers import FastListMixin
+from core.serializers import field_requested
+from core.streaming import PassthroughRenderer, export_response
 from .models import Assignment, ItemStatus
 from .serializers import AssignmentSerializer, ItemStatusSerializer
 
+EXPORT_COLUMNS = (
+    ('Assignment', 'assignment__title'),
+    ('Program', 'assignment__program__name'),
+    ('Section', 'item__section__title'),
+    ('Item code', 'item__code'),
+    ('Item', 'item__text'),
+    ('Status', 'status'),
+    ('Comment', 'comment'),
+    ('Score', 'score'),
+    ('Updated at', 'updated_at'),
+)
+
 class AssignmentViewSet(viewsets.ModelViewSet):
     queryset = Assignment.objects.all().order_by('-created_at')
     serializer_class = AssignmentSerializer
     permission_classes = [IsAuthenticated]
 
-class ItemStatusViewSet(viewsets.ModelViewSet):
+    def get_queryset(self):
+        """
+        Join and prefetch only what the requested fields need.
+        """
+        queryset = super().get_queryset()
+        related = [
+            relation
+            for field, relation in (('program_name', 'program'), ('template_title', 'template'))
+            if field_requested(self.request, field)
+        ]
+        if related:
+            queryset = queryset.select_related(*related)
+        if field_requested(self.request, 'item_statuses', expandable=True):
+            queryset = queryset.prefetch_related(
+                Prefetch('item_statuses', queryset=ItemStatus.objects.select_related('item'))
+            )
+        if field_requested(self.request, 'item_count'):
+            # A correlated count keeps the list in created_at index order;
+            # Count() over a join would group and sort every assignment.
+            counts = (
+                ItemStatus.objects.filter(assignment=OuterRef('pk'))
+                .order_by()
+                .values('assignment')
+                .annotate(n=Count('id'))
+                .values('n')
+            )
+            queryset = queryset.annotate(item_count=Coalesce(Subquery(counts), 0))
+        assignment_status = self.request.query_params.get('status', None)
+        if assignment_status:
+            queryset = queryset.filter(status=assignment_status)
+        return queryset
+
+class ItemStatusViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = ItemStatus.objects.all()
     serializer_class = ItemStatusSerializer
     permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if field_requested(self.request, 'item_text'):
+            queryset = queryset.select_related('item')
+        assignment_id = self.request.query_params.get('assignment', None)
+        if assignment_id:
+            queryset = queryset.filter(assignment_id=assignment_id)
+        return queryset
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path=r'export/(?P<file_format>csv|xlsx)',
+        renderer_classes=[PassthroughRenderer],
+    )
+    def export(self, request, file_format):
+        """
+        Stream item statuses as CSV or XLSX, optionally for one ``?assignment=``.
+        """
+        queryset = ItemStatus.objects.all()
+        assignment_id = request.query_params.get('assignment', None)
+        if assignment_id:
+            queryset = queryset.filter(assignment_id=assignment_id)
+
+        rows = (
+            queryset
+            .order_by('assignment__title', 'assignment_id', 'item__section__order', 'item__order', 'id')
+            .values_list(*(field for _, field in EXPORT_COLUMNS))
+            .iterator(chunk_size=2000)
+        )
+        return export_response(
+            'item-statuses',
+            file_format,
+            [title for title, _ in EXPORT_COLUMNS],
+            rows,
+            sheet_name='Item statuses',
+        )
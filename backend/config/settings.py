@@ -26,17 +26,22 @@ INSTALLED_APPS = [
     'organizations',
     'pg',
     'dashboard',
+    'jobs',
+    'search',
 ]
 
 AUTH_USER_MODEL = 'accounts.User'
 
 MIDDLEWARE = [
+    'core.streaming.AsyncStreamingMiddleware',
+    'core.timing.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.routing.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -60,14 +65,30 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Wait for locks instead of failing when job workers write concurrently.
+        'OPTIONS': {'timeout': 20},
     }
 }
 
+# Replica stand-in for exercising core.routing locally: another SQLite file,
+# or db.sqlite3 itself so replica reads see the same data.
+if os.environ.get('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['DB_REPLICA_NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.routing.ReplicaRouter']
+# Seconds a user's reads stay on the primary after they write.
+DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', '10'))
+
 AUTH_PASSWORD_VALIDATORS = []
 
 LANGUAGE_CODE = 'en-us'
@@ -80,15 +101,105 @@ MEDIA_URL = '/media/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Hash uploaded files as they stream in (content-addressed evidence storage).
+FILE_UPLOAD_HANDLERS = [
+    'evidence.upload_handlers.HashingMemoryFileUploadHandler',
+    'evidence.upload_handlers.HashingTemporaryFileUploadHandler',
+]
+
+# Background job queue (see jobs.queue and `manage.py run_workers`).
+JOBS_WORKER_CONCURRENCY = int(os.environ.get('JOBS_WORKER_CONCURRENCY', '2'))
+JOBS_POLL_INTERVAL = 2.0
+JOBS_MAX_ATTEMPTS = 3
+JOBS_RETRY_BASE_DELAY = 30
+JOBS_RETRY_MAX_DELAY = 3600
+# Workers refresh a running job's lock every JOBS_HEARTBEAT_INTERVAL seconds
+# whatever the task is doing; a lock older than JOBS_STALE_TIMEOUT means the
+# worker died and the job is requeued.
+JOBS_HEARTBEAT_INTERVAL = 30
+JOBS_STALE_TIMEOUT = 300
+
+# Printable PG compliance reports (manage.py generate_reports), written
+# under MEDIA_ROOT/reports/pg/ by a pool of this many processes.
+PG_REPORT_WORKERS = int(os.environ.get('PG_REPORT_WORKERS', os.cpu_count() or 1))
+
+# Resumable evidence uploads: chunks are staged here until committed.
+EVIDENCE_UPLOAD_DIR = os.environ.get('EVIDENCE_UPLOAD_DIR', BASE_DIR / 'uploads')
+EVIDENCE_UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+EVIDENCE_UPLOAD_MAX_CHUNK_SIZE = 50 * 1024 * 1024
+EVIDENCE_UPLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024
+# An upload left 'assembling' this many seconds (its commit request died)
+# may be committed again.
+EVIDENCE_UPLOAD_ASSEMBLY_TIMEOUT = 3600
+
+# Internal nginx location that serves MEDIA_ROOT for evidence downloads via
+# X-Accel-Redirect. Unset in development, where Django streams the file.
+EVIDENCE_DOWNLOAD_ACCEL_PREFIX = os.environ.get('EVIDENCE_DOWNLOAD_ACCEL_PREFIX', '')
+
+# Per process, which is enough for runserver. Production shares one cache
+# between workers (see settings_prod).
+# LocMem is private to each process: commands run from another shell
+# (seed_pmdc_pg, generate_scale_data) cannot invalidate what runserver has
+# cached. Set CACHE_DIR to share a file cache between them.
+if os.environ.get('CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache.LRUFileBasedCache',
+            'LOCATION': os.environ['CACHE_DIR'],
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+    }
+
+# Serve opted-in list endpoints from values() rows rendered with orjson
+# (see core.fast_serializers).
+FAST_SERIALIZERS_ENABLED = os.environ.get('FAST_SERIALIZERS_ENABLED', 'True') == 'True'
+
+# Rendered responses of the catalog viewsets (see core.response_cache).
+RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'True') == 'True'
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', '600'))
+
+# Server-Timing headers, sampled JSON log lines and the slow request
+# buffer at /api/system/slow-requests/ (see core.timing).
+REQUEST_TIMING_ENABLED = os.environ.get('REQUEST_TIMING_ENABLED', 'True') == 'True'
+# Slow requests are always logged; other requests are not logged in
+# development and tests unless a rate is set.
+REQUEST_TIMING_SAMPLE_RATE = float(os.environ.get('REQUEST_TIMING_SAMPLE_RATE', '0'))
+REQUEST_TIMING_SLOW_MS = int(os.environ.get('REQUEST_TIMING_SLOW_MS', '500'))
+REQUEST_TIMING_BUFFER_SIZE = int(os.environ.get('REQUEST_TIMING_BUFFER_SIZE', '100'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.timing': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Seconds a user's active flag, staff flags and role are cached for JWT
+# authentication. Saving a user clears the entry immediately.
+AUTH_PRINCIPAL_CACHE_TTL = int(os.environ.get('AUTH_PRINCIPAL_CACHE_TTL', '300'))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.CreatedAtCursorPagination',
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', '100')),
 }
 
 CORS_ALLOW_ALL_ORIGINS = True
@@ -96,4 +207,6 @@ CORS_ALLOW_ALL_ORIGINS = True
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
+    # Tokens carry a digest of the password, so changing it revokes them.
+    'CHECK_REVOKE_TOKEN': True,
 }
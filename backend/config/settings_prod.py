@@ -30,17 +30,22 @@ INSTALLED_APPS = [
     'organizations',
     'pg',
     'dashboard',
+    'jobs',
+    'search',
 ]
 
 AUTH_USER_MODEL = 'accounts.User'
 
 MIDDLEWARE = [
+    'core.streaming.AsyncStreamingMiddleware',
+    'core.timing.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.routing.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -64,6 +69,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 # Database configuration - PostgreSQL
 DATABASES = {
@@ -74,9 +80,39 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD', 'pmdc_password'),
         'HOST': os.environ.get('DB_HOST', 'db'),
         'PORT': os.environ.get('DB_PORT', '5432'),
+        # Connections are checked before reuse and dropped if dead.
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Per-process psycopg connection pool (metrics at /api/system/db/). Set
+# DB_POOL_MAX_SIZE=0 to keep one persistent connection per worker instead.
+if int(os.environ.get('DB_POOL_MAX_SIZE', '4')):
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '1')),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '4')),
+            # Seconds a request waits for a free connection before failing.
+            'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+
+# Streaming replica for read-only endpoints (see core.routing).
+if os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ.get('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'HOST': os.environ['DB_REPLICA_HOST'],
+        'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.routing.ReplicaRouter']
+# Seconds a user's reads stay on the primary after they write.
+DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', '10'))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -102,15 +138,105 @@ MEDIA_URL = '/media/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Hash uploaded files as they stream in (content-addressed evidence storage).
+FILE_UPLOAD_HANDLERS = [
+    'evidence.upload_handlers.HashingMemoryFileUploadHandler',
+    'evidence.upload_handlers.HashingTemporaryFileUploadHandler',
+]
+
+# Background job queue (see jobs.queue and `manage.py run_workers`).
+JOBS_WORKER_CONCURRENCY = int(os.environ.get('JOBS_WORKER_CONCURRENCY', '2'))
+JOBS_POLL_INTERVAL = 2.0
+JOBS_MAX_ATTEMPTS = 3
+JOBS_RETRY_BASE_DELAY = 30
+JOBS_RETRY_MAX_DELAY = 3600
+# Workers refresh a running job's lock every JOBS_HEARTBEAT_INTERVAL seconds
+# whatever the task is doing; a lock older than JOBS_STALE_TIMEOUT means the
+# worker died and the job is requeued.
+JOBS_HEARTBEAT_INTERVAL = 30
+JOBS_STALE_TIMEOUT = 300
+
+# Printable PG compliance reports (manage.py generate_reports), written
+# under MEDIA_ROOT/reports/pg/ by a pool of this many processes.
+PG_REPORT_WORKERS = int(os.environ.get('PG_REPORT_WORKERS', os.cpu_count() or 1))
+
+# Resumable evidence uploads: chunks are staged here until committed.
+EVIDENCE_UPLOAD_DIR = os.environ.get('EVIDENCE_UPLOAD_DIR', BASE_DIR / 'uploads')
+EVIDENCE_UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+EVIDENCE_UPLOAD_MAX_CHUNK_SIZE = 50 * 1024 * 1024
+EVIDENCE_UPLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024
+# An upload left 'assembling' this many seconds (its commit request died)
+# may be committed again.
+EVIDENCE_UPLOAD_ASSEMBLY_TIMEOUT = 3600
+
+# Internal nginx location that serves MEDIA_ROOT for evidence downloads via
+# X-Accel-Redirect (see nginx/nginx.conf). Set to '' to stream from Django.
+EVIDENCE_DOWNLOAD_ACCEL_PREFIX = os.environ.get('EVIDENCE_DOWNLOAD_ACCEL_PREFIX', '/protected-media/')
+
+# Shared by every worker process, so invalidation reaches all of them.
+# REDIS_URL may point at any Redis-compatible server; configure it with an
+# LRU maxmemory-policy. Otherwise a file cache that evicts LRU entries; its
+# CACHE_DIR must be a volume shared with the job workers, whose writes
+# invalidate cached responses too (see docker-compose.yml).
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache.LRUFileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', '/tmp/pmdc-cache'),
+            'OPTIONS': {
+                'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', '10000')),
+            },
+        },
+    }
+
+# Serve opted-in list endpoints from values() rows rendered with orjson
+# (see core.fast_serializers).
+FAST_SERIALIZERS_ENABLED = os.environ.get('FAST_SERIALIZERS_ENABLED', 'True') == 'True'
+
+# Rendered responses of the catalog viewsets (see core.response_cache).
+RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'True') == 'True'
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', '600'))
+
+# Server-Timing headers, sampled JSON log lines and the slow request
+# buffer at /api/system/slow-requests/ (see core.timing).
+REQUEST_TIMING_ENABLED = os.environ.get('REQUEST_TIMING_ENABLED', 'True') == 'True'
+REQUEST_TIMING_SAMPLE_RATE = float(os.environ.get('REQUEST_TIMING_SAMPLE_RATE', '0.01'))
+REQUEST_TIMING_SLOW_MS = int(os.environ.get('REQUEST_TIMING_SLOW_MS', '500'))
+REQUEST_TIMING_BUFFER_SIZE = int(os.environ.get('REQUEST_TIMING_BUFFER_SIZE', '100'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.timing': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Seconds a user's active flag, staff flags and role are cached for JWT
+# authentication. Saving a user clears the entry immediately.
+AUTH_PRINCIPAL_CACHE_TTL = int(os.environ.get('AUTH_PRINCIPAL_CACHE_TTL', '300'))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.CreatedAtCursorPagination',
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', '100')),
 }
 
 # CORS configuration
@@ -124,6 +250,8 @@ CORS_ALLOW_CREDENTIALS = True
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
+    # Tokens carry a digest of the password, so changing it revokes them.
+    'CHECK_REVOKE_TOKEN': True,
 }
 
 # Security settings for production
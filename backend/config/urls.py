@@ -11,4 +11,7 @@ urlpatterns = [
     path('api/organizations/', include('organizations.urls')),
     path('api/dashboard/', include('dashboard.urls')),
     path('api/pg/', include('pg.urls')),
+    path('api/jobs/', include('jobs.urls')),
+    path('api/search/', include('search.urls')),
+    path('api/system/', include('core.urls')),
 ]
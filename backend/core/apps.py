@@ -0,0 +1,20 @@
+from importlib import import_module
+
+from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        # Cached viewsets register the models they depend on when their
+        # modules load. Load them in every process, job workers and
+        # management commands included, so writes there invalidate too.
+        import_module(settings.ROOT_URLCONF)
+
+        # Time every statement, on connections opened in any thread.
+        from .timing import install
+        connection_created.connect(install, dispatch_uid='core.timing.install')
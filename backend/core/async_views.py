@@ -0,0 +1,49 @@
+"""
+Async dispatch for DRF views and viewsets.
+
+DRF dispatches synchronously, so under ASGI every request occupies a
+thread for its whole duration. ``AsyncDispatchMixin`` makes a view's
+dispatch a coroutine: actions written with ``async def`` run on the event
+loop and can use the async ORM, while sync actions and DRF's
+authentication, permission and throttling checks run in a thread through
+``sync_to_async``. A viewset can therefore make only its hot read actions
+async.
+
+Under WSGI Django runs these views through ``async_to_sync``, which works
+but costs an event loop per request; deploy them with ``config.asgi``.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.utils.decorators import classonlymethod
+
+
+class AsyncDispatchMixin:
+    view_is_async = True
+
+    @classonlymethod
+    def as_view(cls, *args, **initkwargs):
+        # ViewSetMixin.as_view does not mark its view function, so Django
+        # would call it as a sync view and get a coroutine back.
+        return markcoroutinefunction(super().as_view(*args, **initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -0,0 +1,45 @@
+"""
+File-based cache with least-recently-used eviction.
+
+Django's ``FileBasedCache`` needs no external service and is shared by
+every process on the host, but when it reaches ``MAX_ENTRIES`` it deletes
+a random sample of entries. ``LRUFileBasedCache`` bumps a file's
+modification time whenever it is read and culls the oldest files first,
+so hot entries such as catalog responses survive a cull.
+"""
+import os
+
+from django.core.cache.backends.filebased import FileBasedCache
+
+_missing = object()
+
+
+class LRUFileBasedCache(FileBasedCache):
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _missing, version)
+        if value is _missing:
+            return default
+        try:
+            os.utime(self._key_to_file(key, version))
+        except OSError:
+            # Deleted or culled by another process since the read.
+            pass
+        return value
+
+    def _cull(self):
+        filelist = self._list_cache_files()
+        num_entries = len(filelist)
+        if num_entries < self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            return self.clear()
+
+        def last_used(fname):
+            try:
+                return os.path.getmtime(fname)
+            except OSError:
+                return 0
+
+        filelist.sort(key=last_used)
+        for fname in filelist[:num_entries // self._cull_frequency]:
+            self._delete(fname)
@@ -0,0 +1,169 @@
+"""
+EXPLAIN-plan inspection for query regression checks.
+
+``explain`` returns the database's plan for one SQL statement and
+``plan_issues`` reduces it to what matters here: which of the given tables
+are read by a full sequential scan, and whether the plan sorts rows instead
+of reading them in index order.
+
+``CHECKS`` lists the hot paths whose plans must stay on their indexes and
+``run_check`` plans every statement one of them runs. ``core.tests`` runs
+them against ``core.scale`` data as part of the test suite; the
+``explain_queries`` command runs them against any database and prints the
+plans.
+"""
+import json
+import re
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from assignments.models import Assignment, ItemStatus
+from evidence.models import Evidence
+from jobs import queue
+from jobs.models import Job
+from organizations.models import Institution, Program
+from pg.models import ComplianceScorecard, PGItemCompliance
+from proformas.models import ProformaItem
+
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+SQLITE_STEP = re.compile(r'^(SCAN|SEARCH) (\S+)(?: AS \S+)?(.*)$')
+
+# Tables that grow with the number of institutions; a full scan of any of
+# them on a hot path is a regression. Checklist tables (sections, items)
+# are bounded by the templates and may be scanned when that is cheaper.
+LARGE_MODELS = (
+    Institution, Program, Assignment, ItemStatus, Evidence,
+    PGItemCompliance, ComplianceScorecard, Job,
+)
+
+
+@dataclass(frozen=True)
+class Check:
+    name: str
+    url: str = ''
+    call: object = None
+    # Small, bounded result sets (one checklist) may be sorted in memory.
+    sort_allowed: bool = False
+
+
+CHECKS = (
+    Check('Assignment list', url='/api/assignments/'),
+    Check('Assignments by status', url='/api/assignments/?status=submitted'),
+    Check('Assignment with item statuses', url='/api/assignments/{assignment}/?expand=item_statuses'),
+    Check(
+        'Item statuses of an assignment',
+        url='/api/assignments/item-statuses/?assignment={assignment}',
+        sort_allowed=True,
+    ),
+    Check('Evidence list', url='/api/evidence/'),
+    Check('Evidence of an assignment', url='/api/evidence/?assignment={assignment}'),
+    Check('Compliance of an institution', url='/api/pg/compliance/?institution={institution}'),
+    Check('Failed items of an institution', url='/api/pg/compliance/?institution={institution}&status=NO'),
+    Check('Institution scorecards', url='/api/pg/scorecards/?institution={institution}', sort_allowed=True),
+    Check('Template sections and items', url='/api/proformas/{template}/?fields=id,sections', sort_allowed=True),
+    Check('Job list', url='/api/jobs/'),
+    Check('Job claim', call=lambda: queue.claim('explain_queries')),
+    Check('Stale job requeue', call=lambda: queue.requeue_stale()),
+)
+
+
+def explainable(sql):
+    return sql.lstrip().upper().startswith(EXPLAINABLE)
+
+
+def explain(sql):
+    """Plan for ``sql``: a JSON plan on PostgreSQL, plan step strings on SQLite."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql)
+            plan = cursor.fetchone()[0]
+            return json.loads(plan) if isinstance(plan, str) else plan
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def format_plan(plan):
+    if connection.vendor == 'postgresql':
+        return json.dumps(plan, indent=2)
+    return '\n'.join(plan)
+
+
+def _postgres_nodes(node):
+    yield node
+    for child in node.get('Plans', []):
+        yield from _postgres_nodes(child)
+
+
+def plan_issues(plan, tables):
+    """Return ``(scanned, sorted)``: tables in ``tables`` read by a full scan, and whether rows are sorted."""
+    scanned = set()
+    sorted_rows = False
+    if connection.vendor == 'postgresql':
+        for node in _postgres_nodes(plan[0]['Plan']):
+            if node['Node Type'] == 'Seq Scan' and node.get('Relation Name') in tables:
+                scanned.add(node['Relation Name'])
+            if node['Node Type'] == 'Sort':
+                sorted_rows = True
+        return scanned, sorted_rows
+
+    for step in plan:
+        if step.startswith('USE TEMP B-TREE FOR') and 'ORDER BY' in step:
+            sorted_rows = True
+        match = SQLITE_STEP.match(step)
+        if match and match.group(1) == 'SCAN' and 'INDEX' not in match.group(3):
+            if match.group(2) in tables:
+                scanned.add(match.group(2))
+    return scanned, sorted_rows
+
+
+def sample():
+    """Ids to fill the placeholders in ``CHECKS`` URLs, or None without data."""
+    assignment = Assignment.objects.filter(evidence__isnull=False).first() or Assignment.objects.first()
+    compliance = PGItemCompliance.objects.filter(institution__isnull=False).first()
+    item = ProformaItem.objects.select_related('section').first()
+    if assignment is None or compliance is None or item is None:
+        return None
+    return {
+        'assignment': assignment.pk,
+        'institution': compliance.institution_id,
+        'template': item.section.template_id,
+    }
+
+
+def run_check(check, values):
+    """
+    Run ``check`` and plan each statement it executes.
+
+    Returns ``(problems, plans)``: descriptions of full scans of large
+    tables, unexpected sorts and error responses, and ``(sql, plan, issues)``
+    for every statement.
+    """
+    tables = {model._meta.db_table for model in LARGE_MODELS}
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        with CaptureQueriesContext(connection) as captured:
+            if check.url:
+                client = APIClient()
+                client.force_authenticate(get_user_model()(username='explain_queries', is_staff=True))
+                response = client.get(check.url.format(**values))
+            else:
+                check.call()
+    problems = []
+    if check.url and response.status_code != 200:
+        problems.append(f"HTTP {response.status_code}")
+
+    plans = []
+    for sql in (query['sql'] for query in captured.captured_queries if explainable(query['sql'])):
+        plan = explain(sql)
+        scanned, sorted_rows = plan_issues(plan, tables)
+        issues = [f"full scan of {table}" for table in sorted(scanned)]
+        if sorted_rows and not check.sort_allowed:
+            issues.append("sort")
+        plans.append((sql, plan, issues))
+        if issues:
+            problems.append(f"{', '.join(issues)} in: {sql[:200]}")
+    return problems, plans
@@ -0,0 +1,199 @@
+"""
+Fast list serialization from ``values()`` rows.
+
+``ModelSerializer`` builds a model instance and walks a tree of field
+objects for every row. For list endpoints whose serializers only read
+model columns, ``row_mapper`` compiles the serializer's fields once into a
+function that turns a ``values()`` row straight into the same dict, e.g.::
+
+    def map_row(r):
+        return {'id': c0(r['id']), 'status': r['status'], ...}
+
+The mapper supports plain model fields (including dotted sources such as
+``item.text``), ``PrimaryKeyRelatedField`` and nested serializers over
+forward foreign keys. For anything else (method fields, properties, files,
+many-to-many) ``row_mapper`` returns None and the view keeps the regular
+serializer. The pg and assignments tests compare the two paths byte for
+byte; ``manage.py check_fast_serializers`` does the same against generated
+data and measures their throughput.
+"""
+import copy
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .renderers import ORJSONRenderer
+
+# Fields whose to_representation() returns database values unchanged.
+IDENTITY_FIELDS = (
+    serializers.CharField, serializers.ChoiceField, serializers.EmailField,
+    serializers.URLField, serializers.SlugField, serializers.IntegerField,
+    serializers.BooleanField, serializers.ReadOnlyField,
+)
+# Fields converted with their own to_representation().
+CONVERTED_FIELDS = (
+    serializers.DateTimeField, serializers.DateField, serializers.TimeField,
+    serializers.DecimalField, serializers.FloatField, serializers.DurationField,
+)
+
+_mappers = {}
+
+
+class Unsupported(Exception):
+    pass
+
+
+class RowMapper:
+    def __init__(self, paths, function, source):
+        self.paths = paths
+        self.function = function
+        self.source = source
+
+    def __call__(self, row):
+        return self.function(row)
+
+    def values(self, queryset, *extra):
+        """``queryset.values()`` with every column the mapper reads, plus ``extra``."""
+        return queryset.values(*dict.fromkeys([*self.paths, *extra]))
+
+
+def _resolve(model, attrs):
+    """Follow ``attrs`` through forward relations; returns (field, nullable)."""
+    nullable = False
+    field = None
+    for i, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            raise Unsupported(f'{model.__name__}.{attr} is not a model field')
+        if not field.concrete or field.many_to_many:
+            raise Unsupported(f'{model.__name__}.{attr} is not a column')
+        nullable = nullable or field.null
+        if i < len(attrs) - 1:
+            if not field.is_relation:
+                raise Unsupported(f'{model.__name__}.{attr} is not a relation')
+            model = field.related_model
+    return field, nullable
+
+
+class _Compiler:
+    def __init__(self):
+        self.namespace = {}
+        self.paths = []
+
+    def converter(self, function):
+        name = f'c{len(self.namespace)}'
+        self.namespace[name] = function
+        return name
+
+    def value(self, path, converter=None, nullable=False):
+        self.paths.append(path)
+        lookup = f'r[{path!r}]'
+        if converter is None:
+            return lookup
+        call = f'{converter}({lookup})'
+        return f'(None if {lookup} is None else {call})' if nullable else call
+
+    def serializer(self, serializer, model, prefix=''):
+        if serializer.Meta.model is not model:
+            raise Unsupported(f'{type(serializer).__name__} does not serialize {model.__name__}')
+        items = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            items.append(f'{name!r}: {self.field(field, model, prefix)}')
+        return '{' + ', '.join(items) + '}'
+
+    def field(self, field, model, prefix):
+        attrs = field.source_attrs
+        if not attrs:
+            raise Unsupported(f"{field.field_name} uses source='*'")
+        model_field, nullable = _resolve(model, attrs)
+        path = prefix + '__'.join(attrs)
+
+        if isinstance(field, serializers.ModelSerializer) and not getattr(field, 'many', False):
+            if not model_field.is_relation:
+                raise Unsupported(f'{field.field_name} nests a non-relation')
+            nested = self.serializer(field, model_field.related_model, path + '__')
+            if nullable:
+                return f'(None if {self.value(path)} is None else {nested})'
+            return nested
+        if type(field) is PrimaryKeyRelatedField and field.pk_field is None and model_field.is_relation:
+            return self.value(path)
+        if model_field.is_relation:
+            raise Unsupported(f'{field.field_name} is a {type(field).__name__} over a relation')
+        if type(field) in IDENTITY_FIELDS:
+            return self.value(path)
+        if type(field) is serializers.UUIDField and field.uuid_format == 'hex_verbose':
+            return self.value(path, self.converter(str), nullable)
+        if type(field) in CONVERTED_FIELDS:
+            # An unbound copy, so the cached mapper keeps no request alive.
+            return self.value(path, self.converter(copy.deepcopy(field).to_representation), nullable)
+        raise Unsupported(f'{field.field_name} is a {type(field).__name__}')
+
+
+def row_mapper(serializer):
+    """
+    Compiled ``values()`` row mapper reproducing ``serializer``'s output, or
+    None if one of its fields cannot be read from columns.
+
+    Mappers are cached per serializer class and top-level field set, so
+    only the first request for a given ``?fields=``/``?expand=`` compiles.
+    """
+    key = (type(serializer), tuple(serializer.fields))
+    if key not in _mappers:
+        compiler = _Compiler()
+        try:
+            expression = compiler.serializer(serializer, serializer.Meta.model)
+        except Unsupported:
+            _mappers[key] = None
+        else:
+            source = f'def map_row(r):\n    return {expression}\n'
+            exec(source, compiler.namespace)
+            _mappers[key] = RowMapper(
+                list(dict.fromkeys(compiler.paths)), compiler.namespace['map_row'], source,
+            )
+    return _mappers[key]
+
+
+class FastListMixin:
+    """
+    Serve ``list`` from ``values()`` rows through the compiled mapper of the
+    viewset's serializer, rendered with orjson.
+
+    Falls back to the serializer when ``FAST_SERIALIZERS_ENABLED`` is off or
+    the serializer cannot be compiled. Other actions are unaffected apart
+    from the renderer, which produces the same bytes.
+    """
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if settings.FAST_SERIALIZERS_ENABLED:
+            renderers = [ORJSONRenderer() if type(renderer) is JSONRenderer else renderer for renderer in renderers]
+        return renderers
+
+    def get_row_mapper(self):
+        if not settings.FAST_SERIALIZERS_ENABLED:
+            return None
+        return row_mapper(self.get_serializer())
+
+    def fast_rows(self, queryset, mapper):
+        """``values()`` rows for ``mapper``, including the columns cursor pagination reads."""
+        ordering = getattr(self.paginator, 'ordering', ())
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return mapper.values(queryset, *(name.lstrip('-') for name in ordering))
+
+    def list(self, request, *args, **kwargs):
+        mapper = self.get_row_mapper()
+        if mapper is None:
+            return super().list(request, *args, **kwargs)
+        rows = self.fast_rows(self.filter_queryset(self.get_queryset()), mapper)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response([mapper(row) for row in rows])
+        return self.get_paginated_response([mapper(row) for row in page])
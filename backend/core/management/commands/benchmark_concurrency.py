@@ -0,0 +1,169 @@
+import json
+import socket
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+# The read endpoints served by async views; {template} is filled in from the API.
+PATHS = (
+    '/api/dashboard/summary/',
+    '/api/pg/compliance/',
+    '/api/proformas/{template}/',
+)
+# Reads its request body, so a client that trickles the body holds a sync worker.
+SLOW_PATH = '/api/pg/compliance/bulk/'
+
+
+class SlowClient(threading.Thread):
+    """Sends a request body one byte every half second until stopped, like a slow upload."""
+
+    def __init__(self, base_url, token, stop):
+        super().__init__(daemon=True)
+        self.address = urlsplit(base_url)
+        self.token = token
+        self.stop = stop
+
+    def run(self):
+        host, port = self.address.hostname, self.address.port or 80
+        try:
+            with socket.create_connection((host, port)) as sock:
+                sock.sendall(
+                    f"POST {SLOW_PATH} HTTP/1.1\r\n"
+                    f"Host: {host}\r\n"
+                    f"Authorization: Bearer {self.token}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {1 << 20}\r\n\r\n[".encode()
+                )
+                while not self.stop.wait(0.5):
+                    sock.sendall(b" ")
+        except OSError:
+            # The server gave up on the request, e.g. a worker timeout.
+            pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure throughput and latency of the hot read endpoints under concurrent "
+        "load against running servers, e.g. gunicorn with config.wsgi and with "
+        "config.asgi on uvicorn workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            action="append",
+            dest="targets",
+            required=True,
+            help="NAME=BASE_URL of a running server, e.g. wsgi=http://localhost:8000 (may be repeated).",
+        )
+        parser.add_argument("--username", required=True)
+        parser.add_argument("--password", required=True)
+        parser.add_argument(
+            "--concurrency",
+            default="1,10,50",
+            help="Comma-separated numbers of concurrent clients (default: 1,10,50).",
+        )
+        parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint and concurrency level.")
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Endpoint to load instead of the defaults (may be repeated).",
+        )
+        parser.add_argument(
+            "--slow-clients",
+            type=int,
+            default=0,
+            help="Keep this many slow uploads open during each measurement.",
+        )
+
+    def handle(self, *args, **options):
+        levels = [int(level) for level in options["concurrency"].split(",")]
+        self.stdout.write(
+            f"{'target':<8}{'endpoint':<48}{'clients':>8}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}"
+        )
+        for target in options["targets"]:
+            name, _, base_url = target.partition("=")
+            if not base_url:
+                raise CommandError(f"Expected NAME=BASE_URL, got {target!r}.")
+            base_url = base_url.rstrip("/")
+            token = self._login(base_url, options["username"], options["password"])
+            paths = options["paths"] or self._default_paths(base_url, token)
+            for path in paths:
+                for clients in levels:
+                    stop = threading.Event()
+                    for _ in range(options["slow_clients"]):
+                        SlowClient(base_url, token, stop).start()
+                    try:
+                        result = self._load(base_url + path, token, clients, options["requests"])
+                    finally:
+                        stop.set()
+                    self.stdout.write(
+                        f"{name:<8}{path[:47]:<48}{clients:>8}{result['throughput']:>10.1f}"
+                        f"{result['p50']:>9.1f}{result['p95']:>9.1f}{result['errors']:>8}"
+                    )
+
+    def _login(self, base_url, username, password):
+        body = json.dumps({"username": username, "password": password}).encode()
+        request = urllib.request.Request(
+            base_url + "/api/accounts/login/", data=body, headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return json.load(response)["access"]
+        except urllib.error.URLError as e:
+            raise CommandError(f"Could not log in to {base_url}: {e}") from e
+
+    def _default_paths(self, base_url, token):
+        templates = self._get_json(base_url + "/api/proformas/?page_size=1&fields=id", token)["results"]
+        paths = []
+        for path in PATHS:
+            if "{template}" in path:
+                if not templates:
+                    continue
+                path = path.format(template=templates[0]["id"])
+            paths.append(path)
+        return paths
+
+    def _get_json(self, url, token):
+        request = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+        with urllib.request.urlopen(request) as response:
+            return json.load(response)
+
+    def _fetch(self, url, token):
+        request = urllib.request.Request(
+            url, headers={"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"}
+        )
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+            ok = True
+        except (urllib.error.URLError, TimeoutError):
+            ok = False
+        return ok, time.perf_counter() - started
+
+    def _load(self, url, token, clients, requests):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            results = list(pool.map(lambda _: self._fetch(url, token), range(requests)))
+        elapsed = time.perf_counter() - started
+        latencies = sorted(seconds * 1000 for ok, seconds in results if ok)
+        errors = sum(1 for ok, _ in results if not ok)
+        if len(latencies) >= 2:
+            quantiles = statistics.quantiles(latencies, n=20)
+            p50, p95 = statistics.median(latencies), quantiles[18]
+        else:
+            p50 = p95 = latencies[0] if latencies else 0.0
+        return {
+            "throughput": len(latencies) / elapsed,
+            "p50": p50,
+            "p95": p95,
+            "errors": errors,
+        }
@@ -0,0 +1,327 @@
+import json
+import math
+import re
+import statistics
+import time
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.test.utils import override_settings
+from django.urls import URLResolver, get_resolver, resolve
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from assignments.models import Assignment, ItemStatus
+from core import scale
+from evidence.models import Evidence, EvidenceUpload
+from jobs.models import Job
+from modules.models import Module
+from organizations.models import Institution, Program
+from pg.models import ComplianceReport, ComplianceScorecard, PGItemCompliance
+from proformas.models import ProformaTemplate
+
+DEFAULT_BASELINE = settings.BASE_DIR / 'benchmarks' / 'endpoints.json'
+PLACEHOLDER = re.compile(r'{(\w+)}')
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    url: str
+
+
+# Every GET endpoint under /api/. ``{name}`` placeholders are filled from
+# ``SAMPLES``; an endpoint is skipped when there is no row to fill one.
+ENDPOINTS = (
+    Endpoint('modules', '/api/modules/'),
+    Endpoint('module', '/api/modules/{module}/'),
+    Endpoint('proformas', '/api/proformas/'),
+    Endpoint('proforma', '/api/proformas/{template}/'),
+    Endpoint('assignments', '/api/assignments/'),
+    Endpoint('assignments by status', '/api/assignments/?status=submitted'),
+    Endpoint('assignment', '/api/assignments/{assignment}/'),
+    Endpoint('assignment with item statuses', '/api/assignments/{assignment}/?expand=item_statuses'),
+    Endpoint('item statuses', '/api/assignments/item-statuses/'),
+    Endpoint('item statuses of an assignment', '/api/assignments/item-statuses/?assignment={assignment}'),
+    Endpoint('item status', '/api/assignments/item-statuses/{item_status}/'),
+    Endpoint('item status export', '/api/assignments/item-statuses/export/csv/?assignment={assignment}'),
+    Endpoint('evidence', '/api/evidence/'),
+    Endpoint('evidence of an assignment', '/api/evidence/?assignment={assignment}'),
+    Endpoint('evidence detail', '/api/evidence/{evidence}/'),
+    Endpoint('evidence upload', '/api/evidence/uploads/{upload}/'),
+    Endpoint('institutions', '/api/organizations/institutions/'),
+    Endpoint('institution', '/api/organizations/institutions/{institution}/'),
+    Endpoint('programs', '/api/organizations/programs/'),
+    Endpoint('program', '/api/organizations/programs/{program}/'),
+    Endpoint('dashboard', '/api/dashboard/summary/'),
+    Endpoint('dashboard of an institution', '/api/dashboard/summary/?institution={institution}'),
+    Endpoint('compliance', '/api/pg/compliance/'),
+    Endpoint('compliance with items', '/api/pg/compliance/?expand=item_details&page_size=100'),
+    Endpoint('compliance of an institution', '/api/pg/compliance/?institution={institution}'),
+    Endpoint('failed items of an institution', '/api/pg/compliance/?institution={institution}&status=NO'),
+    Endpoint('compliance detail', '/api/pg/compliance/{compliance}/'),
+    Endpoint('compliance matrix', '/api/pg/compliance/matrix/?template={template}'),
+    Endpoint('compliance export', '/api/pg/compliance/export/csv/?institution={institution}'),
+    Endpoint('scorecards of an institution', '/api/pg/scorecards/?institution={institution}'),
+    Endpoint('scorecard', '/api/pg/scorecards/{scorecard}/'),
+    Endpoint('reports', '/api/pg/reports/'),
+    Endpoint('report', '/api/pg/reports/{report}/'),
+    Endpoint('jobs', '/api/jobs/'),
+    Endpoint('job', '/api/jobs/{job}/'),
+    Endpoint('search', '/api/search/?q=faculty'),
+    Endpoint('system databases', '/api/system/db/'),
+    Endpoint('system cache', '/api/system/cache/'),
+    Endpoint('system slow requests', '/api/system/slow-requests/'),
+)
+# Placeholder values: the first row of each queryset.
+SAMPLES = {
+    'module': Module.objects.all(),
+    'template': ProformaTemplate.objects.all(),
+    'assignment': Assignment.objects.filter(evidence__isnull=False),
+    'item_status': ItemStatus.objects.all(),
+    'evidence': Evidence.objects.all(),
+    'upload': EvidenceUpload.objects.all(),
+    'institution': Institution.objects.filter(pg_item_compliances__isnull=False),
+    'program': Program.objects.all(),
+    'compliance': PGItemCompliance.objects.all(),
+    'scorecard': ComplianceScorecard.objects.all(),
+    'report': ComplianceReport.objects.all(),
+    'job': Job.objects.all(),
+}
+# GET endpoints deliberately left out: they stream stored files, not rows.
+EXCLUDED = {'evidence-download', 'pg-report-download'}
+# Tables whose sizes are recorded with the results, to tell datasets apart.
+COUNTED_MODELS = (Institution, Program, Assignment, ItemStatus, Evidence, PGItemCompliance)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def get_routes(resolver=None, prefix=''):
+    """``(route, url name)`` of every URL pattern under /api/ that answers GET."""
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from get_routes(pattern, route)
+            continue
+        callback = pattern.callback
+        actions = getattr(callback, 'actions', None)
+        view_class = getattr(callback, 'cls', None) or getattr(callback, 'view_class', None)
+        answers_get = 'get' in actions if actions is not None else hasattr(view_class, 'get')
+        if route.startswith('api/') and answers_get and pattern.name != 'api-root':
+            yield route, pattern.name
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every GET endpoint under /api/: p50/p95 latency, queries per request "
+        "and peak memory, compared against a stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=0,
+            help="Generate this many synthetic institutions first (rolled back afterwards).",
+        )
+        parser.add_argument("--iterations", type=int, default=30, help="Timed requests per endpoint.")
+        parser.add_argument("--warmup", type=int, default=2, help="Untimed requests per endpoint first.")
+        parser.add_argument("--only", default='', help="Only endpoints whose name contains this text.")
+        parser.add_argument(
+            "--baseline",
+            default=str(DEFAULT_BASELINE),
+            help="Baseline results to compare with (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Write the results to the baseline file instead of comparing.",
+        )
+        parser.add_argument("--output", help="Also write the results to this JSON file.")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.25,
+            help="Allowed relative increase in p95 latency and peak memory before it counts as a regression.",
+        )
+
+    def handle(self, *args, **options):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model()(username='benchmark_endpoints', is_staff=True))
+        endpoints = [endpoint for endpoint in ENDPOINTS if options["only"] in endpoint.name]
+
+        # Log lines from the timing middleware would swamp the output; its
+        # cost is still measured. The response cache is off so every timed
+        # request runs the view rather than all but the first being hits.
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            RESPONSE_CACHE_ENABLED=False,
+            REQUEST_TIMING_SAMPLE_RATE=0,
+            REQUEST_TIMING_SLOW_MS=10 ** 9,
+        ), transaction.atomic():
+            if options["scale"]:
+                counts = scale.generate(institutions=options["scale"])
+                scale.rebuild()
+                self.stdout.write(f"Generated {counts}")
+            self.report_coverage()
+            results = {
+                'meta': {
+                    'created': timezone.now().isoformat(),
+                    'vendor': connection.vendor,
+                    'iterations': options["iterations"],
+                    'rows': {model._meta.label: model.objects.count() for model in COUNTED_MODELS},
+                },
+                'endpoints': self.run(endpoints, options["iterations"], options["warmup"]),
+            }
+            transaction.set_rollback(True)
+
+        for path in filter(None, [options["output"], options["baseline"] if options["save_baseline"] else None]):
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w') as output:
+                json.dump(results, output, indent=2)
+                output.write('\n')
+            self.stdout.write(f"Wrote {path}")
+        if options["save_baseline"]:
+            return
+
+        try:
+            with open(options["baseline"]) as baseline_file:
+                baseline = json.load(baseline_file)
+        except FileNotFoundError:
+            self.stdout.write(self.style.WARNING(f"No baseline at {options['baseline']}; run with --save-baseline."))
+            return
+        regressions = self.compare(results, baseline, options["tolerance"], options["only"])
+        if regressions:
+            raise CommandError(f"{regressions} endpoints regressed against the baseline.")
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+
+    def report_coverage(self):
+        covered = {resolve(urlsplit(endpoint.url).path.replace('{', '').replace('}', '')).url_name
+                   for endpoint in ENDPOINTS}
+        for route, name in get_routes():
+            if name not in covered and name not in EXCLUDED:
+                # Once per name, not again for its format suffix route.
+                covered.add(name)
+                self.stdout.write(self.style.WARNING(f"Not benchmarked: {name} ({route})"))
+
+    def request(self, url):
+        response = self.client.get(url)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+        return response.status_code, size
+
+    def count_queries(self, url):
+        """Request ``url`` counting statements on every alias, streamed output included."""
+        statements = []
+
+        def count(execute, sql, params, many, context):
+            statements.append(sql)
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(count))
+            status, size = self.request(url)
+        return status, size, len(statements)
+
+    def run(self, endpoints, iterations, warmup):
+        samples = {}
+        for key, queryset in SAMPLES.items():
+            row = queryset.values_list('pk', flat=True).first()
+            if row is not None:
+                samples[key] = row
+
+        self.stdout.write(f"\n{'endpoint':<34}{'status':>7}{'p50 ms':>9}{'p95 ms':>9}{'queries':>9}{'peak KiB':>10}")
+        results = {}
+        for endpoint in endpoints:
+            missing = set(PLACEHOLDER.findall(endpoint.url)) - samples.keys()
+            if missing:
+                self.stdout.write(f"{endpoint.name:<34}skipped, no {', '.join(sorted(missing))}")
+                continue
+            url = endpoint.url.format(**samples)
+
+            for _ in range(warmup):
+                self.request(url)
+            status, size, queries = self.count_queries(url)
+            durations = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                self.request(url)
+                durations.append((time.perf_counter() - started) * 1000)
+            tracemalloc.start()
+            try:
+                self.request(url)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+            result = results[endpoint.name] = {
+                'url': endpoint.url,
+                'status': status,
+                'bytes': size,
+                'p50_ms': round(statistics.median(durations), 2),
+                'p95_ms': round(percentile(durations, 0.95), 2),
+                'queries': queries,
+                'peak_kib': round(peak / 1024, 1),
+            }
+            self.stdout.write(
+                f"{endpoint.name:<34}{status:>7}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+                f"{result['queries']:>9}{result['peak_kib']:>10.1f}"
+            )
+        return results
+
+    def compare(self, results, baseline, tolerance, only=''):
+        if results['meta']['rows'] != baseline['meta'].get('rows'):
+            self.stdout.write(self.style.WARNING(
+                "The baseline was recorded against a different dataset; latency and memory may not compare."
+            ))
+        self.stdout.write(f"\n{'endpoint':<34}{'p95 ms':>16}{'queries':>12}{'peak KiB':>20}")
+        regressions = 0
+        for name, result in results['endpoints'].items():
+            before = baseline['endpoints'].get(name)
+            if before is None:
+                self.stdout.write(f"{name:<34}not in the baseline")
+                continue
+            problems = []
+            if result['status'] != before['status']:
+                problems.append(f"status {before['status']} -> {result['status']}")
+            if result['queries'] > before['queries']:
+                problems.append("more queries")
+            # Small absolute changes are noise, whatever their ratio.
+            if result['p95_ms'] > before['p95_ms'] * (1 + tolerance) and result['p95_ms'] - before['p95_ms'] > 2:
+                problems.append("slower")
+            if result['peak_kib'] > before['peak_kib'] * (1 + tolerance) and result['peak_kib'] - before['peak_kib'] > 64:
+                problems.append("more memory")
+
+            line = (
+                f"{name:<34}{before['p95_ms']:>7.2f} -> {result['p95_ms']:<7.2f}"
+                f"{before['queries']:>4} -> {result['queries']:<4}"
+                f"{before['peak_kib']:>9.1f} -> {result['peak_kib']:<9.1f}"
+            )
+            if problems:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(f"{line}{', '.join(problems)}"))
+            else:
+                self.stdout.write(line)
+
+        # An endpoint that can no longer be run (its route is gone or there
+        # is no row to fill a placeholder) must not pass unnoticed.
+        for name in sorted(baseline['endpoints'].keys() - results['endpoints'].keys()):
+            if only in name:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(f"{name:<34}in the baseline but not measured"))
+        return regressions
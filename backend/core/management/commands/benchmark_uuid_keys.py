@@ -0,0 +1,77 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.ids import uuid7
+
+GENERATORS = {
+    'uuid4': uuid.uuid4,
+    'uuid7': uuid7,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare insert throughput and primary key index size for uuid4 and "
+        "uuid7 keys in scratch tables shaped like BaseModel rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Rows to insert per generator.")
+        parser.add_argument("--batch-size", type=int, default=10_000, help="Rows per INSERT batch and commit.")
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        batch_size = options["batch_size"]
+        self.stdout.write(f"{connection.vendor}: inserting {rows:,} rows per generator")
+        self.stdout.write(f"{'generator':<10}{'seconds':>10}{'rows/s':>12}{'pk index MiB':>15}")
+        for name, generate in GENERATORS.items():
+            table = f"benchmark_{name}_keys"
+            self._create(table)
+            try:
+                seconds = self._insert(table, generate, rows, batch_size)
+                size = self._index_size(table)
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            size_text = f"{size / 2 ** 20:.1f}" if size is not None else "n/a"
+            self.stdout.write(f"{name:<10}{seconds:>10.2f}{rows / seconds:>12,.0f}{size_text:>15}")
+
+    def _create(self, table):
+        key_type = 'uuid' if connection.vendor == 'postgresql' else 'char(32)'
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.execute(
+                f"CREATE TABLE {table} ("
+                f"id {key_type} NOT NULL PRIMARY KEY, "
+                f"created_at {'timestamptz' if connection.vendor == 'postgresql' else 'datetime'} NOT NULL, "
+                f"payload varchar(100) NOT NULL)"
+            )
+
+    def _insert(self, table, generate, rows, batch_size):
+        # Store keys the way Django's UUIDField does on each backend.
+        as_db_value = str if connection.vendor == 'postgresql' else (lambda value: value.hex)
+        sql = f"INSERT INTO {table} (id, created_at, payload) VALUES (%s, CURRENT_TIMESTAMP, %s)"
+        started = time.perf_counter()
+        for start in range(0, rows, batch_size):
+            count = min(batch_size, rows - start)
+            values = [(as_db_value(generate()), 'x' * 40) for _ in range(count)]
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, values)
+        return time.perf_counter() - started
+
+    def _index_size(self, table):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT pg_indexes_size(%s::regclass)", [table])
+                return cursor.fetchone()[0]
+            if connection.vendor == 'sqlite':
+                cursor.execute(
+                    "SELECT sum(pgsize) FROM dbstat WHERE name IN "
+                    "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s)",
+                    [table],
+                )
+                return cursor.fetchone()[0]
+        return None
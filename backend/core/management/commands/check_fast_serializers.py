@@ -0,0 +1,126 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from assignments.models import ItemStatus
+from core import scale
+from pg.models import PGItemCompliance
+
+# List endpoints served by FastListMixin and the query strings checked on
+# each; {assignment} and {institution} come from the data.
+ENDPOINTS = {
+    '/api/pg/compliance/': (
+        '',
+        '?page_size=500',
+        '?expand=item_details',
+        '?expand=item_details&fields=id,item_details,updated_at',
+        '?fields=id,status',
+        '?status=NO',
+        '?institution={institution}',
+        '?institution={institution}&status=YES&expand=item_details',
+    ),
+    '/api/assignments/item-statuses/': (
+        '',
+        '?page_size=500',
+        '?assignment={assignment}',
+        '?fields=id,item_text,score',
+        '?fields=id,status',
+    ),
+}
+# Query string used to measure rows per second over every page.
+BENCHMARK_QUERY = {
+    '/api/pg/compliance/': '?page_size=500&expand=item_details',
+    '/api/assignments/item-statuses/': '?page_size=500',
+}
+# Pages compared per query string, following the next links.
+PAGES = 3
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that the fast values()-based list serialization renders byte-identical "
+        "responses to the serializers, and compare their throughput in rows per second."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=0,
+            help="Generate this many synthetic institutions first (rolled back afterwards).",
+        )
+
+    def handle(self, *args, **options):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model()(username='check_fast_serializers', is_staff=True))
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']), transaction.atomic():
+            if options["scale"]:
+                counts = scale.generate(institutions=options["scale"])
+                self.stdout.write(f"Generated {counts}")
+            failures = self.check_parity(self.sample())
+            self.benchmark()
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"{failures} responses differ between the fast and serializer paths.")
+        self.stdout.write(self.style.SUCCESS("Fast and serializer paths render identical responses."))
+
+    def sample(self):
+        status = ItemStatus.objects.first()
+        compliance = PGItemCompliance.objects.filter(institution__isnull=False).first()
+        if status is None or compliance is None:
+            raise CommandError("No data to compare; run with --scale.")
+        return {'assignment': status.assignment_id, 'institution': compliance.institution_id}
+
+    def fetch(self, url, fast):
+        with override_settings(FAST_SERIALIZERS_ENABLED=fast):
+            response = self.client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f"GET {url} returned HTTP {response.status_code}.")
+        return response
+
+    def check_parity(self, sample):
+        failures = 0
+        for path, queries in ENDPOINTS.items():
+            for query in queries:
+                url = path + query.format(**sample)
+                for page in range(PAGES):
+                    expected = self.fetch(url, fast=False)
+                    actual = self.fetch(url, fast=True)
+                    label = f"{url} (page {page + 1})"
+                    if expected.content == actual.content:
+                        self.stdout.write(self.style.SUCCESS(f"ok   {label}"))
+                    else:
+                        failures += 1
+                        offset = next(
+                            (i for i, (a, b) in enumerate(zip(expected.content, actual.content)) if a != b),
+                            min(len(expected.content), len(actual.content)),
+                        )
+                        self.stdout.write(self.style.ERROR(f"FAIL {label}: first difference at byte {offset}"))
+                        self.stdout.write(f"    serializer: {expected.content[max(offset - 40, 0):offset + 40]!r}")
+                        self.stdout.write(f"    fast:       {actual.content[max(offset - 40, 0):offset + 40]!r}")
+                    url = expected.data.get('next')
+                    if not url:
+                        break
+        return failures
+
+    def benchmark(self):
+        self.stdout.write(f"\n{'endpoint':<36}{'path':<12}{'rows':>9}{'seconds':>10}{'rows/s':>12}")
+        for path, query in BENCHMARK_QUERY.items():
+            results = {}
+            for label, fast in (('serializer', False), ('fast', True)):
+                rows, started, url = 0, time.perf_counter(), path + query
+                while url:
+                    response = self.fetch(url, fast)
+                    rows += len(response.data['results'])
+                    url = response.data.get('next')
+                seconds = time.perf_counter() - started
+                results[label] = rows / seconds if seconds else 0
+                self.stdout.write(f"{path:<36}{label:<12}{rows:>9}{seconds:>10.2f}{results[label]:>12,.0f}")
+            if results['serializer']:
+                self.stdout.write(f"{'':<36}speedup {results['fast'] / results['serializer']:.1f}x")
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core import explain, scale
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the queries behind hot API endpoints and fail if a large table is "
+        "fully scanned or rows are sorted where an index should provide the order."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=0,
+            help="Generate this many synthetic institutions first (rolled back afterwards).",
+        )
+        parser.add_argument(
+            "--verbose-plans",
+            action="store_true",
+            help="Print every statement and its plan.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["scale"]:
+                counts = scale.generate(institutions=options["scale"])
+                self.stdout.write(f"Generated {counts}")
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+            values = explain.sample()
+            if values is None:
+                raise CommandError("No data to plan against; run with --scale.")
+            failures = self.run_checks(values, options["verbose_plans"])
+            # Nothing here should persist, including the generated data.
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"{failures} of {len(explain.CHECKS)} checks failed.")
+        self.stdout.write(self.style.SUCCESS(f"All {len(explain.CHECKS)} checks use their indexes."))
+
+    def run_checks(self, values, verbose):
+        failures = 0
+        for check in explain.CHECKS:
+            problems, plans = explain.run_check(check, values)
+            for sql, plan, issues in plans:
+                if verbose or issues:
+                    self.stdout.write(f"    {sql}\n{explain.format_plan(plan)}\n")
+            if problems:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"FAIL {check.name}"))
+                for problem in problems:
+                    self.stdout.write(f"    {problem}")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"ok   {check.name} ({len(plans)} queries)"))
+        return failures
@@ -0,0 +1,166 @@
+import json
+from base64 import b64decode, b64encode
+from collections import namedtuple
+from urllib import parse
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Field, Func, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+Cursor = namedtuple('Cursor', ['reverse', 'position'])
+
+
+class _Row(Func):
+    """A row value, ``(a, b, ...)``, for comparing several columns at once."""
+    function = ''
+    output_field = Field()
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    The cursor carries the value of every ordering field of the row at the
+    page boundary, and the next page is selected with a single row
+    comparison, ``(created_at, id) < (%s, %s)``, so each page is an index
+    range scan at any depth, with no OFFSET. Orderings must end in a unique
+    field and sort every field in the same direction. Page size defaults to
+    ``REST_FRAMEWORK['PAGE_SIZE']`` and can be lowered or raised up to
+    ``max_page_size`` with ``?page_size=``.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self._page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self._paginate(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views, fetching the page with the async ORM."""
+        page_queryset = self._page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self._paginate([obj async for obj in page_queryset])
+
+    def _page_queryset(self, queryset, request, view):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = [name.lstrip('-') for name in self.ordering]
+        descending = {name.startswith('-') for name in self.ordering}
+        assert len(descending) == 1, 'Cursor pagination needs every ordering field sorted the same way.'
+        descending = descending.pop()
+
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        if reverse:
+            queryset = queryset.order_by(*(name if descending else f'-{name}' for name in self.fields))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.cursor is not None:
+            bound = [
+                Value(value, output_field=field)
+                for field, value in self._position_values(queryset.model, self.cursor.position)
+            ]
+            lookup = LessThan if descending != reverse else GreaterThan
+            queryset = queryset.filter(lookup(_Row(*(F(name) for name in self.fields)), _Row(*bound)))
+
+        # One extra row tells whether a following page exists.
+        return queryset[:self.page_size + 1]
+
+    def _position_values(self, model, position):
+        try:
+            return [
+                (field, field.to_python(value))
+                for field, value in zip((model._meta.get_field(name) for name in self.fields), position)
+            ]
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _position(self, row):
+        if isinstance(row, dict):
+            return [str(row[name]) for name in self.fields]
+        return [str(getattr(row, name)) for name in self.fields]
+
+    def _paginate(self, results):
+        self.page = results[:self.page_size]
+        has_more = len(results) > len(self.page)
+        came_from = self.cursor.position if self.cursor is not None else None
+
+        if self.cursor is not None and self.cursor.reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        if self.page:
+            self.previous_position = self._position(self.page[0])
+            self.next_position = self._position(self.page[-1])
+        else:
+            # Rows were deleted under the cursor: both links lead back to it.
+            self.previous_position = self.next_position = came_from
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            tokens = parse.parse_qs(b64decode(encoded.encode('ascii')).decode('ascii'), keep_blank_values=True)
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+            position = json.loads(tokens['p'][0])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if (
+            not isinstance(position, list)
+            or len(position) != len(self.fields)
+            or not all(isinstance(value, str) for value in position)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {'p': json.dumps(cursor.position)}
+        if cursor.reverse:
+            tokens['r'] = '1'
+        encoded = b64encode(parse.urlencode(tokens).encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(Cursor(reverse=False, position=self.next_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(Cursor(reverse=True, position=self.previous_position))
+
+
+class NameCursorPagination(CreatedAtCursorPagination):
+    """Keyset pagination for catalog endpoints listed alphabetically."""
+    ordering = ('name', 'id')
+
+
+class DisplayNameCursorPagination(CreatedAtCursorPagination):
+    ordering = ('display_name', 'id')
+
+
+class CodeCursorPagination(CreatedAtCursorPagination):
+    ordering = ('code', 'id')
@@ -0,0 +1,31 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+_encoder = encoders.JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` output produced by orjson.
+
+    Types orjson does not encode the way DRF does (datetimes, decimals,
+    lazy strings, ...) are handed to DRF's encoder, and U+2028/U+2029 are
+    escaped as DRF does. Indented output and non-compact settings fall
+    back to ``JSONRenderer``. Floats in exponent notation (below 1e-4 or
+    from 1e16) are spelled ``1e-05``/``1e+16`` by DRF and ``1e-5``/``1e16``
+    here; the fast list endpoints render none.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits or non-string keys.
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
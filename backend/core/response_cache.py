@@ -0,0 +1,163 @@
+"""
+Shared response cache for read-only catalog viewsets.
+
+``CachedResponseMixin`` stores the rendered JSON of ``list`` and
+``retrieve`` responses in the default cache. Entries are keyed by the
+viewset's ``cache_scope``, the requesting user's role and staff flag, the
+host and path, the sorted query parameters, and a generation token for
+each model in ``cache_models``.
+
+Saving or deleting an instance of a watched model replaces that model's
+generation token, which invalidates exactly the entries built from it. The
+old entries are never read again and age out through the cache's own
+TTL and LRU eviction. ``bulk_create`` and ``QuerySet.update()`` send no
+signals; call ``invalidate(Model, ...)`` after them (on commit).
+
+Generation tokens live in the cache, so an invalidation only reaches the
+processes sharing that cache. With the per-process ``LocMemCache`` used in
+development, a management command cannot invalidate the responses cached
+by a running ``runserver``; set ``CACHE_DIR`` to share a file cache.
+
+Hits and misses are counted per scope in the cache and reported by
+``stats()``. On the file backend the counters are approximate, because
+``incr`` is not atomic there.
+"""
+import hashlib
+import uuid
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+
+from . import routing, timing
+
+# Label of every model some cached viewset depends on, and their scopes.
+_watched = set()
+_scopes = set()
+
+
+def _generation_key(label):
+    return f'resp:gen:{label}'
+
+
+def _stats_key(scope, outcome):
+    return f'resp:stats:{scope}:{outcome}'
+
+
+def invalidate(*models):
+    """Invalidate entries built from ``models``, or from every watched model if none are given."""
+    labels = [model._meta.label_lower for model in models] if models else _watched
+    cache.set_many({_generation_key(label): uuid.uuid4().hex for label in labels}, None)
+
+
+def _invalidate_instance(sender, **kwargs):
+    if sender._meta.label_lower in _watched:
+        invalidate(sender)
+
+
+post_save.connect(_invalidate_instance, dispatch_uid='response_cache_post_save')
+post_delete.connect(_invalidate_instance, dispatch_uid='response_cache_post_delete')
+
+
+def _generations(models):
+    keys = [_generation_key(model._meta.label_lower) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # First use, or evicted: a fresh token, so no older entry can match.
+            cache.add(key, uuid.uuid4().hex, None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def _count(scope, outcome):
+    key = _stats_key(scope, outcome)
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+
+def stats():
+    """``{scope: {'hits', 'misses', 'hit_rate'}}`` across all processes sharing the cache."""
+    keys = {(scope, outcome): _stats_key(scope, outcome) for scope in _scopes for outcome in ('hits', 'misses')}
+    values = cache.get_many(list(keys.values()))
+    result = {}
+    for scope in sorted(_scopes):
+        hits = values.get(keys[(scope, 'hits')], 0)
+        misses = values.get(keys[(scope, 'misses')], 0)
+        result[scope] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 3) if hits + misses else None,
+        }
+    return result
+
+
+class CachedResponseMixin:
+    cache_scope = None
+    cache_models = ()
+    cache_actions = ('list', 'retrieve')
+    # Seconds; None uses RESPONSE_CACHE_TIMEOUT.
+    cache_timeout = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.cache_scope:
+            _scopes.add(cls.cache_scope)
+            _watched.update(model._meta.label_lower for model in cls.cache_models)
+
+    def response_cache_key(self, request):
+        user = request.user
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        digest = hashlib.sha256(
+            f'{request.get_host()}{request.path}?{query}'.encode()
+        ).hexdigest()
+        return ':'.join([
+            'resp',
+            self.cache_scope,
+            *_generations(self.cache_models),
+            getattr(user, 'role', None) or '',
+            'staff' if user.is_staff else 'user',
+            digest,
+        ])
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(super().retrieve, request, *args, **kwargs)
+
+    def _cached(self, action, request, *args, **kwargs):
+        if (
+            self.action not in self.cache_actions
+            or not settings.RESPONSE_CACHE_ENABLED
+            or request.accepted_renderer.format != 'json'
+        ):
+            return action(request, *args, **kwargs)
+
+        key = self.response_cache_key(request)
+        entry = cache.get(key)
+        timing.count_cache(entry is not None)
+        if entry is not None:
+            _count(self.cache_scope, 'hits')
+            content, content_type = entry
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        _count(self.cache_scope, 'misses')
+        # A lagging replica could put stale rows in the cache right after
+        # an invalidation.
+        routing.use_primary()
+        response = action(request, *args, **kwargs)
+        if response.status_code == 200:
+            response = self.finalize_response(request, response, *args, **kwargs)
+            response.render()
+            timeout = self.cache_timeout if self.cache_timeout is not None else settings.RESPONSE_CACHE_TIMEOUT
+            cache.set(key, (response.content, response['Content-Type']), timeout)
+        response['X-Cache'] = 'MISS'
+        return response
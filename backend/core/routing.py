@@ -0,0 +1,142 @@
+"""
+Read-replica routing with read-your-writes stickiness.
+
+When ``DATABASES`` has a ``replica`` alias, ``ReplicaRouter`` sends reads
+to it only for views that opt in with ``ReplicaReadMixin``, and only for
+safe methods. All writes, migrations and every other view use
+``default``.
+
+Replication lags, so a user who has just written keeps reading from the
+primary: ``ReplicaRoutingMiddleware`` records any write made during a
+request and marks the user sticky in the cache for
+``DATABASE_REPLICA_STICKY_SECONDS``. Within one request, reads after a
+write also go to the primary, and so do reads inside a transaction, which
+may go on to write what they read.
+"""
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_DB_ALIAS = 'replica'
+# Models that are not application data, e.g. DatabaseCache entries.
+IGNORED_APP_LABELS = {'django_cache'}
+
+
+class RoutingState:
+    __slots__ = ('replica', 'wrote')
+
+    def __init__(self):
+        self.replica = False
+        self.wrote = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def sticky_cache_key(user_id):
+    return f'db:sticky:{user_id}'
+
+
+def is_sticky(user):
+    return bool(user and user.is_authenticated and cache.get(sticky_cache_key(user.pk)))
+
+
+def use_replica(request):
+    """Route the rest of ``request``'s reads to the replica if that is safe."""
+    state = _state.get()
+    if state is None or not replica_configured():
+        return
+    if request.method in SAFE_METHODS and not state.wrote and not is_sticky(request.user):
+        state.replica = True
+
+
+def use_primary():
+    """Read from the primary for the rest of the current request."""
+    state = _state.get()
+    if state is not None:
+        state.replica = False
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica or state.wrote:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and model._meta.app_label not in IGNORED_APP_LABELS:
+            state.wrote = True
+        # Explicit, so instances read from the replica are saved to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_DB_ALIAS:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote and replica_configured():
+            self.mark_sticky(request)
+        return response
+
+    async def __acall__(self, request):
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote and replica_configured():
+            # request.user may still be the lazy session user, which queries.
+            await sync_to_async(self.mark_sticky)(request)
+        return response
+
+    def mark_sticky(self, request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            cache.set(sticky_cache_key(user.pk), True, settings.DATABASE_REPLICA_STICKY_SECONDS)
+
+
+class ReplicaReadMixin:
+    """Serve safe-method requests of a viewset from the replica."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        use_replica(request)
+
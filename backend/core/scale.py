@@ -0,0 +1,149 @@
+"""
+Synthetic data at production-like volume for query planning and benchmarks.
+
+``generate`` adds institutions with programs, assignments, item statuses,
+evidence and PG compliance for every checklist item, plus finished and scheduled jobs,
+using ``bulk_create`` in batches with one transaction per chunk of
+institutions. Signals do not fire, so scorecards and
+dashboard counters must be rebuilt afterwards if they matter; ``rebuild``
+does that. Cached API responses are invalidated as each chunk commits.
+
+The same ``seed`` against the same checklist produces the same names,
+statuses and comments; only primary keys and timestamps differ. Evidence
+rows point at file names that are not written to storage.
+"""
+import random
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from assignments.models import Assignment, ItemStatus
+from core import response_cache
+from evidence.models import Evidence
+from jobs.models import Job
+from organizations.models import Institution, Program
+from pg.models import PGItemCompliance
+from proformas.models import ProformaItem, ProformaTemplate
+
+BATCH_SIZE = 2000
+# Institutions created per round of inserts.
+CHUNK_SIZE = 50
+CITIES = ('Lahore', 'Karachi', 'Islamabad', 'Peshawar', 'Quetta', 'Multan')
+# Derived data that bulk inserts leave stale.
+REBUILD_COMMANDS = ('rebuild_scorecards', 'refresh_dashboard_counters', 'rebuild_search_index')
+
+
+def generate(institutions=100, programs=2, assignments=2, evidence=2, seed=0, progress=None):
+    """
+    Create ``institutions`` institutions, each with ``programs`` programs of
+    ``assignments`` assignments (one item status per checklist item and
+    ``evidence`` evidence rows each) and a compliance row per PG item.
+    ``progress`` is called with the running counts after each chunk.
+    Returns the number of rows created per model.
+    """
+    rng = random.Random(seed)
+    if not ProformaItem.objects.exists():
+        call_command('seed_pmdc_pg', stdout=StringIO())
+    templates = list(ProformaTemplate.objects.order_by('id').values_list('id', flat=True))
+    items = {template_id: [] for template_id in templates}
+    for item_id, template_id in ProformaItem.objects.order_by('id').values_list('id', 'section__template_id'):
+        items[template_id].append(item_id)
+    all_items = [item_id for template_items in items.values() for item_id in template_items]
+
+    compliance_statuses = [status for status, _ in PGItemCompliance.STATUS_CHOICES]
+    assignment_statuses = [status for status, _ in Assignment.STATUS_CHOICES]
+    item_statuses = [status for status, _ in ItemStatus.STATUS_CHOICES]
+    # Tells runs with different seeds apart in the generated names.
+    run = f'{rng.getrandbits(24):06x}'
+    counts = dict.fromkeys(
+        ['institutions', 'programs', 'assignments', 'item_statuses', 'evidence', 'compliance', 'jobs'], 0
+    )
+
+    for start in range(0, institutions, CHUNK_SIZE):
+        with transaction.atomic():
+            # bulk_create skips the signals that would invalidate them.
+            transaction.on_commit(response_cache.invalidate)
+            new_institutions = [
+                Institution(name=f'Scale {run} Institution {n:05}', city=rng.choice(CITIES), type='Medical College')
+                for n in range(start, min(start + CHUNK_SIZE, institutions))
+            ]
+            Institution.objects.bulk_create(new_institutions, batch_size=BATCH_SIZE)
+
+            new_programs = [
+                Program(name=f'Program {n}', level='Postgraduate', discipline='Medicine', institution=institution)
+                for institution in new_institutions
+                for n in range(programs)
+            ]
+            Program.objects.bulk_create(new_programs, batch_size=BATCH_SIZE)
+
+            new_assignments = [
+                Assignment(
+                    template_id=rng.choice(templates),
+                    program=program,
+                    title=f'{program.name} review {n}',
+                    status=rng.choice(assignment_statuses),
+                )
+                for program in new_programs
+                for n in range(assignments)
+            ]
+            Assignment.objects.bulk_create(new_assignments, batch_size=BATCH_SIZE)
+
+            new_item_statuses = [
+                ItemStatus(
+                    assignment=assignment,
+                    item_id=item_id,
+                    status=rng.choice(item_statuses),
+                    comment=rng.choice(['', '', 'Documents pending', 'Faculty shortage noted']),
+                    score=rng.randint(0, 10),
+                )
+                for assignment in new_assignments
+                for item_id in items[assignment.template_id]
+            ]
+            ItemStatus.objects.bulk_create(new_item_statuses, batch_size=BATCH_SIZE)
+
+            new_evidence = [
+                Evidence(assignment=assignment, file=f'evidence/scale/{rng.getrandbits(128):032x}.pdf', original_name='scan.pdf')
+                for assignment in new_assignments
+                for _ in range(evidence)
+            ]
+            Evidence.objects.bulk_create(new_evidence, batch_size=BATCH_SIZE)
+
+            new_compliance = [
+                PGItemCompliance(
+                    institution=institution,
+                    item_id=item_id,
+                    status=rng.choice(compliance_statuses),
+                    comment=rng.choice(['', '', 'Verified on inspection', 'Faculty shortage in department']),
+                )
+                for institution in new_institutions
+                for item_id in all_items
+            ]
+            PGItemCompliance.objects.bulk_create(new_compliance, batch_size=BATCH_SIZE)
+
+            new_jobs = [
+                Job(name='dashboard.refresh_counters', status='succeeded', attempts=1, progress=100)
+                for _ in new_institutions
+            ]
+            # Scheduled far ahead so no worker picks them up.
+            new_jobs.append(Job(name='dashboard.refresh_counters', run_after=timezone.now() + timedelta(days=365)))
+            Job.objects.bulk_create(new_jobs, batch_size=BATCH_SIZE)
+
+        counts['institutions'] += len(new_institutions)
+        counts['programs'] += len(new_programs)
+        counts['assignments'] += len(new_assignments)
+        counts['item_statuses'] += len(new_item_statuses)
+        counts['evidence'] += len(new_evidence)
+        counts['compliance'] += len(new_compliance)
+        counts['jobs'] += len(new_jobs)
+        if progress is not None:
+            progress(counts)
+    return counts
+
+
+def rebuild():
+    """Rebuild scorecards, dashboard counters and the search index from the tables."""
+    for command in REBUILD_COMMANDS:
+        call_command(command, stdout=StringIO())
@@ -0,0 +1,56 @@
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _query_list(request, name):
+    value = request.query_params.get(name, None)
+    if value is None:
+        return None
+    return {part.strip() for part in value.split(',') if part.strip()}
+
+
+def requested_fields(request):
+    """Field names from ``?fields=`` on read requests, or None for all fields."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    return _query_list(request, 'fields')
+
+
+def requested_expansions(request):
+    """Names of expandable fields listed in ``?expand=``."""
+    if request is None:
+        return set()
+    return _query_list(request, 'expand') or set()
+
+
+def field_requested(request, name, expandable=False):
+    """
+    Whether ``name`` will be present in the response for ``request``.
+
+    Views use this to skip the joins and prefetches behind fields the
+    client did not ask for.
+    """
+    if expandable and name not in requested_expansions(request):
+        return False
+    fields = requested_fields(request)
+    return fields is None or name in fields
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets and opt-in expansion for top-level serializers.
+
+    ``?fields=id,title`` limits the output of read requests to the named
+    fields. Nested fields listed in ``Meta.expandable_fields`` are left out
+    unless named in ``?expand=``. Only applies when the serializer has a
+    request in its context, so nested serializers are unaffected.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request', None)
+        if request is None:
+            return
+        for name in list(self.fields):
+            expandable = name in getattr(self.Meta, 'expandable_fields', ())
+            if not field_requested(request, name, expandable=expandable):
+                self.fields.pop(name)
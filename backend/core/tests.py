@@ -0,0 +1,116 @@
+from django.contrib.auth import get_user_model
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from core import explain, routing, scale, timing
+from modules.models import Module
+
+
+class QueryPlanTests(TestCase):
+    """The hot paths in ``core.explain.CHECKS`` must stay on their indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        scale.generate(institutions=5)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        cls.values = explain.sample()
+
+    def test_hot_paths_use_their_indexes(self):
+        self.assertIsNotNone(self.values)
+        for check in explain.CHECKS:
+            with self.subTest(check.name):
+                problems, plans = explain.run_check(check, self.values)
+                self.assertTrue(plans)
+                self.assertEqual(problems, [])
+
+
+class SlowRequestTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('admin', is_staff=True)
+        scale.generate(institutions=1)
+
+    def setUp(self):
+        timing.clear_slow_requests()
+        self.addCleanup(timing.clear_slow_requests)
+        self.client.force_authenticate(self.user)
+
+    @override_settings(REQUEST_TIMING_SLOW_MS=0)
+    def test_slow_requests_keep_every_statement(self):
+        with self.assertLogs('core.timing', 'WARNING'):
+            self.client.get('/api/assignments/?expand=item_statuses&page_size=50')
+        entry, = timing.slow_requests()
+        self.assertGreater(entry['queries'], 1)
+        self.assertEqual(len(entry['statements']), entry['queries'])
+        self.assertIn('assignments_assignment', entry['statements'][0]['sql'])
+
+        with self.assertLogs('core.timing', 'WARNING'):
+            response = self.client.get('/api/system/slow-requests/')
+        self.assertEqual(response.data['requests'], [entry])
+
+    def test_fast_requests_are_not_logged_by_default(self):
+        with self.assertNoLogs('core.timing'):
+            response = self.client.get('/api/assignments/')
+        self.assertIn('Server-Timing', response)
+        self.assertEqual(timing.slow_requests(), [])
+
+
+@mock.patch.object(routing, 'replica_configured', lambda: True)
+class ReplicaRoutingTests(TransactionTestCase):
+    """Which alias reads go to; no replica database is needed for that."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('reviewer')
+        # Ids are reused across tests, and earlier writes may have made this one sticky.
+        routing.cache.delete(routing.sticky_cache_key(self.user.pk))
+        self.addCleanup(routing.cache.delete, routing.sticky_cache_key(self.user.pk))
+
+    def serve(self, view, method='get'):
+        """Run ``view`` as a replica-reading view in a request, returning its result."""
+        request = getattr(RequestFactory(), method)('/')
+        request.user = self.user
+
+        def get_response(request):
+            routing.use_replica(request)
+            return view()
+
+        return routing.ReplicaRoutingMiddleware(get_response)(request)
+
+    def read_alias(self):
+        return Module.objects.all().db
+
+    def test_safe_requests_read_from_the_replica(self):
+        self.assertEqual(self.serve(self.read_alias), 'replica')
+        self.assertEqual(self.serve(self.read_alias, method='post'), 'default')
+
+    def test_reads_inside_a_transaction_stay_on_the_primary(self):
+        def view():
+            aliases = [self.read_alias()]
+            with transaction.atomic():
+                aliases.append(self.read_alias())
+                with transaction.atomic():
+                    aliases.append(self.read_alias())
+            aliases.append(self.read_alias())
+            return aliases
+
+        self.assertEqual(self.serve(view), ['replica', 'default', 'default', 'replica'])
+
+    def test_reads_after_a_write_stay_on_the_primary(self):
+        def view():
+            before = self.read_alias()
+            Module.objects.create(code='PG', display_name='Postgraduate')
+            return before, self.read_alias()
+
+        self.assertEqual(self.serve(view), ('replica', 'default'))
+        # The user's next requests read their write from the primary too.
+        self.assertEqual(self.serve(self.read_alias), 'default')
+        routing.cache.delete(routing.sticky_cache_key(self.user.pk))
+        self.assertEqual(self.serve(self.read_alias), 'replica')
+
+    def test_reads_outside_a_request_use_the_primary(self):
+        self.assertEqual(self.read_alias(), 'default')
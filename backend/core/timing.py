@@ -0,0 +1,240 @@
+"""
+Per-request timings: SQL, view, rendering and cache use.
+
+``RequestTimingMiddleware`` tracks each request in a ``RequestTimings``
+held in a context variable, so queries run in ``sync_to_async`` threads
+count towards the request that started them. Database time comes from an
+execute wrapper installed on every connection, render time from the
+template-response hooks, and cache hits from ``count_cache`` calls at the
+places that consult the cache.
+
+Every response gets a ``Server-Timing`` header. A
+``REQUEST_TIMING_SAMPLE_RATE`` share of requests is logged as one JSON
+line on the ``core.timing`` logger. Requests slower than
+``REQUEST_TIMING_SLOW_MS`` are always logged, at WARNING, and kept with
+every statement they ran in a per-process ring buffer of
+``REQUEST_TIMING_BUFFER_SIZE`` entries (see ``slow_requests``).
+
+Streaming responses are logged once the body has been sent, so their
+totals, queries and slow-buffer entries cover the whole stream; the
+header, sent first, can only cover the time to the first byte.
+"""
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('request_timings', default=None)
+_slow = deque(maxlen=settings.REQUEST_TIMING_BUFFER_SIZE)
+_slow_lock = threading.Lock()
+
+
+class RequestTimings:
+    __slots__ = (
+        'started', 'queries', 'db_seconds', 'statements', 'render_started',
+        'render_seconds', 'cache_hits', 'cache_misses',
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        # (duration, sql, alias) in execution order; not collected at all
+        # when there is no buffer to keep it in.
+        self.statements = [] if _slow.maxlen else None
+        self.render_started = None
+        self.render_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+def count_cache(hit):
+    """Record a cache lookup for the current request."""
+    timings = _current.get()
+    if timings is None:
+        return
+    if hit:
+        timings.cache_hits += 1
+    else:
+        timings.cache_misses += 1
+
+
+def record_queries(execute, sql, params, many, context):
+    """Execute wrapper timing each statement against the current request."""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        timings.queries += 1
+        timings.db_seconds += duration
+        if timings.statements is not None:
+            timings.statements.append((duration, sql, context['connection'].alias))
+
+
+def install(connection, **kwargs):
+    """``connection_created`` receiver adding ``record_queries`` to the connection."""
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_queries)
+
+
+def slow_requests():
+    """Slow requests sampled by this process, newest first."""
+    with _slow_lock:
+        return list(reversed(_slow))
+
+
+def clear_slow_requests():
+    with _slow_lock:
+        _slow.clear()
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+class RequestTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.REQUEST_TIMING_ENABLED:
+            return self.get_response(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        if not settings.REQUEST_TIMING_ENABLED:
+            return await self.get_response(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    def process_template_response(self, request, response):
+        # Called just before the handler renders DRF responses.
+        timings = _current.get()
+        if timings is not None:
+            timings.render_started = time.perf_counter()
+            response.add_post_render_callback(self.rendered)
+        return response
+
+    def rendered(self, response):
+        timings = _current.get()
+        if timings is not None and timings.render_started is not None:
+            timings.render_seconds += time.perf_counter() - timings.render_started
+            timings.render_started = None
+
+    def finish(self, request, response, timings):
+        total = time.perf_counter() - timings.started
+        app = max(total - timings.db_seconds - timings.render_seconds, 0.0)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={_ms(timings.db_seconds)};desc="{timings.queries} queries"',
+            f'app;dur={_ms(app)}',
+            f'render;dur={_ms(timings.render_seconds)}',
+            f'cache;desc="{timings.cache_hits} hits, {timings.cache_misses} misses"',
+            f'total;dur={_ms(total)}',
+        ])
+        if not response.streaming:
+            self.record(request, response, timings)
+        elif getattr(response, 'file_to_stream', None) is not None:
+            # Rewrapping a file would stop the server sending it with
+            # wsgi.file_wrapper; reading it runs no queries, so record when
+            # the response is closed instead.
+            response._resource_closers.append(lambda: self.record(request, response, timings))
+        elif response.is_async:
+            response.streaming_content = self._astream(request, response, timings, response.streaming_content)
+        else:
+            response.streaming_content = self._stream(request, response, timings, response.streaming_content)
+        return response
+
+    def _stream(self, request, response, timings, content):
+        # Queries run while producing the body count towards the request;
+        # the context variable is only set around each step, never across
+        # a yield.
+        chunks = iter(content)
+        try:
+            while True:
+                token = _current.set(timings)
+                try:
+                    chunk = next(chunks, None)
+                finally:
+                    _current.reset(token)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            self.record(request, response, timings)
+
+    async def _astream(self, request, response, timings, content):
+        chunks = aiter(content)
+        try:
+            while True:
+                token = _current.set(timings)
+                try:
+                    chunk = await anext(chunks, None)
+                finally:
+                    _current.reset(token)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            self.record(request, response, timings)
+
+    def record(self, request, response, timings):
+        """Log ``timings`` and keep them if the request was slow."""
+        total = time.perf_counter() - timings.started
+        app = max(total - timings.db_seconds - timings.render_seconds, 0.0)
+        slow = total * 1000 >= settings.REQUEST_TIMING_SLOW_MS
+        if not slow and random.random() >= settings.REQUEST_TIMING_SAMPLE_RATE:
+            return
+        match = request.resolver_match
+        entry = {
+            'method': request.method,
+            'path': request.path,
+            'view': (match.view_name or match.route) if match else None,
+            'status': response.status_code,
+            'total_ms': _ms(total),
+            'db_ms': _ms(timings.db_seconds),
+            'app_ms': _ms(app),
+            'render_ms': _ms(timings.render_seconds),
+            'queries': timings.queries,
+            'cache_hits': timings.cache_hits,
+            'cache_misses': timings.cache_misses,
+        }
+        logger.log(logging.WARNING if slow else logging.INFO, json.dumps(entry))
+        if slow and timings.statements is not None:
+            entry['at'] = timezone.now().isoformat()
+            entry['statements'] = [
+                {'sql': sql, 'ms': _ms(duration), 'database': alias}
+                for duration, sql, alias in timings.statements
+            ]
+            with _slow_lock:
+                _slow.append(entry)
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import cache_stats, database_connections, slow_requests
+
+urlpatterns = [
+    path('db/', database_connections, name='database-connections'),
+    path('cache/', cache_stats, name='cache-stats'),
+    path('slow-requests/', slow_requests, name='slow-requests'),
+]
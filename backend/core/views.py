@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.db import connections
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from . import response_cache, timing
+
+
+def _pool_stats(connection):
+    pool = getattr(connection, 'pool', None)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    requests = stats.get('requests_num', 0)
+    return {
+        **stats,
+        'requests_wait_ms_avg': round(stats.get('requests_wait_ms', 0) / requests, 2) if requests else 0,
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def database_connections(request):
+    """
+    Connection settings and pool metrics for each database alias.
+
+    Pools belong to one server process, so the figures (sizes, waiting
+    requests, cumulative wait times, failed health checks) describe the
+    process that served this request.
+    """
+    data = {}
+    for alias in connections:
+        connection = connections[alias]
+        settings_dict = connection.settings_dict
+        data[alias] = {
+            'vendor': connection.vendor,
+            'conn_max_age': settings_dict['CONN_MAX_AGE'],
+            'health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+            'connected': connection.connection is not None,
+            'pool': _pool_stats(connection),
+        }
+    return Response(data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """Cache backend and response cache hits and misses per viewset scope."""
+    return Response({
+        'backend': settings.CACHES['default']['BACKEND'],
+        'response_cache': {
+            'enabled': settings.RESPONSE_CACHE_ENABLED,
+            'timeout': settings.RESPONSE_CACHE_TIMEOUT,
+            'scopes': response_cache.stats(),
+        },
+    })
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def slow_requests(request):
+    """
+    Requests slower than ``REQUEST_TIMING_SLOW_MS`` with their SQL, newest
+    first. The buffer belongs to the process that served this request;
+    DELETE empties it.
+    """
+    if request.method == 'DELETE':
+        timing.clear_slow_requests()
+        return Response(status=204)
+    return Response({
+        'enabled': settings.REQUEST_TIMING_ENABLED,
+        'slow_ms': settings.REQUEST_TIMING_SLOW_MS,
+        'sample_rate': settings.REQUEST_TIMING_SAMPLE_RATE,
+        'requests': timing.slow_requests(),
+    })
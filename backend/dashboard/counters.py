@@ -0,0 +1,160 @@
+"""
+Precomputed dashboard counters.
+
+Counters are identified by a name such as ``assignments`` or
+``compliance.status.YES`` and an optional institution id. ``adjust`` applies
+deltas with ``F()`` updates on the write path, ``refresh`` recomputes every
+counter with a handful of GROUP BY queries, and ``read`` returns a scope's
+counters from a single indexed query.
+
+Global counters are shared by every write, so deltas are not applied inside
+the writing transaction, where the row locks would be held until it ends.
+The deltas of a transaction are added up and applied once it commits, in one
+short transaction that updates each counter once, in key order, so that
+concurrent writers always lock rows in the same order and cannot deadlock.
+A transaction that rolls back applies nothing. A process that dies between
+the commit and the update leaves the counters behind until the next
+``refresh``.
+"""
+from collections import Counter
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from assignments.models import Assignment
+from evidence.models import Evidence
+from modules.models import Module
+from organizations.models import Institution, Program
+from pg.models import PGItemCompliance
+from proformas.models import ProformaTemplate
+from .models import DashboardCounter
+
+
+def counter_key(name, institution_id=None):
+    if institution_id is None:
+        return name
+    return f"institution:{institution_id}:{name}"
+
+
+class _PendingDeltas(Counter):
+    """
+    The deltas of one transaction, applied by calling the instance once it
+    commits.
+
+    Each ``adjust`` call adds its deltas through an ``on_commit`` callback of
+    its own, so that Django drops them if a savepoint they were made in
+    rolls back; this instance is kept after all of those callbacks and
+    applies what they added up.
+    """
+    applied = False
+
+    def __call__(self):
+        self.applied = True
+        _apply(self)
+
+
+def _moved():
+    """Stands in for a ``_PendingDeltas`` callback moved further down the list."""
+
+
+def adjust(deltas):
+    """
+    Apply ``{(name, institution_id): delta}`` to the stored counters once
+    the current transaction commits, or now outside a transaction.
+    """
+    deltas = Counter({key: delta for key, delta in deltas.items() if delta})
+    if not deltas:
+        return
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        _apply(deltas)
+        return
+    hooks = connection.run_on_commit
+    for index, (_, hook, _) in enumerate(hooks):
+        if isinstance(hook, _PendingDeltas) and not hook.applied:
+            pending = hook
+            # Replaced rather than removed, so the positions of the other
+            # callbacks do not change.
+            hooks[index] = (set(), _moved, False)
+            break
+    else:
+        pending = _PendingDeltas()
+    transaction.on_commit(partial(pending.update, deltas))
+    # Outside every savepoint: only a full rollback drops it.
+    hooks.append((set(), pending, False))
+
+
+@transaction.atomic
+def _apply(deltas):
+    keys = sorted((counter_key(name, institution_id), name, institution_id, delta)
+                  for (name, institution_id), delta in deltas.items() if delta)
+    for key, name, institution_id, delta in keys:
+        if DashboardCounter.objects.filter(key=key).update(value=F('value') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                DashboardCounter.objects.create(
+                    key=key, name=name, institution_id=institution_id, value=delta,
+                )
+        except IntegrityError:
+            # A concurrent writer created the row first.
+            DashboardCounter.objects.filter(key=key).update(value=F('value') + delta)
+
+
+def compute():
+    """Count everything from scratch; returns ``{(name, institution_id): value}``."""
+    counts = Counter({
+        ('modules', None): Module.objects.count(),
+        ('templates', None): ProformaTemplate.objects.count(),
+        ('institutions', None): Institution.objects.count(),
+        ('programs', None): Program.objects.count(),
+        ('assignments', None): Assignment.objects.count(),
+        ('evidence', None): Evidence.objects.count(),
+    })
+    for row in Program.objects.values('institution_id').annotate(n=Count('id')):
+        counts[('programs', row['institution_id'])] += row['n']
+    for row in Assignment.objects.values('program__institution_id', 'status').annotate(n=Count('id')):
+        for institution_id in (None, row['program__institution_id']):
+            counts[('assignments.status.' + row['status'], institution_id)] += row['n']
+        counts[('assignments', row['program__institution_id'])] += row['n']
+    for row in Evidence.objects.values('assignment__program__institution_id').annotate(n=Count('id')):
+        counts[('evidence', row['assignment__program__institution_id'])] += row['n']
+    for row in PGItemCompliance.objects.values('institution_id', 'status').annotate(n=Count('id')):
+        counts[('compliance.status.' + row['status'], None)] += row['n']
+        if row['institution_id'] is not None:
+            counts[('compliance.status.' + row['status'], row['institution_id'])] += row['n']
+    return counts
+
+
+@transaction.atomic
+def refresh():
+    """Replace every stored counter with a fresh count; returns the number of rows."""
+    counts = compute()
+    DashboardCounter.objects.all().delete()
+    DashboardCounter.objects.bulk_create(
+        DashboardCounter(
+            key=counter_key(name, institution_id),
+            name=name,
+            institution_id=institution_id,
+            value=value,
+        )
+        for (name, institution_id), value in counts.items()
+    )
+    return len(counts)
+
+
+def _scope(institution_id):
+    if institution_id is None:
+        return DashboardCounter.objects.filter(institution_id__isnull=True)
+    return DashboardCounter.objects.filter(institution_id=institution_id)
+
+
+def read(institution_id=None):
+    """Return ``{name: value}`` for the global scope or one institution."""
+    return dict(_scope(institution_id).values_list('name', 'value'))
+
+
+async def aread(institution_id=None):
+    """``read`` with the async ORM."""
+    return {name: value async for name, value in _scope(institution_id).values_list('name', 'value')}
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from dashboard import counters
+from dashboard.models import DashboardCounter
+
+
+class Command(BaseCommand):
+    help = "Recount every dashboard counter from the source tables (safe to run periodically, e.g. from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--if-empty",
+            action="store_true",
+            help="Do nothing if any counters exist, e.g. on every deployment.",
+        )
+
+    def handle(self, *args, **options):
+        if options["if_empty"] and DashboardCounter.objects.exists():
+            self.stdout.write("Dashboard counters already exist; nothing to do.")
+            return
+        total = counters.refresh()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {total} dashboard counters."))
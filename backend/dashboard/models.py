@@ -0,0 +1,20 @@
+from django.db import models
+from core.models import BaseModel
+
+
+class DashboardCounter(BaseModel):
+    """
+    A single precomputed dashboard count.
+
+    Global counters have no ``institution_id``; per-institution breakdowns
+    carry it so an institution's counters are one indexed lookup. Rows are
+    kept current by ``dashboard.signals`` and can be rebuilt with the
+    ``refresh_dashboard_counters`` command.
+    """
+    key = models.CharField(max_length=200, unique=True)
+    name = models.CharField(max_length=100)
+    institution_id = models.UUIDField(null=True, blank=True, db_index=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
@@ -0,0 +1,116 @@
+"""
+Keep ``DashboardCounter`` rows in step with model writes.
+
+Each tracked model lists the fields its counters depend on and a function
+mapping those field values to ``(name, institution_id)`` counter keys. The
+field values are captured when an instance is loaded and after each save,
+so a save or delete applies only the difference between the previous and
+current contributions.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from assignments.models import Assignment
+from evidence.models import Evidence
+from modules.models import Module
+from organizations.models import Institution, Program
+from pg.models import PGItemCompliance
+from pg.signals import compliance_bulk_upserted
+from proformas.models import ProformaTemplate
+from . import counters
+from .models import DashboardCounter
+
+
+def _scoped(names, institution_id):
+    keys = [(name, None) for name in names]
+    if institution_id is not None:
+        keys += [(name, institution_id) for name in names]
+    return keys
+
+
+def _program_counters(institution_id):
+    return _scoped(['programs'], institution_id)
+
+
+def _assignment_counters(program_id, status):
+    institution_id = (
+        Program.objects.filter(pk=program_id).values_list('institution_id', flat=True).first()
+    )
+    return _scoped(['assignments', 'assignments.status.' + status], institution_id)
+
+
+def _evidence_counters(assignment_id):
+    institution_id = (
+        Assignment.objects.filter(pk=assignment_id)
+        .values_list('program__institution_id', flat=True)
+        .first()
+    )
+    return _scoped(['evidence'], institution_id)
+
+
+def _compliance_counters(institution_id, status):
+    return _scoped(['compliance.status.' + status], institution_id)
+
+
+TRACKED = {
+    Module: ((), lambda: [('modules', None)]),
+    ProformaTemplate: ((), lambda: [('templates', None)]),
+    Institution: ((), lambda: [('institutions', None)]),
+    Program: (('institution_id',), _program_counters),
+    Assignment: (('program_id', 'status'), _assignment_counters),
+    Evidence: (('assignment_id',), _evidence_counters),
+    PGItemCompliance: (('institution_id', 'status'), _compliance_counters),
+}
+
+
+def _state(model, instance):
+    # Read from __dict__ so deferred fields are never loaded just for counting.
+    return tuple(instance.__dict__.get(field) for field in TRACKED[model][0])
+
+
+def _contributions(model, state, sign):
+    return Counter({key: sign for key in TRACKED[model][1](*state)})
+
+
+def _capture(sender, instance, **kwargs):
+    instance._dashboard_state = _state(sender, instance)
+
+
+def _on_save(sender, instance, created, **kwargs):
+    state = _state(sender, instance)
+    previous = getattr(instance, '_dashboard_state', None)
+    if created:
+        counters.adjust(_contributions(sender, state, 1))
+    elif previous is not None and state != previous:
+        deltas = _contributions(sender, state, 1)
+        deltas.update(_contributions(sender, previous, -1))
+        counters.adjust(deltas)
+    instance._dashboard_state = state
+
+
+def _on_delete(sender, instance, **kwargs):
+    counters.adjust(_contributions(sender, _state(sender, instance), -1))
+    if sender is Institution:
+        # After the deltas of its programs and assignments, which are
+        # applied on commit too.
+        institution_id = instance.pk
+        transaction.on_commit(lambda: DashboardCounter.objects.filter(institution_id=institution_id).delete())
+
+
+for model in TRACKED:
+    uid = model.__name__
+    post_init.connect(_capture, sender=model, dispatch_uid=f'dashboard-capture-{uid}')
+    post_save.connect(_on_save, sender=model, dispatch_uid=f'dashboard-save-{uid}')
+    post_delete.connect(_on_delete, sender=model, dispatch_uid=f'dashboard-delete-{uid}')
+
+
+@receiver(compliance_bulk_upserted, sender=PGItemCompliance, dispatch_uid='dashboard-compliance-bulk')
+def _on_compliance_bulk(sender, removed, added, **kwargs):
+    deltas = Counter()
+    for sign, batch in ((-1, removed), (1, added)):
+        for institution_id, item, status in batch:
+            deltas.update(_contributions(PGItemCompliance, (institution_id, status), sign))
+    counters.adjust(deltas)
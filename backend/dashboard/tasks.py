@@ -0,0 +1,7 @@
+from jobs.registry import task
+from . import counters
+
+
+@task('dashboard.refresh_counters')
+def refresh_counters(job):
+    return {'counters': counters.refresh()}
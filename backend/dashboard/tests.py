@@ -0,0 +1,90 @@
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from assignments.models import Assignment
+from modules.models import Module
+from organizations.models import Institution, Program
+from pg.models import PGItemCompliance
+from proformas.models import ProformaItem, ProformaSection, ProformaTemplate
+from . import counters
+from .models import DashboardCounter
+
+
+class CounterMaintenanceTests(TransactionTestCase):
+    """Counter deltas are applied once per transaction, after it commits."""
+
+    def setUp(self):
+        module = Module.objects.create(code='PG', display_name='Postgraduate')
+        self.template = ProformaTemplate.objects.create(module=module, code='T1', title='Template')
+        section = ProformaSection.objects.create(template=self.template, title='Section')
+        self.items = [ProformaItem.objects.create(section=section, text=f'Item {n}', order=n) for n in range(3)]
+        self.institution = Institution.objects.create(name='Institution')
+
+    def assert_counters_match(self):
+        stored = {
+            (row.name, row.institution_id): row.value
+            for row in DashboardCounter.objects.all() if row.value
+        }
+        self.assertEqual(stored, {key: value for key, value in counters.compute().items() if value})
+
+    def counter_writes(self, queries):
+        """Keys of the counter rows written by ``queries``, in order."""
+        return [
+            query['sql'].split('"key" = ')[1].strip("'")
+            for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "dashboard_dashboardcounter"')
+        ]
+
+    def test_writes_apply_once_on_commit(self):
+        counters.refresh()
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                program = Program.objects.create(name='Program', level='Postgraduate', discipline='Medicine',
+                                                 institution=self.institution)
+                Assignment.objects.create(template=self.template, program=program, title='Review')
+                for item in reversed(self.items):
+                    PGItemCompliance.objects.create(institution=self.institution, item=item, status='NO')
+                PGItemCompliance.objects.filter(item=self.items[0]).get().delete()
+                self.assertEqual(counters.read(self.institution.pk), {})
+        # One update per counter, in key order, whatever the order of writes.
+        writes = self.counter_writes(queries)
+        self.assertEqual(writes, sorted(set(writes)))
+        self.assertIn(f'institution:{self.institution.pk}:compliance.status.NO', writes)
+        self.assertEqual(counters.read(self.institution.pk)['compliance.status.NO'], 2)
+        self.assert_counters_match()
+
+    def test_rollbacks_apply_nothing(self):
+        counters.refresh()
+        with transaction.atomic():
+            PGItemCompliance.objects.create(institution=self.institution, item=self.items[0], status='YES')
+            try:
+                with transaction.atomic():
+                    PGItemCompliance.objects.create(institution=self.institution, item=self.items[1], status='YES')
+                    raise ValueError
+            except ValueError:
+                pass
+        try:
+            with transaction.atomic():
+                PGItemCompliance.objects.create(institution=self.institution, item=self.items[2], status='YES')
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(counters.read()['compliance.status.YES'], 1)
+        self.assert_counters_match()
+
+    def test_writes_outside_a_transaction(self):
+        counters.refresh()
+        PGItemCompliance.objects.create(institution=self.institution, item=self.items[0], status='YES')
+        self.assertEqual(counters.read()['compliance.status.YES'], 1)
+        self.assert_counters_match()
+
+    def test_deleting_an_institution_drops_its_counters(self):
+        program = Program.objects.create(name='Program', level='Postgraduate', discipline='Medicine',
+                                         institution=self.institution)
+        Assignment.objects.create(template=self.template, program=program, title='Review')
+        counters.refresh()
+        with transaction.atomic():
+            Institution.objects.get(pk=self.institution.pk).delete()
+        self.assertFalse(DashboardCounter.objects.filter(institution_id=self.institution.pk).exists())
+        self.assert_counters_match()
@@ -1,6 +1,6 @@
 from django.urls import path
-from .views import summary
+from .views import SummaryView
 
 urlpatterns = [
-    path('summary/', summary, name='dashboard-summary'),
+    path('summary/', SummaryView.as_view(), name='dashboard-summary'),
 ]
@@ -1,19 +1,62 @@
-from rest_framework.decorators import api_view, permission_classes
+import uuid
+
+from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from modules.models import Module
-from proformas.models import ProformaTemplate
-from assignments.models import Assignment
-from organizations.models import Program
-from evidence.models import Evidence
-
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def summary(request):
-    return Response({
-        "modules": Module.objects.count(),
-        "templates": ProformaTemplate.objects.count(),
-        "assignments": Assignment.objects.count(),
-        "programs": Program.objects.count(),
-        "evidence": Evidence.objects.count(),
-    })
+from rest_framework.views import APIView
+from core.async_views import AsyncDispatchMixin
+from core.routing import ReplicaReadMixin
+from . import counters
+
+STATUS_BREAKDOWNS = {
+    'assignments_by_status': 'assignments.status.',
+    'compliance_by_status': 'compliance.status.',
+}
+
+
+def _breakdown(values, prefix):
+    return {
+        name[len(prefix):]: value
+        for name, value in values.items()
+        if name.startswith(prefix)
+    }
+
+
+class SummaryView(AsyncDispatchMixin, ReplicaReadMixin, APIView):
+    """
+    Dashboard totals read from precomputed counters.
+
+    Pass ``?institution=<id>`` for that institution's programs, assignments,
+    evidence and status breakdowns instead of the global totals.
+    Counters are never recomputed here; the deployment builds them once
+    with ``refresh_dashboard_counters --if-empty``.
+    """
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request):
+        institution_id = request.query_params.get('institution', None)
+        if institution_id:
+            try:
+                institution_id = uuid.UUID(institution_id)
+            except ValueError:
+                return Response({'detail': 'Invalid institution id.'}, status=status.HTTP_400_BAD_REQUEST)
+            values = await counters.aread(institution_id)
+            data = {
+                "institution": institution_id,
+                "programs": values.get('programs', 0),
+                "assignments": values.get('assignments', 0),
+                "evidence": values.get('evidence', 0),
+            }
+        else:
+            values = await counters.aread()
+            data = {
+                "modules": values.get('modules', 0),
+                "templates": values.get('templates', 0),
+                "assignments": values.get('assignments', 0),
+                "programs": values.get('programs', 0),
+                "evidence": values.get('evidence', 0),
+                "institutions": values.get('institutions', 0),
+            }
+        for key, prefix in STATUS_BREAKDOWNS.items():
+            data[key] = _breakdown(values, prefix)
+        return Response(data)
@@ -14,6 +14,15 @@ python manage.py migrate --noinput
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
+# Both are maintained incrementally; they are only built here the first
+# time, before seeding adds to them. Run the commands by hand (or the
+# dashboard.refresh_counters / pg.rebuild_scorecards jobs) to repair drift.
+echo "Building compliance scorecards if missing..."
+python manage.py rebuild_scorecards --if-empty
+
+echo "Building dashboard counters if missing..."
+python manage.py refresh_dashboard_counters --if-empty
+
 echo "Seeding database with PMDC PG data..."
 python manage.py seed_pmdc_pg || echo "Data already seeded or error occurred"
 
@@ -28,5 +37,11 @@ else:
     print('Superuser already exists')
 EOF
 
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+  echo "Starting Gunicorn with Uvicorn workers (ASGI)..."
+  exec gunicorn config.asgi:application --bind 0.0.0.0:8000 --workers 3 --timeout 120 \
+    --worker-class uvicorn_worker.UvicornWorker
+fi
+
 echo "Starting Gunicorn..."
 exec gunicorn config.wsgi:application --bind 0.0.0.0:8000 --workers 3 --timeout 120
@@ -0,0 +1,114 @@
+"""
+Content-addressed, reference-counted storage for evidence files.
+
+Files live at ``evidence/sha256/<aa>/<bb>/<digest>`` in the Evidence file
+storage. ``store`` adds a reference (saving the bytes only for a digest
+not seen before) and ``release`` drops one, deleting the file once no
+``Evidence`` row points at it. Digests are computed while the bytes
+stream in (see ``evidence.upload_handlers`` and ``evidence.uploads``);
+``store`` only reads the file itself when no digest was attached.
+
+A new blob always gets a file of its own, saved under a free name, and a
+released blob's file is deleted by its own name. A store racing with the
+release of the last reference to the same bytes therefore never ends up
+pointing at a file that is being deleted.
+"""
+import hashlib
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import Evidence, EvidenceBlob
+
+HASH_BLOCK_SIZE = 64 * 1024
+
+
+def storage():
+    return Evidence._meta.get_field('file').storage
+
+
+def blob_path(sha256):
+    return f'evidence/sha256/{sha256[:2]}/{sha256[2:4]}/{sha256}'
+
+
+def file_sha256(content):
+    digest = hashlib.sha256()
+    content.seek(0)
+    for block in content.chunks(HASH_BLOCK_SIZE):
+        digest.update(block)
+    content.seek(0)
+    return digest.hexdigest()
+
+
+def add_reference(sha256):
+    blob = EvidenceBlob.objects.select_for_update().filter(sha256=sha256).first()
+    if blob is not None:
+        EvidenceBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+        blob.ref_count += 1
+    return blob
+
+
+def stage(content):
+    """
+    Write ``content`` to storage ahead of ``store``, outside any transaction.
+
+    Large files are then copied before the database is touched; ``store``
+    picks the staged file up from ``content.blob_name``. Nothing is written
+    when a blob with the same digest already exists.
+    """
+    content.sha256 = getattr(content, 'sha256', None) or file_sha256(content)
+    if not EvidenceBlob.objects.filter(sha256=content.sha256).exists():
+        content.blob_name = storage().save(blob_path(content.sha256), content)
+    return content
+
+
+def discard_staged(content):
+    """Delete the file ``stage`` wrote for ``content``, if any."""
+    name = getattr(content, 'blob_name', None)
+    if name:
+        storage().delete(name)
+        content.blob_name = None
+
+
+def store(content):
+    """
+    Add a reference to the blob holding ``content`` and return the blob.
+
+    Must run inside a transaction; the caller points an ``Evidence`` row at
+    ``blob.name``. A file written by ``stage`` is used for a new blob and
+    deleted again if the digest turned out to have one already.
+    """
+    sha256 = getattr(content, 'sha256', None) or file_sha256(content)
+    staged = getattr(content, 'blob_name', None)
+    blob = add_reference(sha256)
+    if blob is not None:
+        discard_staged(content)
+        return blob
+
+    files = storage()
+    # Never adopt a file already at the digest path: it may belong to a
+    # blob that a concurrent release has just deleted and whose file is
+    # about to be removed. Storage picks a free name next to it instead.
+    name = staged or files.save(blob_path(sha256), content)
+    try:
+        with transaction.atomic():
+            return EvidenceBlob.objects.create(
+                sha256=sha256, name=name, size=files.size(name), ref_count=1,
+            )
+    except IntegrityError:
+        # A concurrent upload of the same bytes created the blob first.
+        files.delete(name)
+        return add_reference(sha256)
+
+
+def release(blob_id):
+    """Drop one reference; delete the blob and its file at zero."""
+    blob = EvidenceBlob.objects.select_for_update().filter(pk=blob_id).first()
+    if blob is None:
+        return
+    if blob.ref_count > 1:
+        EvidenceBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') - 1)
+        return
+    name = blob.name
+    blob.delete()
+    transaction.on_commit(lambda: storage().delete(name))
@@ -0,0 +1,86 @@
+import os
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from evidence import blobs
+from evidence.models import Evidence, EvidenceBlob
+
+
+class Command(BaseCommand):
+    help = "Move existing evidence files into the content-addressed store, deduplicating identical files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be deduplicated without changing anything.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        files = blobs.storage()
+        seen = {}
+        moved = deduplicated = missing = 0
+        bytes_freed = 0
+
+        legacy = Evidence.objects.filter(blob__isnull=True).exclude(file="").order_by("created_at")
+        for evidence in legacy.iterator(chunk_size=500):
+            old_name = evidence.file.name
+            if not files.exists(old_name):
+                missing += 1
+                self.stdout.write(self.style.WARNING(f"Missing file for evidence {evidence.id}: {old_name}"))
+                continue
+
+            with files.open(old_name, "rb") as content:
+                sha256 = blobs.file_sha256(content)
+            size = files.size(old_name)
+            known = sha256 in seen or EvidenceBlob.objects.filter(sha256=sha256).exists()
+
+            if dry_run:
+                if known:
+                    deduplicated += 1
+                    bytes_freed += size
+                else:
+                    moved += 1
+                seen[sha256] = True
+                continue
+
+            with transaction.atomic():
+                blob = blobs.add_reference(sha256)
+                if blob is None:
+                    blob = self._move_into_store(evidence, old_name, sha256, size)
+                    moved += 1
+                else:
+                    deduplicated += 1
+                    bytes_freed += size
+                Evidence.objects.filter(pk=evidence.pk).update(
+                    file=blob.name,
+                    blob=blob,
+                    original_name=evidence.original_name or os.path.basename(old_name),
+                )
+                if blob.name != old_name and not Evidence.objects.filter(file=old_name).exists():
+                    transaction.on_commit(lambda name=old_name: files.delete(name))
+            seen[sha256] = True
+
+        prefix = "[dry-run] " if dry_run else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}{moved} files moved into the store, {deduplicated} duplicates removed "
+                f"({bytes_freed} bytes freed), {missing} missing."
+            )
+        )
+
+    def _move_into_store(self, evidence, old_name, sha256, size):
+        files = blobs.storage()
+        if Evidence.objects.filter(file=old_name).exclude(pk=evidence.pk).exists():
+            # Another legacy row still uses the old path: copy instead of moving.
+            with files.open(old_name, "rb") as content:
+                new_name = files.save(blobs.blob_path(sha256), content)
+        else:
+            # Like blobs.store, never adopt a file already at the digest path.
+            new_name = files.get_available_name(blobs.blob_path(sha256))
+            target = files.path(new_name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(files.path(old_name), target)
+        return EvidenceBlob.objects.create(sha256=sha256, name=new_name, size=size, ref_count=1)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0002_assignment_assignment_created_idx_and_more'),
+        ('evidence', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evidence',
+            index=models.Index(fields=['created_at', 'id'], name='evidence_created_idx'),
+        ),
+    ]
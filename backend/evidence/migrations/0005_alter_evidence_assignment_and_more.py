@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0003_alter_itemstatus_assignment_and_more'),
+        ('evidence', '0004_evidenceblob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='evidence',
+            name='assignment',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='evidence', to='assignments.assignment'),
+        ),
+        migrations.AddIndex(
+            model_name='evidence',
+            index=models.Index(fields=['assignment', 'created_at', 'id'], name='evidence_assign_created_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evidence', '0006_alter_evidence_id_alter_evidenceblob_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='evidenceupload',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('assembling', 'Assembling'), ('committed', 'Committed')], default='pending', max_length=20),
+        ),
+    ]
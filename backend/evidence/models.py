@@ -1,15 +1,77 @@
+from django.conf import settings
 from django.db import models
 from core.models import BaseModel
 from assignments.models import Assignment, ItemStatus
 
+class EvidenceBlob(BaseModel):
+    """
+    One stored file, addressed by the SHA-256 of its bytes.
+
+    ``ref_count`` is the number of ``Evidence`` rows pointing at the blob;
+    the blob and its file are removed when it drops to zero (see
+    ``evidence.blobs``).
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.sha256} ({self.ref_count} refs)"
+
 class Evidence(BaseModel):
-    assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name='evidence')
+    # Indexed by evidence_assign_created_idx.
+    assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name='evidence', db_index=False)
     item_status = models.ForeignKey(ItemStatus, on_delete=models.SET_NULL, null=True, blank=True, related_name='evidence')
     file = models.FileField(upload_to='evidence/')
+    blob = models.ForeignKey(EvidenceBlob, on_delete=models.PROTECT, null=True, blank=True, related_name='evidence')
+    original_name = models.CharField(max_length=255, blank=True, default="")
     description = models.TextField(blank=True, null=True)
 
     class Meta:
         verbose_name_plural = "Evidence"
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='evidence_created_idx'),
+            models.Index(fields=['assignment', 'created_at', 'id'], name='evidence_assign_created_idx'),
+        ]
 
     def __str__(self):
         return f"Evidence for {self.assignment.title}"
+
+
+class EvidenceUpload(BaseModel):
+    """
+    A resumable, chunked upload that becomes an ``Evidence`` row on commit.
+
+    Chunks are stored as separate part files under
+    ``settings.EVIDENCE_UPLOAD_DIR/<id>/`` (see ``evidence.uploads``), so
+    each chunk is its own short request and a dropped connection only
+    loses the chunk in flight.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('assembling', 'Assembling'),
+        ('committed', 'Committed'),
+    ]
+
+    assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name='evidence_uploads')
+    item_status = models.ForeignKey(ItemStatus, on_delete=models.SET_NULL, null=True, blank=True, related_name='evidence_uploads')
+    description = models.TextField(blank=True, null=True)
+    filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='evidence_uploads')
+    evidence = models.OneToOneField(Evidence, on_delete=models.SET_NULL, null=True, blank=True, related_name='upload')
+
+    @property
+    def total_chunks(self):
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    def expected_chunk_size(self, index):
+        if index == self.total_chunks - 1:
+            return self.total_size - index * self.chunk_size
+        return self.chunk_size
+
+    def __str__(self):
+        return f"Upload of {self.filename} ({self.status})"
@@ -1,7 +1,53 @@
+import os
+
+from django.conf import settings
 from rest_framework import serializers
-from .models import Evidence
+from . import uploads
+from .models import Evidence, EvidenceUpload
 
 class EvidenceSerializer(serializers.ModelSerializer):
+    download_url = serializers.HyperlinkedIdentityField(view_name='evidence-download', read_only=True)
+
     class Meta:
         model = Evidence
-        fields = ['id', 'assignment', 'item_status', 'file', 'description', 'created_at']
+        fields = ['id', 'assignment', 'item_status', 'file', 'original_name', 'download_url', 'description', 'created_at']
+        read_only_fields = ['original_name']
+
+
+class EvidenceUploadSerializer(serializers.ModelSerializer):
+    total_chunks = serializers.IntegerField(read_only=True)
+    received_chunks = serializers.SerializerMethodField()
+    chunk_size = serializers.IntegerField(required=False, min_value=1)
+
+    class Meta:
+        model = EvidenceUpload
+        fields = [
+            'id', 'assignment', 'item_status', 'description', 'filename',
+            'total_size', 'chunk_size', 'total_chunks', 'received_chunks',
+            'status', 'evidence', 'created_at'
+        ]
+        read_only_fields = ['status', 'evidence', 'created_at']
+
+    def get_received_chunks(self, obj):
+        return uploads.received_chunks(obj)
+
+    def validate_total_size(self, value):
+        if value < 1 or value > settings.EVIDENCE_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f'Uploads must be between 1 and {settings.EVIDENCE_UPLOAD_MAX_SIZE} bytes.'
+            )
+        return value
+
+    def validate_chunk_size(self, value):
+        if value > settings.EVIDENCE_UPLOAD_MAX_CHUNK_SIZE:
+            raise serializers.ValidationError(
+                f'Chunks may be at most {settings.EVIDENCE_UPLOAD_MAX_CHUNK_SIZE} bytes.'
+            )
+        return value
+
+    def validate_filename(self, value):
+        return os.path.basename(value)
+
+    def create(self, validated_data):
+        validated_data.setdefault('chunk_size', settings.EVIDENCE_UPLOAD_CHUNK_SIZE)
+        return super().create(validated_data)
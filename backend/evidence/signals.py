@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from . import blobs
+from .models import Evidence
+
+
+@receiver(post_delete, sender=Evidence, dispatch_uid='evidence-release-blob')
+def release_blob(sender, instance, **kwargs):
+    """Drop the blob reference however the row was deleted (including cascades)."""
+    if instance.blob_id:
+        blobs.release(instance.blob_id)
@@ -0,0 +1,133 @@
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from modules.models import Module
+from organizations.models import Institution, Program
+from proformas.models import ProformaTemplate
+from assignments.models import Assignment
+from .models import Evidence, EvidenceBlob, EvidenceUpload
+
+
+class EvidenceStorageTestCase(APITestCase):
+    """Evidence files and upload parts go to temporary directories."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', is_staff=True)
+        module = Module.objects.create(code='PG', display_name='Postgraduate')
+        template = ProformaTemplate.objects.create(module=module, code='T1', title='Template')
+        institution = Institution.objects.create(name='Institution')
+        program = Program.objects.create(
+            name='Program', level='Postgraduate', discipline='Medicine', institution=institution
+        )
+        cls.assignment = Assignment.objects.create(template=template, program=program, title='Review')
+
+    def setUp(self):
+        self.media_root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=self.media_root, EVIDENCE_UPLOAD_DIR=self.media_root / 'uploads')
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.client.force_authenticate(self.user)
+
+    def stored_files(self):
+        return sorted(path.name for path in (self.media_root / 'evidence').rglob('*') if path.is_file())
+
+
+class BlobReferenceTests(EvidenceStorageTestCase):
+    """Evidence rows with the same bytes share one blob, deleted with the last of them."""
+
+    def upload(self, content, name='report.pdf'):
+        response = self.client.post('/api/evidence/', {
+            'assignment': str(self.assignment.pk), 'file': SimpleUploadedFile(name, content),
+        }, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def delete(self, evidence_id):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/evidence/{evidence_id}/')
+        self.assertEqual(response.status_code, 204)
+
+    def test_same_bytes_share_a_blob(self):
+        first = self.upload(b'evidence', 'a.pdf')
+        second = self.upload(b'evidence', 'b.pdf')
+        blob = EvidenceBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(self.stored_files(), [blob.sha256])
+        self.assertEqual(
+            set(Evidence.objects.values_list('original_name', flat=True)), {'a.pdf', 'b.pdf'}
+        )
+
+        self.delete(first)
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertEqual(self.stored_files(), [blob.sha256])
+
+        self.delete(second)
+        self.assertFalse(EvidenceBlob.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_replacing_the_file_releases_the_old_blob(self):
+        evidence_id = self.upload(b'first draft')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/api/evidence/{evidence_id}/', {
+                'file': SimpleUploadedFile('final.pdf', b'final version'),
+            }, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        blob = EvidenceBlob.objects.get()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertEqual(Evidence.objects.get().blob, blob)
+        self.assertEqual(self.stored_files(), [blob.sha256])
+
+    def test_cascading_deletes_release_their_blobs(self):
+        self.upload(b'evidence', 'a.pdf')
+        self.upload(b'evidence', 'b.pdf')
+        self.upload(b'other evidence')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assignment.delete()
+        self.assertFalse(EvidenceBlob.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+
+class ChunkedUploadCommitTests(EvidenceStorageTestCase):
+
+    def start_upload(self, content):
+        response = self.client.post('/api/evidence/uploads/', {
+            'assignment': str(self.assignment.pk), 'filename': 'report.pdf', 'total_size': len(content),
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        upload_id = response.data['id']
+        response = self.client.put(
+            f'/api/evidence/uploads/{upload_id}/chunks/0/', content, content_type='application/octet-stream'
+        )
+        self.assertEqual(response.status_code, 200)
+        return upload_id
+
+    def test_commit(self):
+        upload_id = self.start_upload(b'evidence')
+        response = self.client.post(f'/api/evidence/uploads/{upload_id}/commit/')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(EvidenceUpload.objects.get(pk=upload_id).status, 'committed')
+        self.assertEqual(len(self.stored_files()), 1)
+
+    def test_failed_commit_removes_the_staged_file(self):
+        upload_id = self.start_upload(b'evidence')
+        with mock.patch.object(Evidence.objects, 'create', side_effect=RuntimeError('database went away')):
+            with self.assertRaises(RuntimeError):
+                self.client.post(f'/api/evidence/uploads/{upload_id}/commit/')
+        self.assertEqual(self.stored_files(), [])
+        self.assertFalse(EvidenceBlob.objects.exists())
+        self.assertEqual(EvidenceUpload.objects.get(pk=upload_id).status, 'pending')
+
+        # The parts are kept, so the commit can be retried.
+        response = self.client.post(f'/api/evidence/uploads/{upload_id}/commit/')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.stored_files()), 1)
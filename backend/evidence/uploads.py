@@ -0,0 +1,95 @@
+"""
+Disk storage for chunked evidence uploads.
+
+Each upload owns a directory of ``<index>.part`` files. A chunk is
+streamed from the request into a temporary file and renamed into place
+only once it has the expected size, so a part file on disk is always a
+complete chunk and retrying a chunk simply replaces it.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+class ChunkSizeMismatch(Exception):
+    pass
+
+
+class AssembledFile(File):
+    """
+    An assembled upload on local disk.
+
+    Exposes ``temporary_file_path`` so ``FileSystemStorage`` moves the file
+    into MEDIA_ROOT instead of copying it again.
+    """
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def upload_dir(upload):
+    return Path(settings.EVIDENCE_UPLOAD_DIR) / str(upload.id)
+
+
+def received_chunks(upload):
+    directory = upload_dir(upload)
+    if not directory.exists():
+        return []
+    return sorted(int(path.stem) for path in directory.glob('*.part'))
+
+
+def write_chunk(upload, index, stream):
+    """Stream one chunk from ``stream`` to disk and return its size."""
+    directory = upload_dir(upload)
+    directory.mkdir(parents=True, exist_ok=True)
+    expected = upload.expected_chunk_size(index)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    written = 0
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while written <= expected:
+                block = stream.read(STREAM_BLOCK_SIZE)
+                if not block:
+                    break
+                out.write(block)
+                written += len(block)
+        if written != expected:
+            raise ChunkSizeMismatch(f'Chunk {index} must be {expected} bytes, got {written}.')
+        os.replace(tmp_path, directory / f'{index}.part')
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return written
+
+
+def assemble(upload):
+    """
+    Concatenate all parts into one file and return it, opened for reading.
+
+    The SHA-256 of the content is computed during the same pass and set as
+    the file's ``sha256`` attribute.
+    """
+    directory = upload_dir(upload)
+    fd, assembled_path = tempfile.mkstemp(dir=directory, suffix='.assembled')
+    digest = hashlib.sha256()
+    with os.fdopen(fd, 'wb') as out:
+        for index in range(upload.total_chunks):
+            with open(directory / f'{index}.part', 'rb') as part:
+                while block := part.read(STREAM_BLOCK_SIZE):
+                    digest.update(block)
+                    out.write(block)
+    assembled = AssembledFile(open(assembled_path, 'rb'), name=upload.filename)
+    assembled.sha256 = digest.hexdigest()
+    return assembled
+
+
+def discard(upload):
+    shutil.rmtree(upload_dir(upload), ignore_errors=True)
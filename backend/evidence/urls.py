@@ -1,7 +1,9 @@
 from rest_framework.routers import DefaultRouter
-from .views import EvidenceViewSet
+from .views import EvidenceUploadViewSet, EvidenceViewSet
 
 router = DefaultRouter()
+# Registered before the empty prefix so 'uploads/' is not taken as an evidence id.
+router.register('uploads', EvidenceUploadViewSet, basename='evidence-upload')
 router.register('', EvidenceViewSet, basename='evidence')
 
 urlpatterns = router.urls
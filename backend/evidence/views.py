@@ -1,9 +1,185 @@
-from rest_framework import viewsets
+import io
+import mimetypes
+import os
+from datetime import timedelta
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db import transaction
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
-from .models import Evidence
-from .serializers import EvidenceSerializer
+from rest_framework.response import Response
+from . import blobs, uploads
+from .models import Evidence, EvidenceUpload
+from .serializers import EvidenceSerializer, EvidenceUploadSerializer
 
 class EvidenceViewSet(viewsets.ModelViewSet):
     queryset = Evidence.objects.all().order_by('-created_at')
     serializer_class = EvidenceSerializer
     permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        assignment_id = self.request.query_params.get('assignment', None)
+        if assignment_id:
+            queryset = queryset.filter(assignment_id=assignment_id)
+        return queryset
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        """
+        Store the file in the content-addressed blob store.
+        """
+        upload = serializer.validated_data['file']
+        blob = blobs.store(upload)
+        serializer.save(file=blob.name, blob=blob, original_name=os.path.basename(upload.name))
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        upload = serializer.validated_data.get('file')
+        if upload is None:
+            serializer.save()
+            return
+        previous_blob_id = serializer.instance.blob_id
+        blob = blobs.store(upload)
+        serializer.save(file=blob.name, blob=blob, original_name=os.path.basename(upload.name))
+        if previous_blob_id:
+            blobs.release(previous_blob_id)
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """
+        Download the evidence file after the usual permission checks.
+
+        In production the bytes are sent by nginx via X-Accel-Redirect,
+        which also handles Range and conditional requests; without an
+        accel prefix configured Django streams the file itself.
+        """
+        evidence = self.get_object()
+        if not evidence.file:
+            raise Http404
+        filename = evidence.original_name or os.path.basename(evidence.file.name)
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+        prefix = settings.EVIDENCE_DOWNLOAD_ACCEL_PREFIX
+        if prefix:
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(evidence.file.name)
+        else:
+            try:
+                response = FileResponse(evidence.file.open('rb'), content_type=content_type)
+            except FileNotFoundError:
+                raise Http404
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+class EvidenceUploadViewSet(mixins.CreateModelMixin,
+                            mixins.RetrieveModelMixin,
+                            mixins.DestroyModelMixin,
+                            viewsets.GenericViewSet):
+    """
+    Resumable chunked uploads of evidence files.
+
+    1. ``POST /api/evidence/uploads/`` with assignment, filename and
+       total_size (optionally item_status, description, chunk_size).
+    2. ``PUT /api/evidence/uploads/<id>/chunks/<n>/`` with the raw bytes of
+       chunk ``n`` (0-based). Chunks may be sent in any order and retried.
+    3. ``GET /api/evidence/uploads/<id>/`` lists ``received_chunks`` so a
+       client can resume after reconnecting.
+    4. ``POST /api/evidence/uploads/<id>/commit/`` creates the Evidence row.
+
+    ``DELETE`` aborts the upload and removes its chunks.
+    """
+    serializer_class = EvidenceUploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return EvidenceUpload.objects.filter(created_by=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    def perform_destroy(self, instance):
+        uploads.discard(instance)
+        instance.delete()
+
+    @action(detail=True, methods=['put'], url_path=r'chunks/(?P<index>\d+)')
+    def chunk(self, request, pk=None, index=None):
+        upload = self.get_object()
+        index = int(index)
+        if upload.status != 'pending':
+            return Response({'detail': 'Upload already committed.'}, status=status.HTTP_409_CONFLICT)
+        if index >= upload.total_chunks:
+            return Response({'detail': 'Chunk index out of range.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            # Read the raw body in blocks; request.data is never touched.
+            size = uploads.write_chunk(upload, index, request.stream or io.BytesIO())
+        except uploads.ChunkSizeMismatch as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'index': index, 'size': size})
+
+    @action(detail=True, methods=['post'])
+    def commit(self, request, pk=None):
+        """
+        Assemble the chunks and create the Evidence row.
+
+        The upload row is only locked to claim it (``pending`` to
+        ``assembling``) and to record the result. Concatenating the parts
+        and writing the file to storage happen in between, outside any
+        transaction, so a large upload holds no lock while it is copied.
+        """
+        pk = self.get_object().pk
+        with transaction.atomic():
+            upload = self.get_queryset().select_for_update().get(pk=pk)
+            stale = timezone.now() - timedelta(seconds=settings.EVIDENCE_UPLOAD_ASSEMBLY_TIMEOUT)
+            if upload.status == 'committed' or (upload.status == 'assembling' and upload.updated_at > stale):
+                return Response({'detail': 'Upload already committed.'}, status=status.HTTP_409_CONFLICT)
+            missing = sorted(set(range(upload.total_chunks)) - set(uploads.received_chunks(upload)))
+            if missing:
+                return Response(
+                    {'detail': 'Upload is incomplete.', 'missing_chunks': missing},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            upload.status = 'assembling'
+            upload.save(update_fields=['status', 'updated_at'])
+        claim = {'pk': upload.pk, 'status': 'assembling', 'updated_at': upload.updated_at}
+
+        try:
+            assembled = blobs.stage(uploads.assemble(upload))
+            try:
+                with transaction.atomic():
+                    if not EvidenceUpload.objects.select_for_update().filter(**claim).exists():
+                        # Timed out and taken over by a later commit request.
+                        blobs.discard_staged(assembled)
+                        return Response({'detail': 'Upload already committed.'}, status=status.HTTP_409_CONFLICT)
+                    blob = blobs.store(assembled)
+                    evidence = Evidence.objects.create(
+                        assignment=upload.assignment,
+                        item_status=upload.item_status,
+                        description=upload.description,
+                        file=blob.name,
+                        blob=blob,
+                        original_name=upload.filename,
+                    )
+                    EvidenceUpload.objects.filter(pk=upload.pk).update(
+                        status='committed', evidence=evidence, updated_at=timezone.now(),
+                    )
+            except BaseException:
+                # The transaction rolled back, so no blob points at the file.
+                blobs.discard_staged(assembled)
+                raise
+            finally:
+                assembled.close()
+        except BaseException:
+            EvidenceUpload.objects.filter(**claim).update(status='pending', updated_at=timezone.now())
+            raise
+        uploads.discard(upload)
+        return Response(
+            EvidenceSerializer(evidence, context=self.get_serializer_context()).data,
+            status=status.HTTP_201_CREATED,
+        )
@@ -0,0 +1,95 @@
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection, connections
+
+from jobs import queue
+
+
+def work(worker_id, stop, poll_interval, stale_timeout):
+    """Claim and run jobs until ``stop`` is set; the current job always finishes."""
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            queue.requeue_stale(stale_timeout)
+            job = queue.claim(worker_id)
+            if job is None:
+                stop.wait(poll_interval)
+                continue
+            queue.run(job)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Run background job workers against the database-backed queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.JOBS_WORKER_CONCURRENCY,
+            help="Number of workers to run (default: JOBS_WORKER_CONCURRENCY).",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=["thread", "process"],
+            default="thread",
+            help="Run workers as threads (default) or as forked processes.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help="Seconds to wait when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+        poll_interval = options["poll_interval"]
+        stale_timeout = settings.JOBS_STALE_TIMEOUT
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+        if options["mode"] == "process":
+            stop = multiprocessing.Event()
+            # Forked children must not share the parent's database connection.
+            connections.close_all()
+            workers = [
+                multiprocessing.Process(
+                    target=work,
+                    args=(f"{prefix}:p{n}", stop, poll_interval, stale_timeout),
+                    daemon=True,
+                )
+                for n in range(concurrency)
+            ]
+        else:
+            stop = threading.Event()
+            workers = [
+                threading.Thread(
+                    target=work,
+                    args=(f"{prefix}:t{n}", stop, poll_interval, stale_timeout),
+                    daemon=True,
+                )
+                for n in range(concurrency)
+            ]
+
+        def shutdown(signum, frame):
+            self.stdout.write("Shutting down: waiting for running jobs to finish...")
+            stop.set()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+
+        for worker in workers:
+            worker.start()
+        self.stdout.write(
+            self.style.SUCCESS(f"Started {concurrency} {options['mode']} workers ({prefix}).")
+        )
+        for worker in workers:
+            worker.join()
+        self.stdout.write(self.style.SUCCESS("All workers stopped."))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:28
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_remove_job_job_claim_idx_job_job_queued_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
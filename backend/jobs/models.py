@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from core.models import BaseModel
+
+
+class Job(BaseModel):
+    """
+    A unit of background work stored in the database.
+
+    Workers started with ``manage.py run_workers`` claim queued jobs in
+    priority order (see ``jobs.queue``) and run the task registered under
+    ``name`` with ``args`` as keyword arguments.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+        ('cancelled', 'Cancelled'),
+    ]
+
+    name = models.CharField(max_length=100)
+    args = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    priority = models.IntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    progress = models.FloatField(default=0)
+    progress_message = models.CharField(max_length=255, blank=True, default="")
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='jobs'
+    )
+
+    class Meta:
+        indexes = [
+            # Partial indexes: only queued jobs are claimed and only running
+            # jobs are checked for stale locks, so finished jobs stay out.
+            models.Index(
+                fields=['-priority', 'run_after', 'created_at'],
+                name='job_queued_idx',
+                condition=models.Q(status='queued'),
+            ),
+            models.Index(
+                fields=['locked_at'],
+                name='job_running_locked_idx',
+                condition=models.Q(status='running'),
+            ),
+            models.Index(fields=['created_at', 'id'], name='job_created_idx'),
+        ]
+
+    def set_progress(self, progress, message=""):
+        """Record progress (0-100) from inside a running task; also refreshes the lock."""
+        self.progress = progress
+        self.progress_message = message[:255]
+        self.locked_at = timezone.now()
+        Job.objects.filter(pk=self.pk).update(
+            progress=self.progress,
+            progress_message=self.progress_message,
+            locked_at=self.locked_at,
+        )
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
@@ -0,0 +1,170 @@
+"""
+Database-backed job queue.
+
+Jobs are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` where the
+database supports it (PostgreSQL), so concurrent workers never wait on or
+double-claim the same row. On SQLite, which has no row locks, a claim is
+an optimistic ``UPDATE ... WHERE status = 'queued'`` that only one worker
+can win.
+"""
+import logging
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_task
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(name, args=None, priority=0, run_after=None, max_attempts=None, created_by=None):
+    """Queue the task registered as ``name`` and return the new ``Job``."""
+    get_task(name)  # fail fast on unknown task names
+    return Job.objects.create(
+        name=name,
+        args=args or {},
+        priority=priority,
+        run_after=run_after or timezone.now(),
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        created_by=created_by,
+    )
+
+
+def _claimable():
+    return (
+        Job.objects
+        .filter(status='queued', run_after__lte=timezone.now())
+        .order_by('-priority', 'run_after', 'created_at')
+    )
+
+
+def claim(worker_id):
+    """Atomically take the next runnable job for ``worker_id``, or return None."""
+    now = timezone.now()
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = _claimable().select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            job.status = 'running'
+            job.locked_by = worker_id
+            job.locked_at = now
+            job.attempts += 1
+            job.save(update_fields=['status', 'locked_by', 'locked_at', 'attempts', 'updated_at'])
+            return job
+
+    for candidate_id in _claimable().values_list('id', flat=True)[:10]:
+        claimed = Job.objects.filter(pk=candidate_id, status='queued').update(
+            status='running',
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+        if claimed:
+            return Job.objects.get(pk=candidate_id)
+    return None
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base * 2^(attempts - 1), capped."""
+    delay = settings.JOBS_RETRY_BASE_DELAY * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, settings.JOBS_RETRY_MAX_DELAY))
+
+
+@contextmanager
+def heartbeat(job, interval=None):
+    """
+    Refresh ``job``'s lock every ``interval`` seconds while the block runs.
+
+    The beat comes from its own thread, so a long task that never calls
+    ``set_progress`` is not mistaken for a dead worker; only a worker that
+    stops altogether lets the lock go stale.
+    """
+    interval = interval or settings.JOBS_HEARTBEAT_INTERVAL
+    done = threading.Event()
+
+    def beat():
+        try:
+            while not done.wait(interval):
+                Job.objects.filter(pk=job.pk, status='running', locked_by=job.locked_by).update(
+                    locked_at=timezone.now(),
+                )
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f'job-heartbeat-{job.pk}', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+
+
+def run(job):
+    """Execute a claimed job and record its outcome."""
+    try:
+        with heartbeat(job):
+            result = get_task(job.name)(job, **job.args)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception("Job %s (%s) failed on attempt %s", job.id, job.name, job.attempts)
+        fields = {'error': error, 'locked_by': '', 'locked_at': None, 'updated_at': timezone.now()}
+        if job.attempts < job.max_attempts:
+            fields.update(status='queued', run_after=timezone.now() + retry_delay(job.attempts))
+        else:
+            fields.update(status='failed', finished_at=timezone.now())
+        # A job cancelled while running stays cancelled.
+        Job.objects.filter(pk=job.pk, status='running').update(**fields)
+        return False
+
+    now = timezone.now()
+    Job.objects.filter(pk=job.pk, status='running').update(
+        status='succeeded',
+        result=result,
+        progress=100,
+        error='',
+        locked_by='',
+        locked_at=None,
+        finished_at=now,
+        updated_at=now,
+    )
+    return True
+
+
+def requeue_stale(timeout=None):
+    """
+    Return jobs whose worker died mid-run to the queue.
+
+    A running job is stale when its lock (refreshed by the worker's
+    ``heartbeat`` and by ``Job.set_progress``) is older than
+    ``JOBS_STALE_TIMEOUT`` seconds.
+    """
+    timeout = timeout or settings.JOBS_STALE_TIMEOUT
+    now = timezone.now()
+    stale = Job.objects.filter(status='running', locked_at__lt=now - timedelta(seconds=timeout))
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed',
+        error='Worker stopped responding.',
+        locked_by='',
+        locked_at=None,
+        finished_at=now,
+        updated_at=now,
+    )
+    return stale.update(status='queued', locked_by='', locked_at=None, updated_at=now)
+
+
+def cancel(job):
+    """Cancel a queued or running job; running tasks finish but their result is dropped."""
+    now = timezone.now()
+    return Job.objects.filter(pk=job.pk, status__in=['queued', 'running']).update(
+        status='cancelled', locked_by='', locked_at=None, finished_at=now, updated_at=now,
+    )
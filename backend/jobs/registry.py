@@ -0,0 +1,29 @@
+"""
+Registry of background tasks.
+
+Apps declare tasks in a ``tasks.py`` module, which is imported when the
+jobs app is ready::
+
+    from jobs.registry import task
+
+    @task('pg.rebuild_scorecards')
+    def rebuild_scorecards(job):
+        ...
+
+A task receives the running ``Job`` followed by the job's ``args`` as
+keyword arguments; its return value must be JSON-serializable.
+"""
+TASKS = {}
+
+
+def task(name):
+    def register(func):
+        if name in TASKS and TASKS[name] is not func:
+            raise ValueError(f"Task '{name}' is already registered.")
+        TASKS[name] = func
+        return func
+    return register
+
+
+def get_task(name):
+    return TASKS[name]
@@ -0,0 +1,77 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.utils import timezone
+
+from . import queue
+from .models import Job
+
+
+class ClaimTests(TestCase):
+    """Every queued job is claimed by exactly one worker."""
+
+    def create_jobs(self, count, **fields):
+        return [Job.objects.create(name='test', **fields) for _ in range(count)]
+
+    def test_claims_each_job_once_in_priority_order(self):
+        low = self.create_jobs(2)
+        high = self.create_jobs(1, priority=5)
+        later = self.create_jobs(1, priority=9, run_after=timezone.now() + timedelta(hours=1))
+
+        claimed = [queue.claim(f'worker-{n}') for n in range(4)]
+        self.assertEqual([job.pk for job in claimed[:3]], [high[0].pk, low[0].pk, low[1].pk])
+        self.assertIsNone(claimed[3])
+        self.assertEqual(
+            list(Job.objects.filter(status='running').order_by('locked_by').values_list('locked_by', 'attempts')),
+            [('worker-0', 1), ('worker-1', 1), ('worker-2', 1)],
+        )
+        self.assertEqual(Job.objects.get(pk=later[0].pk).status, 'queued')
+
+    @mock.patch.object(connection.features, 'has_select_for_update_skip_locked', False)
+    def test_worker_losing_a_race_takes_the_next_job(self):
+        first, second = self.create_jobs(2)
+        claimable = queue._claimable
+        rivals = []
+
+        def claimable_after_rival():
+            # Both workers read the same candidates; the rival claims first.
+            candidates = list(claimable().values_list('id', flat=True))
+            with mock.patch.object(queue, '_claimable', claimable):
+                rivals.append(queue.claim('worker-b'))
+            return Job.objects.filter(pk__in=candidates).order_by('-priority', 'run_after', 'created_at')
+
+        with mock.patch.object(queue, '_claimable', claimable_after_rival):
+            job = queue.claim('worker-a')
+        self.assertEqual(rivals[0].pk, first.pk)
+        self.assertEqual(job.pk, second.pk)
+        first.refresh_from_db()
+        self.assertEqual((first.locked_by, first.attempts), ('worker-b', 1))
+
+        with mock.patch.object(queue, '_claimable', claimable_after_rival):
+            self.assertIsNone(queue.claim('worker-a'))
+
+
+@skipUnlessDBFeature('has_select_for_update_skip_locked')
+class SkipLockedClaimTests(TransactionTestCase):
+
+    def test_locked_job_is_skipped(self):
+        first, second = [Job.objects.create(name='test') for _ in range(2)]
+        claimed = []
+
+        def claim():
+            try:
+                claimed.append(queue.claim('worker-b'))
+            finally:
+                connection.close()
+
+        with transaction.atomic():
+            # Worker A holds the first job's row lock while B claims.
+            Job.objects.select_for_update().get(pk=first.pk)
+            thread = threading.Thread(target=claim)
+            thread.start()
+            thread.join(timeout=10)
+        self.assertEqual(claimed[0].pk, second.pk)
+        self.assertEqual(queue.claim('worker-a').pk, first.pk)
@@ -0,0 +1,44 @@
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from . import queue
+from .models import Job
+from .serializers import JobSerializer
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Status and progress of background jobs.
+
+    Users see the jobs they started; staff see all jobs. Filter with
+    ``?status=`` or ``?name=``.
+    """
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(created_by=self.request.user)
+        job_status = self.request.query_params.get('status', None)
+        name = self.request.query_params.get('name', None)
+
+        if job_status:
+            queryset = queryset.filter(status=job_status)
+        if name:
+            queryset = queryset.filter(name=name)
+
+        return queryset
+
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        job = self.get_object()
+        if not queue.cancel(job):
+            return Response(
+                {'detail': f'Job is already {job.status}.'},
+                status=status.HTTP_409_CONFLICT,
+            )
+        job.refresh_from_db()
+        return Response(self.get_serializer(job).data)
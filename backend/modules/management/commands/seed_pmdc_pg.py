@@ -5,11 +5,17 @@ from pathlib import Path
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from django.utils import timezone
 
 import yaml
 
 from modules.models import Module
+from assignments.models import ItemStatus
+from core import response_cache
+from pg.models import PGItemCompliance
+from pg.scorecards import SCORING_FIELDS, schedule_rebuild
 from proformas.models import ProformaTemplate, ProformaSection, ProformaItem
+from proformas.snapshots import compile_snapshot
 
 
 class Command(BaseCommand):
@@ -21,6 +27,11 @@ class Command(BaseCommand):
             type=str,
             help="Optional path to YAML file. Defaults to <BASE_DIR>/docs/MODULE_PG_PMD2023.yaml",
         )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would change without writing to the database.",
+        )
 
     def _get_yaml_path(self, override_path: str | None) -> Path:
         if override_path:
@@ -58,6 +69,8 @@ class Command(BaseCommand):
         if not code:
             raise CommandError("Module 'code' is required in YAML.")
 
+        dry_run = options.get("dry_run", False)
+
         with transaction.atomic():
             # 1) Create / update Module
             module, created_module = Module.objects.get_or_create(
@@ -67,90 +80,209 @@ class Command(BaseCommand):
                     "description": description,
                 },
             )
-            if not created_module:
+            if not created_module and (module.display_name, module.description) != (title, description):
                 # keep name/description fresh
                 module.display_name = title
                 module.description = description
                 module.save(update_fields=["display_name", "description"])
 
             # 2) Create / update ProformaTemplate
+            template_fields = {
+                "title": title,
+                "authority_name": authority,
+                "description": description,
+                "version": version,
+                "module": module,
+                "is_active": True,
+            }
             template, created_template = ProformaTemplate.objects.get_or_create(
                 code=code,
-                defaults={
-                    "title": title,
-                    "authority_name": authority,
-                    "description": description,
-                    "version": version,
-                    "module": module,
-                    "is_active": True,
-                },
+                defaults=template_fields,
             )
             if not created_template:
                 # make sure linked to the right Module and metadata is up-to-date
-                template.title = title
-                template.authority_name = authority
-                template.description = description
-                template.version = version
-                template.module = module
-                template.is_active = True
-                template.save(
-                    update_fields=[
-                        "title",
-                        "authority_name",
-                        "description",
-                        "version",
-                        "module",
-                        "is_active",
-                    ]
+                changed = [
+                    field for field, value in template_fields.items()
+                    if getattr(template, field) != value
+                ]
+                if changed:
+                    for field in changed:
+                        setattr(template, field, template_fields[field])
+                    template.save(update_fields=changed)
+
+            # 3) Diff sections/items against the database by code
+            plan = self._sync_sections(template, sections_data)
+
+            if dry_run:
+                transaction.set_rollback(True)
+            else:
+                # 4) Compile the served snapshot (no-op if the content is unchanged)
+                compile_snapshot(template)
+                # Bulk writes send no signals: drop cached catalog responses.
+                transaction.on_commit(
+                    lambda: response_cache.invalidate(ProformaTemplate, ProformaSection, ProformaItem)
                 )
 
-            # 3) Clear old sections/items for this template (fresh import)
-            ProformaSection.objects.filter(template=template).delete()
-            # (ProformaItem should cascade delete if FK is on_delete=models.CASCADE)
-
-            total_sections = 0
-            total_items = 0
-
-            # 4) Create sections and items from YAML
-            for s_idx, section_data in enumerate(sections_data, start=1):
-                s_code = section_data.get("code") or f"S{s_idx}"
-                s_title = section_data.get("title") or s_code
-                s_desc = section_data.get("description", "")
-                s_weight = section_data.get("weight", s_idx)
-
-                section = ProformaSection.objects.create(
-                    template=template,
-                    code=s_code,
-                    title=s_title,
-                    description=s_desc,
-                    weight=s_weight,
+        self._report(code, plan, created_template, dry_run)
+
+    def _desired_sections(self, sections_data):
+        """Flatten YAML sections/items into field dicts keyed by code."""
+        sections = {}
+        items = {}
+        for s_idx, section_data in enumerate(sections_data, start=1):
+            s_code = section_data.get("code") or f"S{s_idx}"
+            if s_code in sections:
+                raise CommandError(f"Duplicate section code in YAML: {s_code}")
+            sections[s_code] = {
+                "title": section_data.get("title") or s_code,
+                "description": section_data.get("description", ""),
+                "weight": section_data.get("weight", s_idx),
+                "order": s_idx,
+            }
+
+            for i_idx, item_data in enumerate(section_data.get("items") or [], start=1):
+                i_code = item_data.get("code") or f"{s_code}.{i_idx}"
+                if i_code in items:
+                    raise CommandError(f"Duplicate item code in YAML: {i_code}")
+                items[i_code] = {
+                    "section_code": s_code,
+                    "requirement_text": item_data.get("text") or "",
+                    "required_evidence_type": item_data.get("evidence", ""),
+                    # Map YAML "weight" to importance_level (1–5 style),
+                    # and keep scoring defaults for now.
+                    "importance_level": item_data.get("weight", None),
+                    "is_licensing_critical": bool(item_data.get("critical", False)),
+                    "order": i_idx,
+                }
+        return sections, items
+
+    def _sync_sections(self, template, sections_data):
+        """
+        Bring the template's sections and items in line with the YAML.
+
+        New rows are bulk-inserted, changed rows bulk-updated (only the
+        fields that differ) and rows whose code left the YAML are deleted.
+        Unchanged rows are not touched, so compliance and item status rows
+        referencing them survive a re-seed.
+        """
+        desired_sections, desired_items = self._desired_sections(sections_data)
+        now = timezone.now()
+
+        existing_sections = {}
+        stale_sections = []
+        for section in ProformaSection.objects.filter(template=template):
+            if section.code in existing_sections:
+                stale_sections.append(section)
+            else:
+                existing_sections[section.code] = section
+
+        existing_items = {}
+        stale_items = []
+        for item in ProformaItem.objects.filter(section__template=template):
+            if item.code in existing_items:
+                stale_items.append(item)
+            else:
+                existing_items[item.code] = item
+
+        # Sections
+        new_sections, changed_sections, section_fields = self._diff(
+            existing_sections,
+            desired_sections,
+            lambda code, fields: ProformaSection(template=template, code=code, **fields),
+        )
+        stale_sections += [s for c, s in existing_sections.items() if c not in desired_sections]
+        sections_by_code = {s.code: s for s in [*existing_sections.values(), *new_sections]}
+
+        # Items (resolved against sections, so moved items get a new section_id)
+        desired_item_fields = {}
+        for i_code, fields in desired_items.items():
+            fields = dict(fields)
+            fields["section_id"] = sections_by_code[fields.pop("section_code")].id
+            desired_item_fields[i_code] = fields
+        new_items, changed_items, item_fields = self._diff(
+            existing_items,
+            desired_item_fields,
+            lambda code, fields: ProformaItem(
+                code=code,
+                implementation_criteria="",
+                max_score=10,
+                weightage_percent=100,
+                **fields,
+            ),
+        )
+        stale_items += [i for c, i in existing_items.items() if c not in desired_items]
+
+        if new_sections:
+            ProformaSection.objects.bulk_create(new_sections)
+        if changed_sections:
+            for section in changed_sections:
+                section.updated_at = now
+            ProformaSection.objects.bulk_update(changed_sections, [*section_fields, "updated_at"])
+        if new_items:
+            ProformaItem.objects.bulk_create(new_items)
+        if changed_items:
+            for item in changed_items:
+                item.updated_at = now
+            ProformaItem.objects.bulk_update(changed_items, [*item_fields, "updated_at"])
+        # Bulk updates send no signals, so rescore here if a scoring field moved;
+        # deleting stale rows below schedules the rebuild through signals.
+        if set(section_fields) & set(SCORING_FIELDS[ProformaSection]) or set(item_fields) & set(
+            SCORING_FIELDS[ProformaItem]
+        ):
+            schedule_rebuild()
+
+        plan = {
+            "sections": (len(new_sections), len(changed_sections), len(stale_sections)),
+            "items": (len(new_items), len(changed_items), len(stale_items)),
+            "dependent_rows": 0,
+        }
+        if stale_items:
+            stale_ids = [item.id for item in stale_items]
+            plan["dependent_rows"] = (
+                PGItemCompliance.objects.filter(item_id__in=stale_ids).count()
+                + ItemStatus.objects.filter(item_id__in=stale_ids).count()
+            )
+            ProformaItem.objects.filter(id__in=stale_ids).delete()
+        if stale_sections:
+            ProformaSection.objects.filter(id__in=[s.id for s in stale_sections]).delete()
+        return plan
+
+    @staticmethod
+    def _diff(existing, desired, build):
+        """Split desired rows into new instances and changed existing instances."""
+        new, changed, changed_fields = [], [], set()
+        for code, fields in desired.items():
+            obj = existing.get(code)
+            if obj is None:
+                new.append(build(code, fields))
+                continue
+            diff = [field for field, value in fields.items() if getattr(obj, field) != value]
+            if diff:
+                for field in diff:
+                    setattr(obj, field, fields[field])
+                changed.append(obj)
+                changed_fields.update(diff)
+        return new, changed, sorted(changed_fields)
+
+    def _report(self, code, plan, created_template, dry_run):
+        s_new, s_changed, s_removed = plan["sections"]
+        i_new, i_changed, i_removed = plan["items"]
+        prefix = "[dry-run] " if dry_run else ""
+
+        if not any((s_new, s_changed, s_removed, i_new, i_changed, i_removed, created_template)):
+            self.stdout.write(self.style.SUCCESS(f"{prefix}PMDC-PG module '{code}' is already up to date."))
+            return
+
+        self.stdout.write(f"{prefix}Sections: {s_new} new, {s_changed} changed, {s_removed} removed")
+        self.stdout.write(f"{prefix}Items:    {i_new} new, {i_changed} changed, {i_removed} removed")
+        if plan["dependent_rows"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{prefix}Removing items deletes {plan['dependent_rows']} compliance/status rows "
+                    f"that reference them."
                 )
-                total_sections += 1
-
-                for i_idx, item_data in enumerate(section_data.get("items") or [], start=1):
-                    i_code = item_data.get("code") or f"{s_code}.{i_idx}"
-                    i_text = item_data.get("text") or ""
-                    i_evidence = item_data.get("evidence", "")
-                    i_weight = item_data.get("weight", None)
-                    i_critical = bool(item_data.get("critical", False))
-
-                    ProformaItem.objects.create(
-                        section=section,
-                        code=i_code,
-                        requirement_text=i_text,
-                        required_evidence_type=i_evidence,
-                        # Map YAML "weight" to importance_level (1–5 style),
-                        # and keep scoring defaults for now.
-                        importance_level=i_weight,
-                        implementation_criteria="",
-                        max_score=10,
-                        weightage_percent=100,
-                        is_licensing_critical=i_critical,
-                    )
-                    total_items += 1
-
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"Seeded PMDC-PG module '{code}' with {total_sections} sections and {total_items} items."
             )
-        )
+        if dry_run:
+            self.stdout.write(self.style.NOTICE("Dry run: no changes were applied."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Synced PMDC-PG module '{code}'."))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:28
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('modules', '0002_module_module_display_name_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='module',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
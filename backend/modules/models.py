@@ -6,5 +6,10 @@ class Module(BaseModel):
     display_name = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['display_name', 'id'], name='module_display_name_idx'),
+        ]
+
     def __str__(self):
         return self.display_name
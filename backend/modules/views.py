@@ -1,9 +1,15 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from core.pagination import DisplayNameCursorPagination
+from core.response_cache import CachedResponseMixin
+from core.routing import ReplicaReadMixin
 from .models import Module
 from .serializers import ModuleSerializer
 
-class ModuleViewSet(viewsets.ReadOnlyModelViewSet):
+class ModuleViewSet(CachedResponseMixin, ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Module.objects.all().order_by('display_name')
     serializer_class = ModuleSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = DisplayNameCursorPagination
+    cache_scope = 'modules'
+    cache_models = (Module,)
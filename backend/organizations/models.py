@@ -6,6 +6,11 @@ class Institution(BaseModel):
     city = models.CharField(max_length=100, blank=True, null=True)
     type = models.CharField(max_length=100, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['name', 'id'], name='institution_name_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -15,5 +20,10 @@ class Program(BaseModel):
     discipline = models.CharField(max_length=100)
     institution = models.ForeignKey(Institution, on_delete=models.CASCADE, related_name='programs')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['name', 'id'], name='program_name_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} - {self.institution.name}"
@@ -1,12 +1,13 @@
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
 from .models import Institution, Program
 
-class InstitutionSerializer(serializers.ModelSerializer):
+class InstitutionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Institution
         fields = ['id', 'name', 'city', 'type']
 
-class ProgramSerializer(serializers.ModelSerializer):
+class ProgramSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     institution_name = serializers.CharField(source='institution.name', read_only=True)
     
     class Meta:
@@ -0,0 +1,121 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from core import scale
+from .models import Institution, Program
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class OrganizationQueryCountTests(APITestCase):
+    """Institution and program endpoints read one query however many rows they return."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', is_staff=True)
+        cls.institutions = [Institution.objects.create(name=f'Institution {n}') for n in range(3)]
+        cls.programs = [
+            Program.objects.create(name=f'Program {n}', level='Postgraduate', discipline='Medicine', institution=institution)
+            for n, institution in enumerate(cls.institutions)
+        ]
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_institution_list(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/organizations/institutions/')
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_institution_retrieve(self):
+        with self.assertNumQueries(1):
+            self.client.get(f'/api/organizations/institutions/{self.institutions[0].pk}/')
+
+    def test_program_list(self):
+        # The institution name is joined.
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/organizations/programs/')
+        self.assertEqual([row['institution_name'] for row in response.data['results']],
+                         ['Institution 0', 'Institution 1', 'Institution 2'])
+
+    def test_program_retrieve(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/organizations/programs/{self.programs[0].pk}/')
+        self.assertEqual(response.data['institution_name'], 'Institution 0')
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class CursorPaginationTests(APITestCase):
+    """Cursors page through ties in the leading ordering field without gaps or repeats."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', is_staff=True)
+        for n in range(7):
+            Institution.objects.create(name='Same' if n % 2 else f'Institution {n}')
+        cls.expected = [str(pk) for pk in Institution.objects.order_by('name', 'id').values_list('id', flat=True)]
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def walk(self, url, link):
+        seen = []
+        while url:
+            with self.assertNumQueries(1):
+                data = self.client.get(url).json()
+            seen.append([row['id'] for row in data['results']])
+            url = data[link]
+        return seen
+
+    def test_forward_and_back(self):
+        forward = self.walk('/api/organizations/institutions/?page_size=2', 'next')
+        self.assertEqual(sum(forward, []), self.expected)
+        self.assertEqual([len(page) for page in forward], [2, 2, 2, 1])
+
+        last = self.client.get('/api/organizations/institutions/?page_size=2').json()
+        while last['next']:
+            last = self.client.get(last['next']).json()
+        backward = self.walk(last['previous'], 'previous')
+        self.assertEqual(sum(reversed(backward), []), self.expected[:-1])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/organizations/institutions/?cursor=bm9wZQ').status_code, 404)
+
+
+class OrganizationResponseCacheTests(APITestCase):
+    """Writes, including bulk ones, drop the cached institution and program lists."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', is_staff=True)
+        cls.institution = Institution.objects.create(name='Institution')
+        Program.objects.create(name='Program', level='Postgraduate', discipline='Medicine', institution=cls.institution)
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client.force_authenticate(self.user)
+
+    def assertCached(self, url):
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+    def test_saving_drops_cached_lists(self):
+        self.assertCached('/api/organizations/institutions/')
+        self.assertCached('/api/organizations/programs/')
+
+        self.institution.name = 'Renamed institution'
+        self.institution.save()
+        for url in ('/api/organizations/institutions/', '/api/organizations/programs/'):
+            response = self.client.get(url)
+            self.assertEqual(response['X-Cache'], 'MISS')
+            self.assertContains(response, 'Renamed institution')
+
+    def test_generated_data_drops_cached_lists(self):
+        self.assertCached('/api/organizations/institutions/?page_size=100')
+        with self.captureOnCommitCallbacks(execute=True):
+            counts = scale.generate(institutions=2, programs=1, assignments=0)
+        response = self.client.get('/api/organizations/institutions/?page_size=100')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data['results']), 1 + counts['institutions'])
@@ -1,14 +1,31 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from core.pagination import NameCursorPagination
+from core.response_cache import CachedResponseMixin
+from core.routing import ReplicaReadMixin
+from core.serializers import field_requested
 from .models import Institution, Program
 from .serializers import InstitutionSerializer, ProgramSerializer
 
-class InstitutionViewSet(viewsets.ReadOnlyModelViewSet):
+class InstitutionViewSet(CachedResponseMixin, ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Institution.objects.all().order_by('name')
     serializer_class = InstitutionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = NameCursorPagination
+    cache_scope = 'institutions'
+    cache_models = (Institution,)
 
-class ProgramViewSet(viewsets.ReadOnlyModelViewSet):
+class ProgramViewSet(CachedResponseMixin, ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Program.objects.all().order_by('name')
     serializer_class = ProgramSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = NameCursorPagination
+    cache_scope = 'programs'
+    # institution_name comes from the institution.
+    cache_models = (Program, Institution)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if field_requested(self.request, 'institution_name'):
+            queryset = queryset.select_related('institution')
+        return queryset
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from pg import reports
+
+
+class Command(BaseCommand):
+    help = "Render printable PG compliance reports for institutions whose compliance changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--institution",
+            action="append",
+            dest="institutions",
+            help="Only consider this institution id (may be repeated).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate reports even when their inputs are unchanged.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of rendering processes (default: PG_REPORT_WORKERS).",
+        )
+
+    def handle(self, *args, **options):
+        def progress(percent, message):
+            self.stdout.write(f"[{percent:5.1f}%] {message}")
+
+        summary = reports.generate(
+            institution_ids=options["institutions"],
+            force=options["force"],
+            workers=options["workers"],
+            progress=progress,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {summary['generated']} reports; "
+                f"{summary['skipped']} were already up to date."
+            )
+        )
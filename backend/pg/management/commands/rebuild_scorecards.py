@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from pg.models import ComplianceScorecard
+from pg.scorecards import SCORE_FIELDS, compute_scorecards
+
+
+class Command(BaseCommand):
+    help = "Rebuild compliance scorecards from PGItemCompliance and report any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only compare stored scorecards against a fresh computation; exit non-zero on drift.",
+        )
+        parser.add_argument(
+            "--if-empty",
+            action="store_true",
+            help="Do nothing if any scorecard rows exist, e.g. on every deployment.",
+        )
+
+    def handle(self, *args, **options):
+        if options["if_empty"] and ComplianceScorecard.objects.exists():
+            self.stdout.write("Scorecards already exist; nothing to do.")
+            return
+        with transaction.atomic():
+            expected = compute_scorecards()
+            stored = {
+                (card.institution_id, card.template_id, card.section_id): card
+                for card in ComplianceScorecard.objects.select_for_update()
+            }
+
+            mismatched = []
+            for key in expected.keys() | stored.keys():
+                totals = expected.get(key)
+                card = stored.get(key)
+                if totals is None:
+                    if any(getattr(card, field) for field in SCORE_FIELDS):
+                        mismatched.append(key)
+                elif card is None:
+                    if any(totals.values()):
+                        mismatched.append(key)
+                elif any(getattr(card, field) != totals[field] for field in SCORE_FIELDS):
+                    mismatched.append(key)
+
+            for institution_id, template_id, section_id in mismatched:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Drift: institution={institution_id} template={template_id} section={section_id}"
+                    )
+                )
+
+            if options["check"]:
+                if mismatched:
+                    raise CommandError(f"{len(mismatched)} scorecard rows do not match.")
+                self.stdout.write(self.style.SUCCESS(f"All {len(expected)} scorecard rows match."))
+                return
+
+            ComplianceScorecard.objects.all().delete()
+            ComplianceScorecard.objects.bulk_create(
+                ComplianceScorecard(
+                    institution_id=institution_id,
+                    template_id=template_id,
+                    section_id=section_id,
+                    **totals,
+                )
+                for (institution_id, template_id, section_id), totals in expected.items()
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {len(expected)} scorecard rows ({len(mismatched)} differed from stored values)."
+            )
+        )
@@ -0,0 +1,110 @@
+"""
+Institutions x items compliance grid for one template.
+
+The grid is a row-major ``bytearray`` holding one status code per cell
+(see ``STATUS_CODES``), filled from a single query. Row and column
+aggregates are taken with ``bytes.count`` over row slices and strided
+column slices, which run in C rather than per cell in Python.
+
+``encode`` serializes the grid either as base64 of the raw bytes or as a
+run-length list ``[code, run, code, run, ...]``, which is smaller when
+most cells share a status (typically "not assessed").
+"""
+import base64
+import re
+
+from organizations.models import Institution
+from proformas.models import ProformaItem
+from .models import PGItemCompliance
+from .scorecards import STATUS_CREDIT
+
+# Code 0 marks an item the institution has no compliance row for.
+STATUSES = (None, 'YES', 'PARTIAL', 'NO', 'NA')
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+ENCODINGS = ('base64', 'rle')
+RUN_PATTERN = re.compile(rb'(.)\1*', re.DOTALL)
+
+
+class ComplianceMatrix:
+    def __init__(self, institutions, items, grid):
+        self.institutions = institutions
+        self.items = items
+        self.grid = grid
+
+    @property
+    def shape(self):
+        return (len(self.institutions), len(self.items))
+
+    def row(self, index):
+        width = len(self.items)
+        return self.grid[index * width:(index + 1) * width]
+
+    def column(self, index):
+        return self.grid[index::len(self.items)]
+
+    @staticmethod
+    def counts(cells):
+        return [cells.count(code) for code in range(len(STATUSES))]
+
+    @staticmethod
+    def pass_rate(counts):
+        """Share of scored cells earned (PARTIAL counts half); None when nothing is scored."""
+        scored = sum(counts[STATUS_CODES[status]] for status in STATUS_CREDIT)
+        if not scored:
+            return None
+        earned = sum(counts[STATUS_CODES[status]] * credit for status, credit in STATUS_CREDIT.items())
+        return round(earned / scored, 4)
+
+    def aggregates(self):
+        institution_counts = [self.counts(self.row(i)) for i in range(len(self.institutions))]
+        item_counts = [self.counts(self.column(j)) for j in range(len(self.items))]
+        return {
+            'institution_counts': institution_counts,
+            'institution_pass_rate': [self.pass_rate(counts) for counts in institution_counts],
+            'item_counts': item_counts,
+            'item_pass_rate': [self.pass_rate(counts) for counts in item_counts],
+        }
+
+    def encode(self, encoding='base64'):
+        if encoding == 'rle':
+            return run_lengths(self.grid)
+        return base64.b64encode(bytes(self.grid)).decode('ascii')
+
+
+def run_lengths(grid):
+    runs = []
+    for match in RUN_PATTERN.finditer(grid):
+        runs += [grid[match.start()], match.end() - match.start()]
+    return runs
+
+
+def build_matrix(template_id, institution_ids=None):
+    """Build the grid for ``template_id``; rows default to every institution."""
+    items = list(
+        ProformaItem.objects
+        .filter(section__template_id=template_id)
+        .order_by('section__order', 'order', 'code')
+        .values('id', 'code', 'section__code')
+    )
+    institutions = Institution.objects.order_by('name', 'id')
+    if institution_ids:
+        institutions = institutions.filter(id__in=institution_ids)
+    institutions = list(institutions.values('id', 'name'))
+
+    columns = {item['id']: index for index, item in enumerate(items)}
+    rows = {institution['id']: index for index, institution in enumerate(institutions)}
+    width = len(items)
+    grid = bytearray(len(institutions) * width)
+
+    compliance = PGItemCompliance.objects.filter(
+        item__section__template_id=template_id,
+        institution__isnull=False,
+    )
+    if institution_ids:
+        compliance = compliance.filter(institution_id__in=institution_ids)
+    for institution_id, item_id, status in compliance.values_list(
+        'institution_id', 'item_id', 'status'
+    ).iterator(chunk_size=5000):
+        grid[rows[institution_id] * width + columns[item_id]] = STATUS_CODES[status]
+
+    return ComplianceMatrix(institutions, items, grid)
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:07
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0001_initial'),
+        ('pg', '0001_initial'),
+        ('proformas', '0002_proformaitem_code_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComplianceScorecard',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('yes_count', models.IntegerField(default=0)),
+                ('no_count', models.IntegerField(default=0)),
+                ('partial_count', models.IntegerField(default=0)),
+                ('na_count', models.IntegerField(default=0)),
+                ('earned_score', models.FloatField(default=0)),
+                ('possible_score', models.FloatField(default=0)),
+                ('critical_failures', models.IntegerField(default=0)),
+                ('institution', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scorecards', to='organizations.institution')),
+                ('section', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='scorecards', to='proformas.proformasection')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scorecards', to='proformas.proformatemplate')),
+            ],
+            options={
+                'verbose_name': 'Compliance Scorecard',
+                'verbose_name_plural': 'Compliance Scorecards',
+                'indexes': [models.Index(fields=['institution', 'template'], name='pg_scorecard_inst_tpl_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('section__isnull', False)), fields=('institution', 'section'), name='pg_scorecard_unique_section'), models.UniqueConstraint(condition=models.Q(('section__isnull', True)), fields=('institution', 'template'), name='pg_scorecard_unique_template')],
+            },
+        ),
+    ]
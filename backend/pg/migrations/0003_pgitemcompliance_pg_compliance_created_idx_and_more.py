@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0002_institution_institution_name_idx_and_more'),
+        ('pg', '0002_compliancescorecard'),
+        ('proformas', '0003_proformatemplatesnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pgitemcompliance',
+            index=models.Index(fields=['created_at', 'id'], name='pg_compliance_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pgitemcompliance',
+            index=models.Index(fields=['institution', 'created_at', 'id'], name='pg_compliance_inst_created_idx'),
+        ),
+    ]
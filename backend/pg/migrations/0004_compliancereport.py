@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:20
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0002_institution_institution_name_idx_and_more'),
+        ('pg', '0003_pgitemcompliance_pg_compliance_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComplianceReport',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('file', models.FileField(max_length=255, upload_to='reports/pg/')),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('item_count', models.PositiveIntegerField(default=0)),
+                ('institution', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='pg_report', to='organizations.institution')),
+            ],
+            options={
+                'verbose_name': 'Compliance Report',
+                'verbose_name_plural': 'Compliance Reports',
+            },
+        ),
+    ]
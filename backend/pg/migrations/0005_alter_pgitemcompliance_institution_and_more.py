@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0002_institution_institution_name_idx_and_more'),
+        ('pg', '0004_compliancereport'),
+        ('proformas', '0004_alter_proformaitem_section_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pgitemcompliance',
+            name='institution',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pg_item_compliances', to='organizations.institution'),
+        ),
+        migrations.AddIndex(
+            model_name='pgitemcompliance',
+            index=models.Index(fields=['institution', 'status', 'created_at', 'id'], name='pg_compliance_inst_status_idx'),
+        ),
+    ]
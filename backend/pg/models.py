@@ -1,7 +1,7 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from core.models import BaseModel
-from proformas.models import ProformaItem
+from proformas.models import ProformaTemplate, ProformaSection, ProformaItem
 from organizations.models import Institution
 
 
@@ -21,7 +21,9 @@ class PGItemCompliance(BaseModel):
         on_delete=models.CASCADE,
         related_name='pg_item_compliances',
         null=True,
-        blank=True
+        blank=True,
+        # Indexed by the (institution, item) unique constraint.
+        db_index=False
     )
     item = models.ForeignKey(
         ProformaItem,
@@ -47,8 +49,136 @@ class PGItemCompliance(BaseModel):
         verbose_name_plural = "PG Item Compliances"
         # Ensure only one compliance record per institution-item pair
         unique_together = ['institution', 'item']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='pg_compliance_created_idx'),
+            models.Index(fields=['institution', 'created_at', 'id'], name='pg_compliance_inst_created_idx'),
+            models.Index(
+                fields=['institution', 'status', 'created_at', 'id'],
+                name='pg_compliance_inst_status_idx',
+            ),
+        ]
     
+    def save(self, *args, **kwargs):
+        """
+        Save and apply the scorecard deltas for the change in one transaction.
+
+        The stored state is re-read under a row lock, so concurrent updates
+        of the same row each apply their own delta exactly once. Deletes are
+        handled by the ``post_delete`` receiver in ``pg.signals``; bulk writes
+        call ``update_scorecards`` themselves.
+        """
+        from .scorecards import update_scorecards
+
+        with transaction.atomic(using=kwargs.get('using')):
+            previous = None
+            if not self._state.adding and self.pk is not None:
+                previous = (
+                    PGItemCompliance.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list('institution_id', 'item_id', 'status')
+                    .first()
+                )
+            super().save(*args, **kwargs)
+            current = (self.institution_id, self.item_id, self.status)
+            if previous == current:
+                return
+            removed = []
+            if previous is not None:
+                institution_id, item_id, status = previous
+                item = self.item if item_id == self.item_id else ProformaItem.objects.get(pk=item_id)
+                removed.append((institution_id, item, status))
+            update_scorecards(removed=removed, added=[(self.institution_id, self.item, self.status)])
+
     def __str__(self):
         inst_name = getattr(self.institution, 'name', 'No Institution') if self.institution else "No Institution"
         item_code = self.item.code or str(self.item.id)
         return f"{inst_name} - {item_code} - {self.status}"
+
+
+class ComplianceScorecard(BaseModel):
+    """
+    Materialized compliance summary for one institution.
+
+    Rows with a ``section`` hold the totals for that section; the row with
+    ``section`` unset holds the section-weighted totals for the whole
+    template. Rows are maintained incrementally by ``pg.scorecards``.
+    """
+    institution = models.ForeignKey(
+        Institution,
+        on_delete=models.CASCADE,
+        related_name='scorecards'
+    )
+    template = models.ForeignKey(
+        ProformaTemplate,
+        on_delete=models.CASCADE,
+        related_name='scorecards'
+    )
+    section = models.ForeignKey(
+        ProformaSection,
+        on_delete=models.CASCADE,
+        related_name='scorecards',
+        null=True,
+        blank=True
+    )
+    yes_count = models.IntegerField(default=0)
+    no_count = models.IntegerField(default=0)
+    partial_count = models.IntegerField(default=0)
+    na_count = models.IntegerField(default=0)
+    earned_score = models.FloatField(default=0)
+    possible_score = models.FloatField(default=0)
+    critical_failures = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Compliance Scorecard"
+        verbose_name_plural = "Compliance Scorecards"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['institution', 'section'],
+                condition=models.Q(section__isnull=False),
+                name='pg_scorecard_unique_section',
+            ),
+            models.UniqueConstraint(
+                fields=['institution', 'template'],
+                condition=models.Q(section__isnull=True),
+                name='pg_scorecard_unique_template',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['institution', 'template'], name='pg_scorecard_inst_tpl_idx'),
+        ]
+
+    @property
+    def score_percent(self):
+        if not self.possible_score:
+            return None
+        return round(100 * self.earned_score / self.possible_score, 2)
+
+    def __str__(self):
+        scope = self.section.code if self.section_id else self.template.code
+        return f"{self.institution.name} - {scope} - {self.score_percent}"
+
+
+class ComplianceReport(BaseModel):
+    """
+    The printable PG compliance report last generated for an institution.
+
+    ``fingerprint`` identifies the compliance data and checklist the file
+    was rendered from; ``generate_reports`` skips institutions whose
+    fingerprint has not changed.
+    """
+    institution = models.OneToOneField(
+        Institution,
+        on_delete=models.CASCADE,
+        related_name='pg_report'
+    )
+    file = models.FileField(upload_to='reports/pg/', max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    size = models.PositiveBigIntegerField(default=0)
+    item_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Compliance Report"
+        verbose_name_plural = "Compliance Reports"
+
+    def __str__(self):
+        return f"{self.institution.name} - {self.file.name}"
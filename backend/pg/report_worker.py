@@ -0,0 +1,104 @@
+"""
+Report rendering that runs inside ``generate_reports`` pool processes.
+
+This module must stay importable before Django is set up (pool processes
+are spawned fresh), so it imports no models; everything it needs arrives
+as plain data. ``init_worker`` receives the checklist catalogue once per
+process and ``render_report`` renders and writes one institution's report.
+"""
+import os
+import tempfile
+
+import django
+from django.apps import apps
+from django.conf import settings
+
+_catalogue = None
+
+
+def init_worker(catalogue):
+    global _catalogue
+    if not apps.ready:
+        django.setup()
+    _catalogue = catalogue
+
+
+def write_atomic(path, content):
+    """Write ``content`` to ``path`` via a temporary file renamed into place."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(content)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(temp_path, settings.FILE_UPLOAD_PERMISSIONS or 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _report_templates(compliance):
+    labels = _catalogue['status_labels']
+    by_item = {row['item_id']: row for row in compliance}
+    templates = []
+    for template in _catalogue['templates']:
+        if not any(item['id'] in by_item for section in template['sections'] for item in section['items']):
+            continue
+        counts = dict.fromkeys(labels, 0)
+        unassessed = 0
+        critical_failures = 0
+        sections = []
+        for section in template['sections']:
+            rows = []
+            for item in section['items']:
+                row = by_item.get(item['id'])
+                status = row['status'] if row else None
+                if status is None:
+                    unassessed += 1
+                else:
+                    counts[status] += 1
+                    critical_failures += int(item['is_licensing_critical'] and status == 'NO')
+                rows.append({
+                    'item': item,
+                    'status': status,
+                    'status_label': labels.get(status, 'Not assessed'),
+                    'comment': row['comment'] if row else '',
+                    'evidence_url': row['evidence_url'] if row else '',
+                    'updated_at': row['updated_at'] if row else None,
+                })
+            sections.append({'section': section, 'rows': rows})
+        templates.append({
+            'template': template,
+            'sections': sections,
+            'counts': [(labels[status], count) for status, count in counts.items()],
+            'unassessed': unassessed,
+            'critical_failures': critical_failures,
+        })
+    return templates
+
+
+def render_report(institution, compliance, path, generated_at):
+    """
+    Render ``institution``'s report from its ``compliance`` rows and write
+    it to ``path``. Returns the institution id, file size and item count.
+    """
+    from django.template.loader import render_to_string
+
+    html = render_to_string('pg/report.html', {
+        'institution': institution,
+        'generated_at': generated_at,
+        'templates': _report_templates(compliance),
+    })
+    content = html.encode('utf-8')
+    write_atomic(path, content)
+    return {
+        'institution_id': institution['id'],
+        'size': len(content),
+        'item_count': len(compliance),
+    }
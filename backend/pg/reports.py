@@ -0,0 +1,222 @@
+"""
+Batch generation of printable PG compliance reports.
+
+``generate`` renders one HTML report per institution (laid out for
+printing to PDF from the browser) across a process pool. The checklist
+catalogue -- every template, section and item institutions are assessed
+against -- is loaded once and handed to each pool process when it starts;
+per institution only its compliance rows are sent. Reports are written
+atomically by ``pg.report_worker``.
+
+Each ``ComplianceReport`` stores a fingerprint of the inputs it was
+rendered from (the institution's compliance rows, the institution itself
+and the catalogue), so a run only renders institutions whose fingerprint
+changed unless ``force`` is given.
+"""
+import hashlib
+import json
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from organizations.models import Institution
+from proformas.models import ProformaItem
+from . import report_worker
+from .models import ComplianceReport, PGItemCompliance
+
+REPORT_DIR = 'reports/pg'
+# Bump when the report layout changes to regenerate every report.
+REPORT_VERSION = 1
+# Institutions whose compliance rows are loaded per query.
+BATCH_SIZE = 200
+
+
+def load_catalogue():
+    """Load every template that has compliance rows, with its sections and items."""
+    template_ids = (
+        PGItemCompliance.objects
+        .values_list('item__section__template_id', flat=True)
+        .distinct()
+    )
+    items = (
+        ProformaItem.objects
+        .filter(section__template_id__in=template_ids)
+        .order_by('section__template__title', 'section__order', 'order', 'code')
+        .values(
+            'id', 'code', 'text', 'requirement_text', 'is_licensing_critical',
+            'section_id', 'section__code', 'section__title',
+            'section__template_id', 'section__template__code',
+            'section__template__title', 'section__template__version',
+        )
+    )
+
+    templates = {}
+    for item in items:
+        template = templates.setdefault(item['section__template_id'], {
+            'id': str(item['section__template_id']),
+            'code': item['section__template__code'],
+            'title': item['section__template__title'],
+            'version': item['section__template__version'],
+            'sections': {},
+        })
+        section = template['sections'].setdefault(item['section_id'], {
+            'id': str(item['section_id']),
+            'code': item['section__code'],
+            'title': item['section__title'],
+            'items': [],
+        })
+        section['items'].append({
+            'id': str(item['id']),
+            'code': item['code'],
+            'text': item['text'],
+            'requirement_text': item['requirement_text'],
+            'is_licensing_critical': item['is_licensing_critical'],
+        })
+
+    for template in templates.values():
+        template['sections'] = list(template['sections'].values())
+    return {
+        'templates': list(templates.values()),
+        'status_labels': dict(PGItemCompliance.STATUS_CHOICES),
+    }
+
+
+def fingerprints(catalogue, institution_ids=None):
+    """Map each institution with compliance rows to the fingerprint of its report inputs."""
+    catalogue_hash = hashlib.sha256(
+        json.dumps(catalogue, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+    rows = PGItemCompliance.objects.filter(institution__isnull=False)
+    if institution_ids is not None:
+        rows = rows.filter(institution_id__in=institution_ids)
+    rows = (
+        rows.values('institution_id')
+        .annotate(
+            rows=Count('id'),
+            last_updated=Max('updated_at'),
+            institution_updated=Max('institution__updated_at'),
+        )
+        .order_by()
+    )
+    return {
+        row['institution_id']: hashlib.sha256(
+            f"{REPORT_VERSION}:{catalogue_hash}:{row['rows']}:"
+            f"{row['last_updated'].isoformat()}:{row['institution_updated'].isoformat()}".encode('utf-8')
+        ).hexdigest()
+        for row in rows
+    }
+
+
+def report_name(institution_id):
+    return f'{REPORT_DIR}/{institution_id}.html'
+
+
+def _report_inputs(institution_ids, generated_at):
+    """Yield ``render_report`` arguments, loading compliance rows in batches."""
+    storage = ComplianceReport._meta.get_field('file').storage
+    for start in range(0, len(institution_ids), BATCH_SIZE):
+        batch = institution_ids[start:start + BATCH_SIZE]
+        institutions = {
+            row['id']: {**row, 'id': str(row['id'])}
+            for row in Institution.objects.filter(id__in=batch).values('id', 'name', 'city', 'type')
+        }
+        compliance = {institution_id: [] for institution_id in batch}
+        rows = (
+            PGItemCompliance.objects
+            .filter(institution_id__in=batch)
+            .values('institution_id', 'item_id', 'status', 'comment', 'evidence_url', 'updated_at')
+        )
+        for row in rows:
+            institution_id = row.pop('institution_id')
+            row['item_id'] = str(row['item_id'])
+            compliance[institution_id].append(row)
+
+        for institution_id in batch:
+            if institution_id not in institutions:
+                continue
+            yield (
+                institutions[institution_id],
+                compliance[institution_id],
+                storage.path(report_name(institution_id)),
+                generated_at,
+            )
+
+
+def _render_all(catalogue, inputs, workers):
+    """Render reports for ``inputs``, yielding results as they complete."""
+    # Daemonic processes (run_workers --mode process) cannot start a pool.
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        report_worker.init_worker(catalogue)
+        for args in inputs:
+            yield report_worker.render_report(*args)
+        return
+
+    # Spawned rather than forked so pool processes never inherit the
+    # parent's open database connection.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=report_worker.init_worker,
+        initargs=(catalogue,),
+    ) as pool:
+        pending = set()
+        for args in inputs:
+            pending.add(pool.submit(report_worker.render_report, *args))
+            # Keep a bounded number of reports in flight.
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in wait(pending).done:
+            yield future.result()
+
+
+def generate(institution_ids=None, force=False, workers=None, progress=None):
+    """
+    Render reports for ``institution_ids`` (default: every institution with
+    compliance rows) whose inputs changed since their last report.
+
+    ``progress`` is called with ``(percent, message)`` after each report.
+    Returns counts of generated and skipped reports.
+    """
+    workers = workers or settings.PG_REPORT_WORKERS
+    catalogue = load_catalogue()
+    current = fingerprints(catalogue, institution_ids)
+    existing = dict(
+        ComplianceReport.objects
+        .filter(institution_id__in=list(current))
+        .values_list('institution_id', 'fingerprint')
+    )
+    stale = [
+        institution_id
+        for institution_id, fingerprint in current.items()
+        if force or existing.get(institution_id) != fingerprint
+    ]
+    summary = {'generated': 0, 'skipped': len(current) - len(stale)}
+    if not stale:
+        return summary
+
+    stale_ids = {str(institution_id): institution_id for institution_id in stale}
+    generated_at = timezone.now()
+    results = _render_all(catalogue, _report_inputs(stale, generated_at), workers)
+    for result in results:
+        institution_id = stale_ids[result['institution_id']]
+        ComplianceReport.objects.update_or_create(
+            institution_id=institution_id,
+            defaults={
+                'file': report_name(institution_id),
+                'fingerprint': current[institution_id],
+                'size': result['size'],
+                'item_count': result['item_count'],
+            },
+        )
+        summary['generated'] += 1
+        if progress:
+            progress(
+                100 * summary['generated'] / len(stale),
+                f"Generated {summary['generated']} of {len(stale)} reports",
+            )
+    return summary
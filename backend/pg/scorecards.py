@@ -0,0 +1,191 @@
+"""
+Incremental maintenance of ``ComplianceScorecard`` rows.
+
+Every compliance write is turned into a set of additive deltas (status
+counts, earned/possible score, critical failures) for the section row and
+the template row it belongs to, which are then applied with ``F()``
+updates. Nothing is recomputed from the compliance table on the write path;
+``compute_scorecards`` does that for the ``rebuild_scorecards`` command.
+
+Saving a ``PGItemCompliance`` applies its deltas (see its ``save``), as do
+the bulk upsert endpoint and the ``post_delete`` receiver in ``pg.signals``.
+Changes to scoring fields of sections and items cannot be expressed as
+cheap deltas, so they schedule a full rebuild job instead.
+
+Scoring: an item is worth ``weight * max_score`` points. YES earns all of
+them, PARTIAL half, NO none, and NA removes the item from the possible
+total. Template totals weight each section's points by ``section.weight``.
+A critical failure is a licensing-critical item marked NO.
+"""
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from jobs.models import Job
+from jobs.queue import enqueue
+from proformas.models import ProformaItem, ProformaSection
+from .models import ComplianceScorecard, PGItemCompliance
+
+
+STATUS_COUNT_FIELDS = {
+    'YES': 'yes_count',
+    'NO': 'no_count',
+    'PARTIAL': 'partial_count',
+    'NA': 'na_count',
+}
+STATUS_CREDIT = {'YES': 1.0, 'PARTIAL': 0.5, 'NO': 0.0}
+SCORE_FIELDS = (
+    *STATUS_COUNT_FIELDS.values(),
+    'earned_score',
+    'possible_score',
+    'critical_failures',
+)
+# Catalog fields that feed into scores; changing one requires a rebuild.
+SCORING_FIELDS = {
+    ProformaSection: ('template_id', 'weight'),
+    ProformaItem: ('section_id', 'weight', 'max_score', 'is_licensing_critical'),
+}
+REBUILD_TASK = 'pg.rebuild_scorecards'
+
+
+def _add_contribution(totals, institution_id, item, status, section, sign):
+    """Add ``sign`` times one item's contribution to the section and template rows."""
+    points = item['weight'] * item['max_score']
+    credit = STATUS_CREDIT.get(status)
+    critical = int(item['is_licensing_critical'] and status == 'NO')
+    section_key = (institution_id, section['template_id'], item['section_id'])
+    template_key = (institution_id, section['template_id'], None)
+
+    for key, multiplier in ((section_key, 1), (template_key, section['weight'])):
+        row = totals[key]
+        row[STATUS_COUNT_FIELDS[status]] += sign
+        row['critical_failures'] += sign * critical
+        if credit is not None:
+            row['possible_score'] += sign * points * multiplier
+            row['earned_score'] += sign * points * credit * multiplier
+
+
+def _item_values(item):
+    return {
+        'section_id': item.section_id,
+        'weight': item.weight,
+        'max_score': item.max_score,
+        'is_licensing_critical': item.is_licensing_critical,
+    }
+
+
+def update_scorecards(removed=(), added=()):
+    """
+    Apply the scorecard deltas for a batch of compliance writes.
+
+    ``removed`` and ``added`` are iterables of ``(institution_id, item, status)``
+    describing compliance state before and after the write; a new row only
+    appears in ``added``, a deleted row only in ``removed``. Rows without an
+    institution are not scored. Must run inside the writing transaction.
+    """
+    entries = [
+        (entry, sign)
+        for sign, batch in ((-1, removed), (1, added))
+        for entry in batch
+        if entry[0] is not None
+    ]
+    if not entries:
+        return
+
+    section_ids = {item.section_id for (_, item, _), _ in entries}
+    sections = {
+        row['id']: row
+        for row in ProformaSection.objects.filter(id__in=section_ids).values(
+            'id', 'template_id', 'weight'
+        )
+    }
+
+    totals = defaultdict(lambda: dict.fromkeys(SCORE_FIELDS, 0))
+    for (institution_id, item, status), sign in entries:
+        _add_contribution(
+            totals, institution_id, _item_values(item), status, sections[item.section_id], sign
+        )
+
+    # Rows are locked in (institution, template, section) order, template
+    # row first, so concurrent writers cannot deadlock on each other's rows.
+    for (institution_id, template_id, section_id), deltas in sorted(totals.items(), key=_lock_order):
+        deltas = {field: value for field, value in deltas.items() if value}
+        if not deltas:
+            continue
+        _apply_deltas(institution_id, template_id, section_id, deltas)
+
+
+def _lock_order(entry):
+    institution_id, template_id, section_id = entry[0]
+    return institution_id, template_id, section_id is not None, section_id
+
+
+def _apply_deltas(institution_id, template_id, section_id, deltas):
+    lookup = {'institution_id': institution_id, 'template_id': template_id}
+    if section_id is None:
+        lookup['section__isnull'] = True
+    else:
+        lookup['section_id'] = section_id
+    updates = {field: F(field) + value for field, value in deltas.items()}
+
+    if ComplianceScorecard.objects.filter(**lookup).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            ComplianceScorecard.objects.create(
+                institution_id=institution_id,
+                template_id=template_id,
+                section_id=section_id,
+                **deltas,
+            )
+    except IntegrityError:
+        # A concurrent writer created the row first.
+        ComplianceScorecard.objects.filter(**lookup).update(**updates)
+
+
+def schedule_rebuild():
+    """
+    Queue a full scorecard rebuild once the current transaction commits.
+
+    Nothing is queued if a rebuild is already waiting to run, so a burst of
+    catalog edits costs a single rebuild.
+    """
+    def enqueue_once():
+        if not Job.objects.filter(name=REBUILD_TASK, status='queued').exists():
+            enqueue(REBUILD_TASK)
+
+    transaction.on_commit(enqueue_once)
+
+
+def compute_scorecards():
+    """
+    Compute every scorecard row from scratch.
+
+    Returns a dict keyed by ``(institution_id, template_id, section_id)``
+    (``section_id`` is None for template rows) mapping to field totals.
+    """
+    totals = defaultdict(lambda: dict.fromkeys(SCORE_FIELDS, 0))
+    rows = PGItemCompliance.objects.filter(institution__isnull=False).values(
+        'institution_id',
+        'status',
+        'item__section_id',
+        'item__weight',
+        'item__max_score',
+        'item__is_licensing_critical',
+        'item__section__template_id',
+        'item__section__weight',
+    )
+    for row in rows.iterator(chunk_size=2000):
+        item = {
+            'section_id': row['item__section_id'],
+            'weight': row['item__weight'],
+            'max_score': row['item__max_score'],
+            'is_licensing_critical': row['item__is_licensing_critical'],
+        }
+        section = {
+            'template_id': row['item__section__template_id'],
+            'weight': row['item__section__weight'],
+        }
+        _add_contribution(totals, row['institution_id'], item, row['status'], section, 1)
+    return totals
@@ -1,9 +1,10 @@
 from rest_framework import serializers
-from .models import PGItemCompliance
+from .models import ComplianceReport, ComplianceScorecard, PGItemCompliance
+from core.serializers import DynamicFieldsMixin
 from proformas.serializers import ProformaItemSerializer
 
 
-class PGItemComplianceSerializer(serializers.ModelSerializer):
+class PGItemComplianceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     item_details = ProformaItemSerializer(source='item', read_only=True)
     
     class Meta:
@@ -13,3 +14,51 @@ class PGItemComplianceSerializer(serializers.ModelSerializer):
             'comment', 'evidence_url', 'updated_by', 'updated_at'
         ]
         read_only_fields = ['updated_at']
+        expandable_fields = ['item_details']
+
+
+class PGItemComplianceBulkRowSerializer(serializers.Serializer):
+    """
+    One (institution, item) change in a bulk upsert request.
+
+    Only the fields present in the row are written; foreign keys are
+    validated in bulk by the view rather than per row.
+    """
+    institution = serializers.UUIDField(allow_null=True, required=False, default=None)
+    item = serializers.UUIDField()
+    status = serializers.ChoiceField(choices=PGItemCompliance.STATUS_CHOICES, required=False)
+    comment = serializers.CharField(allow_blank=True, required=False)
+    evidence_url = serializers.URLField(allow_blank=True, required=False)
+
+
+class ComplianceScorecardSerializer(serializers.ModelSerializer):
+    section_code = serializers.CharField(source='section.code', read_only=True, default=None)
+    score_percent = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = ComplianceScorecard
+        fields = [
+            'id', 'institution', 'template', 'section', 'section_code',
+            'yes_count', 'no_count', 'partial_count', 'na_count',
+            'earned_score', 'possible_score', 'score_percent',
+            'critical_failures', 'updated_at'
+        ]
+
+
+class ComplianceReportSerializer(serializers.ModelSerializer):
+    institution_name = serializers.CharField(source='institution.name', read_only=True)
+    download_url = serializers.HyperlinkedIdentityField(view_name='pg-report-download', read_only=True)
+
+    class Meta:
+        model = ComplianceReport
+        fields = [
+            'id', 'institution', 'institution_name', 'fingerprint', 'size',
+            'item_count', 'download_url', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class ComplianceReportGenerateSerializer(serializers.Serializer):
+    """Options for a queued ``pg.generate_reports`` job."""
+    institutions = serializers.ListField(child=serializers.UUIDField(), required=False, allow_null=True, default=None)
+    force = serializers.BooleanField(required=False, default=False)
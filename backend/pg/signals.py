@@ -0,0 +1,48 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import Signal, receiver
+
+from proformas.models import ProformaItem, ProformaSection
+from .models import PGItemCompliance
+from .scorecards import SCORING_FIELDS, schedule_rebuild, update_scorecards
+
+# Sent by the bulk upsert endpoint, which bypasses per-row model signals.
+# ``removed`` and ``added`` are lists of (institution_id, item, status)
+# describing the affected rows before and after the write.
+compliance_bulk_upserted = Signal()
+
+
+@receiver(post_delete, sender=PGItemCompliance, dispatch_uid='pg-compliance-delete')
+def _on_compliance_delete(sender, instance, origin=None, **kwargs):
+    # Only direct deletes are applied as deltas. Cascades from the catalog
+    # schedule a rebuild through the receivers below, and an institution's
+    # scorecards are cascade-deleted along with its compliance rows.
+    if isinstance(origin, PGItemCompliance) or getattr(origin, 'model', None) is PGItemCompliance:
+        update_scorecards(removed=[(instance.institution_id, instance.item, instance.status)])
+
+
+def _scoring_state(model, instance):
+    # Read from __dict__ so deferred fields are never loaded just for comparing.
+    return tuple(instance.__dict__.get(field) for field in SCORING_FIELDS[model])
+
+
+def _capture(sender, instance, **kwargs):
+    instance._scoring_state = _scoring_state(sender, instance)
+
+
+def _on_catalog_save(sender, instance, created, **kwargs):
+    state = _scoring_state(sender, instance)
+    previous = getattr(instance, '_scoring_state', None)
+    if not created and previous is not None and state != previous:
+        schedule_rebuild()
+    instance._scoring_state = state
+
+
+def _on_catalog_delete(sender, instance, **kwargs):
+    schedule_rebuild()
+
+
+for model in (ProformaSection, ProformaItem):
+    uid = model.__name__
+    post_init.connect(_capture, sender=model, dispatch_uid=f'pg-scoring-capture-{uid}')
+    post_save.connect(_on_catalog_save, sender=model, dispatch_uid=f'pg-scoring-save-{uid}')
+    post_delete.connect(_on_catalog_delete, sender=model, dispatch_uid=f'pg-scoring-delete-{uid}')
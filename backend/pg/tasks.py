@@ -0,0 +1,18 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from jobs.registry import task
+from . import reports
+
+
+@task('pg.rebuild_scorecards')
+def rebuild_scorecards(job):
+    out = StringIO()
+    call_command('rebuild_scorecards', stdout=out)
+    return {'output': out.getvalue()}
+
+
+@task('pg.generate_reports')
+def generate_reports(job, institutions=None, force=False):
+    return reports.generate(institution_ids=institutions, force=force, progress=job.set_progress)
@@ -0,0 +1,270 @@
+from itertools import combinations
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from core.fast_serializers import _mappers
+from modules.models import Module
+from jobs.models import Job
+from organizations.models import Institution
+from proformas.models import ProformaItem, ProformaSection, ProformaTemplate
+from .models import ComplianceScorecard, PGItemCompliance
+from . import scorecards
+from .scorecards import SCORE_FIELDS, compute_scorecards
+from .serializers import PGItemComplianceSerializer
+
+
+class ComplianceQueryCountTests(APITestCase):
+    """Compliance endpoints read a constant number of queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', is_staff=True)
+        module = Module.objects.create(code='PG', display_name='Postgraduate')
+        template = ProformaTemplate.objects.create(module=module, code='T1', title='Template')
+        section = ProformaSection.objects.create(template=template, title='Section')
+        cls.items = [ProformaItem.objects.create(section=section, text=f'Item {n}', order=n) for n in range(5)]
+        cls.institution = Institution.objects.create(name='Institution')
+        cls.compliance = [
+            PGItemCompliance.objects.create(institution=cls.institution, item=item, status='YES')
+            for item in cls.items
+        ]
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_list(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/pg/compliance/')
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_list_with_item_details(self):
+        # Items are joined, not loaded per row.
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/pg/compliance/?institution={self.institution.pk}&expand=item_details')
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertTrue(response.data['results'][0]['item_details']['text'].startswith('Item'))
+
+    def test_retrieve(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/pg/compliance/{self.compliance[0].pk}/?expand=item_details')
+        self.assertEqual(response.data['item_details']['text'], 'Item 0')
+
+    def test_pages_through_equal_timestamps(self):
+        PGItemCompliance.objects.update(created_at=self.compliance[0].created_at)
+        url, seen = '/api/pg/compliance/?page_size=2', []
+        while url:
+            data = self.client.get(url).json()
+            seen += [row['id'] for row in data['results']]
+            url = data['next']
+        self.assertEqual(sorted(seen), sorted(str(row.pk) for row in self.compliance))
+        self.assertEqual(len(seen), 5)
+
+
+class ScorecardAssertions:
+    def assert_scorecards_match(self):
+        stored = {
+            (card.institution_id, card.template_id, card.section_id): {field: getattr(card, field) for field in SCORE_FIELDS}
+            for card in ComplianceScorecard.objects.all()
+        }
+        expected = {key: totals for key, totals in compute_scorecards().items() if any(totals.values())}
+        self.assertEqual({key: totals for key, totals in stored.items() if any(totals.values())}, expected)
+
+
+class ComplianceBulkUpsertTests(ScorecardAssertions, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', is_staff=True)
+        module = Module.objects.create(code='PG', display_name='Postgraduate')
+        template = ProformaTemplate.objects.create(module=module, code='T1', title='Template')
+        section = ProformaSection.objects.create(template=template, title='Section')
+        cls.items = [ProformaItem.objects.create(section=section, text=f'Item {n}', order=n) for n in range(3)]
+        cls.institutions = [Institution.objects.create(name=f'Institution {n}') for n in range(2)]
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def upsert(self, rows):
+        return self.client.post('/api/pg/compliance/bulk/', rows, format='json')
+
+    def test_creates_then_updates(self):
+        institution, item = self.institutions[0], self.items[0]
+        response = self.upsert([{'institution': institution.pk, 'item': item.pk, 'status': 'YES', 'comment': 'ok'}])
+        self.assertEqual((response.data['created'], response.data['updated']), (1, 0))
+
+        response = self.upsert([{'institution': institution.pk, 'item': item.pk, 'status': 'NO'}])
+        self.assertEqual((response.data['created'], response.data['updated']), (0, 1))
+        row = PGItemCompliance.objects.get(institution=institution, item=item)
+        self.assertEqual((row.status, row.comment, row.updated_by), ('NO', 'ok', self.user))
+        self.assert_scorecards_match()
+
+    def test_only_listed_pairs_are_written(self):
+        other = PGItemCompliance.objects.create(institution=self.institutions[1], item=self.items[0], status='NA')
+        self.upsert([{'institution': self.institutions[0].pk, 'item': self.items[0].pk, 'status': 'YES'},
+                     {'institution': self.institutions[1].pk, 'item': self.items[1].pk, 'status': 'YES'}])
+        other.refresh_from_db()
+        self.assertEqual((other.status, other.updated_by), ('NA', None))
+        self.assertEqual(PGItemCompliance.objects.count(), 3)
+        self.assert_scorecards_match()
+
+    def test_scorecards_are_written_in_lock_order(self):
+        rows = [
+            {'institution': institution.pk, 'item': item.pk, 'status': 'YES'}
+            for institution in sorted(self.institutions, key=lambda row: row.pk, reverse=True)
+            for item in self.items
+        ]
+        with mock.patch.object(scorecards, '_apply_deltas', wraps=scorecards._apply_deltas) as apply_deltas:
+            self.upsert(rows)
+        keys = [call.args[:3] for call in apply_deltas.call_args_list]
+        self.assertEqual(len(keys), 4)
+        self.assertEqual(keys, sorted(keys, key=lambda key: (key[0], key[1], key[2] is not None, key[2])))
+        self.assert_scorecards_match()
+
+    def test_rows_without_institution(self):
+        duplicates = [PGItemCompliance.objects.create(item=self.items[0], status='NO') for _ in range(2)]
+        response = self.upsert([{'institution': None, 'item': self.items[0].pk, 'status': 'YES'},
+                                {'institution': None, 'item': self.items[1].pk, 'status': 'YES'}])
+        self.assertEqual((response.data['created'], response.data['updated']), (1, 2))
+        for row in duplicates:
+            row.refresh_from_db()
+            self.assertEqual(row.status, 'YES')
+        self.assertEqual(PGItemCompliance.objects.filter(institution__isnull=True).count(), 3)
+
+
+class ComplianceScorecardViewTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', is_staff=True)
+        module = Module.objects.create(code='PG', display_name='Postgraduate')
+        template = ProformaTemplate.objects.create(module=module, code='T1', title='Template')
+        section = ProformaSection.objects.create(template=template, title='Section')
+        item = ProformaItem.objects.create(section=section, text='Item')
+        cls.institution = Institution.objects.create(name='Institution')
+        PGItemCompliance.objects.create(institution=cls.institution, item=item, status='YES')
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_list_requires_institution(self):
+        self.assertEqual(self.client.get('/api/pg/scorecards/').status_code, 400)
+        response = self.client.get(f'/api/pg/scorecards/?institution={self.institution.pk}')
+        self.assertEqual(len(response.data), 2)
+
+
+class ScorecardMaintenanceTests(ScorecardAssertions, TestCase):
+    """Writes outside the API keep scorecards in step."""
+
+    @classmethod
+    def setUpTestData(cls):
+        module = Module.objects.create(code='PG', display_name='Postgraduate')
+        template = ProformaTemplate.objects.create(module=module, code='T1', title='Template')
+        cls.sections = [ProformaSection.objects.create(template=template, title=f'Section {n}') for n in range(2)]
+        cls.items = [ProformaItem.objects.create(section=cls.sections[0], text=f'Item {n}') for n in range(2)]
+        cls.institution = Institution.objects.create(name='Institution')
+
+    def test_model_writes(self):
+        row = PGItemCompliance.objects.create(institution=self.institution, item=self.items[0], status='YES')
+        self.assert_scorecards_match()
+        row.status = 'NO'
+        row.save()
+        self.assert_scorecards_match()
+        row.item = self.items[1]
+        row.save(update_fields=['item'])
+        self.assert_scorecards_match()
+        row.delete()
+        self.assert_scorecards_match()
+        PGItemCompliance.objects.create(institution=self.institution, item=self.items[0], status='PARTIAL')
+        PGItemCompliance.objects.all().delete()
+        self.assert_scorecards_match()
+
+    def test_stale_instance_applies_stored_state(self):
+        row = PGItemCompliance.objects.create(institution=self.institution, item=self.items[0], status='YES')
+        other = PGItemCompliance.objects.get(pk=row.pk)
+        other.status = 'NO'
+        other.save()
+        row.status = 'PARTIAL'
+        row.save()
+        self.assert_scorecards_match()
+
+    def test_scoring_changes_schedule_one_rebuild(self):
+        item = ProformaItem.objects.get(pk=self.items[0].pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            item.text = 'Renamed'
+            item.save()
+        self.assertFalse(Job.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            item.weight = 3
+            item.save()
+            item.section = self.sections[1]
+            item.save()
+            self.items[1].delete()
+        self.assertEqual(list(Job.objects.values_list('name', 'status')), [('pg.rebuild_scorecards', 'queued')])
+
+
+class ComplianceFastListParityTests(APITestCase):
+    """The values() list path renders the same bytes as the serializer."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', is_staff=True)
+        module = Module.objects.create(code='PG', display_name='Postgraduate')
+        template = ProformaTemplate.objects.create(module=module, code='T1', title='Template')
+        section = ProformaSection.objects.create(template=template, title='Section')
+        items = [
+            ProformaItem.objects.create(section=section, code='1.1', text='Item with every field', order=1,
+                                        importance_level=3, is_licensing_critical=True, weightage_percent=40),
+            ProformaItem.objects.create(section=section, text='Item with defaults', order=2),
+        ]
+        institution = Institution.objects.create(name='Institution')
+        PGItemCompliance.objects.create(institution=institution, item=items[0], status='YES',
+                                        comment='Verified', evidence_url='https://example.com/a', updated_by=cls.user)
+        PGItemCompliance.objects.create(institution=institution, item=items[1], status='PARTIAL')
+        PGItemCompliance.objects.create(item=items[0], status='NO', comment='No institution')
+        PGItemCompliance.objects.create(item=items[1], status='NA', updated_by=cls.user)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def fetch(self, url, fast):
+        with override_settings(FAST_SERIALIZERS_ENABLED=fast):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assert_parity(self, url):
+        pages = 0
+        while url:
+            expected = self.fetch(url, fast=False)
+            self.assertEqual(self.fetch(url, fast=True).content, expected.content, url)
+            url = expected.data['next']
+            pages += 1
+        return pages
+
+    def test_every_field_and_expansion(self):
+        # Every single field, every pair and all of them, with and without
+        # the nested item, over two-row pages.
+        fields = ['id', 'institution', 'item', 'item_details', 'status', 'comment', 'evidence_url',
+                  'updated_by', 'updated_at']
+        selections = [None, *(
+            ','.join(names) for size in (1, 2, len(fields)) for names in combinations(fields, size)
+        )]
+        for expand in (None, 'item_details'):
+            for selection in selections:
+                query = '&'.join(
+                    f'{name}={value}' for name, value in (('fields', selection), ('expand', expand)) if value
+                )
+                with self.subTest(query=query):
+                    self.assertEqual(self.assert_parity(f'/api/pg/compliance/?page_size=2&{query}'), 2)
+        # None would mean the list quietly fell back to the serializer.
+        mappers = [mapper for (cls, _), mapper in _mappers.items() if cls is PGItemComplianceSerializer]
+        self.assertTrue(mappers)
+        self.assertNotIn(None, mappers)
+
+    def test_filters(self):
+        institution = Institution.objects.get()
+        for query in (f'institution={institution.pk}&expand=item_details', 'status=NO', 'page_size=500'):
+            with self.subTest(query=query):
+                self.assert_parity(f'/api/pg/compliance/?{query}')
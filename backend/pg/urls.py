@@ -1,9 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PGItemComplianceViewSet
+from .views import ComplianceReportViewSet, ComplianceScorecardViewSet, PGItemComplianceViewSet
 
 router = DefaultRouter()
 router.register(r'compliance', PGItemComplianceViewSet, basename='pg-compliance')
+router.register(r'scorecards', ComplianceScorecardViewSet, basename='pg-scorecard')
+router.register(r'reports', ComplianceReportViewSet, basename='pg-report')
 
 urlpatterns = [
     path('', include(router.urls)),
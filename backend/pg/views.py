@@ -1,31 +1,106 @@
-from rest_framework import viewsets
+import uuid
+from collections import defaultdict
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
-from .models import PGItemCompliance
-from .serializers import PGItemComplianceSerializer
+from rest_framework.response import Response
+from core.async_views import AsyncDispatchMixin
+from core.fast_serializers import FastListMixin
+from core.routing import ReplicaReadMixin
+from core.serializers import field_requested
+from core.streaming import PassthroughRenderer, export_response
+from jobs.queue import enqueue
+from jobs.serializers import JobSerializer
+from organizations.models import Institution
+from proformas.models import ProformaItem
+from .matrix import ENCODINGS, STATUSES, build_matrix
+from .models import ComplianceReport, ComplianceScorecard, PGItemCompliance
+from .scorecards import update_scorecards
+from .signals import compliance_bulk_upserted
+from .serializers import (
+    ComplianceReportGenerateSerializer,
+    ComplianceReportSerializer,
+    ComplianceScorecardSerializer,
+    PGItemComplianceBulkRowSerializer,
+    PGItemComplianceSerializer,
+)
+
+
+BULK_WRITABLE_FIELDS = ('status', 'comment', 'evidence_url')
+EXPORT_COLUMNS = (
+    ('Institution', 'institution__name'),
+    ('Section code', 'item__section__code'),
+    ('Section', 'item__section__title'),
+    ('Item code', 'item__code'),
+    ('Requirement', 'item__requirement_text'),
+    ('Status', 'status'),
+    ('Comment', 'comment'),
+    ('Evidence URL', 'evidence_url'),
+    ('Updated at', 'updated_at'),
+)
+
+
+class _ConcurrentInsert(Exception):
+    pass
 
 
-class PGItemComplianceViewSet(viewsets.ModelViewSet):
+class PGItemComplianceViewSet(AsyncDispatchMixin, FastListMixin, ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing PG regulation checklist item compliance status.
     """
     queryset = PGItemCompliance.objects.all()
     serializer_class = PGItemComplianceSerializer
     permission_classes = [IsAuthenticated]
+    max_bulk_rows = 500
+    bulk_upsert_attempts = 3
     
     def get_queryset(self):
         """
-        Optionally filter by institution or item.
+        Optionally filter by institution, item, template or status; the item
+        is only joined when ``?expand=item_details`` asks for it.
         """
         queryset = super().get_queryset()
+        if field_requested(self.request, 'item_details', expandable=True):
+            queryset = queryset.select_related('item')
         institution_id = self.request.query_params.get('institution', None)
         item_id = self.request.query_params.get('item', None)
+        template_id = self.request.query_params.get('template', None)
+        compliance_status = self.request.query_params.get('status', None)
         
         if institution_id:
             queryset = queryset.filter(institution_id=institution_id)
         if item_id:
             queryset = queryset.filter(item_id=item_id)
+        if template_id:
+            queryset = queryset.filter(item__section__template_id=template_id)
+        if compliance_status:
+            queryset = queryset.filter(status=compliance_status)
             
         return queryset
+
+    async def list(self, request, *args, **kwargs):
+        """
+        The hot read path runs on the event loop and fetches its page with
+        the async ORM, as ``values()`` rows when the fast path applies; the
+        other actions run in a worker thread.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        mapper = self.get_row_mapper()
+        if mapper is None:
+            page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+            data = self.get_serializer(page, many=True).data
+        else:
+            page = await self.paginator.apaginate_queryset(self.fast_rows(queryset, mapper), request, view=self)
+            data = [mapper(row) for row in page]
+        return self.get_paginated_response(data)
     
     def perform_create(self, serializer):
         """
@@ -38,3 +113,322 @@ class PGItemComplianceViewSet(viewsets.ModelViewSet):
         Automatically set updated_by to current user on updates.
         """
         serializer.save(updated_by=self.request.user)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_upsert(self, request):
+        """
+        Create or update many compliance rows in a single transaction.
+
+        Accepts a list of ``{institution, item, status?, comment?, evidence_url?}``
+        objects and upserts them keyed on (institution, item). The whole batch
+        is rejected if any row is invalid; otherwise one result per input row
+        is returned in request order. Answers 409 if rows keep being created
+        concurrently by other requests.
+        """
+        rows = request.data
+        if not isinstance(rows, list):
+            return Response(
+                {'detail': 'Expected a list of compliance rows.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(rows) > self.max_bulk_rows:
+            return Response(
+                {'detail': f'At most {self.max_bulk_rows} rows may be sent per request.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = PGItemComplianceBulkRowSerializer(data=rows, many=True)
+        if not serializer.is_valid():
+            return Response({'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        changes = serializer.validated_data
+
+        # Validate foreign keys with one query per table instead of one per row.
+        item_ids = {row['item'] for row in changes}
+        institution_ids = {row['institution'] for row in changes if row['institution']}
+        known_items = ProformaItem.objects.in_bulk(item_ids)
+        known_institutions = set(
+            Institution.objects.filter(id__in=institution_ids).values_list('id', flat=True)
+        )
+        errors = []
+        for row in changes:
+            row_errors = {}
+            if row['item'] not in known_items:
+                row_errors['item'] = ['Unknown item.']
+            if row['institution'] and row['institution'] not in known_institutions:
+                row_errors['institution'] = ['Unknown institution.']
+            errors.append(row_errors)
+        if any(errors):
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        for _ in range(self.bulk_upsert_attempts):
+            try:
+                with transaction.atomic():
+                    results, created_count, updated_count = self._bulk_write(changes, known_items, request.user)
+                break
+            except _ConcurrentInsert:
+                continue
+        else:
+            return Response(
+                {'detail': 'Rows were created concurrently; retry the request.'},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response({
+            'created': created_count,
+            'updated': updated_count,
+            'results': [
+                {
+                    'id': obj.id,
+                    'institution': obj.institution_id,
+                    'item': obj.item_id,
+                    'status': obj.status,
+                    'comment': obj.comment,
+                    'evidence_url': obj.evidence_url,
+                    'updated_by': obj.updated_by_id,
+                    'updated_at': obj.updated_at,
+                    'created': created,
+                }
+                for obj, created in results
+            ],
+        })
+
+    def _bulk_write(self, changes, known_items, user):
+        """
+        Apply ``changes`` and return ``(results, created, updated)``.
+
+        Existing rows are locked by their exact (institution, item) pairs and
+        updated in place. New pairs are written with one upsert on the
+        (institution, item) constraint, so a concurrent insert of the same
+        pair cannot fail the request; if one happened, its previous state is
+        unknown to the scorecard deltas, and ``_ConcurrentInsert`` rolls the
+        attempt back to be retried against the now existing row. A NULL
+        institution is not covered by the constraint: every row with that
+        item is updated, or one is created.
+        """
+        pairs = Q()
+        for institution_id, item_id in {(row['institution'], row['item']) for row in changes}:
+            if institution_id is None:
+                pairs |= Q(institution__isnull=True, item_id=item_id)
+            else:
+                pairs |= Q(institution_id=institution_id, item_id=item_id)
+        existing = defaultdict(list)
+        for obj in PGItemCompliance.objects.select_for_update().filter(pairs).order_by('created_at', 'id'):
+            existing[(obj.institution_id, obj.item_id)].append(obj)
+        removed = [
+            (obj.institution_id, known_items[obj.item_id], obj.status)
+            for objs in existing.values()
+            for obj in objs
+        ]
+
+        now = timezone.now()
+        to_create = {}
+        results = []
+        for row in changes:
+            key = (row['institution'], row['item'])
+            objs = existing.get(key)
+            created = objs is None
+            if created:
+                if key not in to_create:
+                    to_create[key] = PGItemCompliance(institution_id=key[0], item_id=key[1])
+                objs = [to_create[key]]
+            for obj in objs:
+                for field in BULK_WRITABLE_FIELDS:
+                    if field in row:
+                        setattr(obj, field, row[field])
+                obj.updated_by = user
+                obj.updated_at = now
+            results.append((objs[0], created))
+
+        written_fields = [*BULK_WRITABLE_FIELDS, 'updated_by', 'updated_at']
+        to_update = [obj for objs in existing.values() for obj in objs]
+        if to_update:
+            PGItemCompliance.objects.bulk_update(to_update, fields=written_fields)
+        if to_create:
+            PGItemCompliance.objects.bulk_create(
+                to_create.values(),
+                update_conflicts=True,
+                unique_fields=['institution', 'item'],
+                update_fields=written_fields,
+            )
+            # A pair inserted by someone else since the read above keeps its
+            # own primary key instead of the one generated here.
+            new_ids = [obj.id for obj in to_create.values()]
+            if PGItemCompliance.objects.filter(id__in=new_ids).count() != len(new_ids):
+                raise _ConcurrentInsert
+
+        added = [
+            (obj.institution_id, known_items[obj.item_id], obj.status)
+            for obj in [*to_update, *to_create.values()]
+        ]
+        update_scorecards(removed=removed, added=added)
+        compliance_bulk_upserted.send(sender=PGItemCompliance, removed=removed, added=added)
+        return results, len(to_create), len(to_update)
+
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path=r'export/(?P<file_format>csv|xlsx)',
+        renderer_classes=[PassthroughRenderer],
+    )
+    def export(self, request, file_format):
+        """
+        Stream the compliance checklist as CSV or XLSX.
+
+        Honours the ``?institution=`` and ``?item=`` filters (and
+        ``?template=``); rows are read through a server-side cursor so memory
+        use does not grow with the size of the export.
+        """
+        queryset = PGItemCompliance.objects.all()
+        institution_id = request.query_params.get('institution', None)
+        item_id = request.query_params.get('item', None)
+        template_id = request.query_params.get('template', None)
+
+        if institution_id:
+            queryset = queryset.filter(institution_id=institution_id)
+        if item_id:
+            queryset = queryset.filter(item_id=item_id)
+        if template_id:
+            queryset = queryset.filter(item__section__template_id=template_id)
+
+        rows = (
+            queryset
+            .order_by('institution__name', 'item__section__order', 'item__order', 'id')
+            .values_list(*(field for _, field in EXPORT_COLUMNS))
+            .iterator(chunk_size=2000)
+        )
+        return export_response(
+            'pg-compliance',
+            file_format,
+            [title for title, _ in EXPORT_COLUMNS],
+            rows,
+            sheet_name='PG compliance',
+        )
+
+    @action(detail=False, methods=['get'])
+    def matrix(self, request):
+        """
+        Institutions x items status grid for ``?template=<id>``.
+
+        Optional ``?institution=`` (repeatable) limits the rows and
+        ``?encoding=rle`` switches ``data`` from base64 bytes to a
+        ``[code, run, ...]`` list. Cell codes index ``statuses``; row ``i``,
+        column ``j`` is cell ``i * shape[1] + j``.
+        """
+        template_id = request.query_params.get('template', None)
+        encoding = request.query_params.get('encoding', 'base64')
+        institution_ids = request.query_params.getlist('institution')
+        if not template_id:
+            return Response({'detail': 'template is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        if encoding not in ENCODINGS:
+            return Response(
+                {'detail': f"encoding must be one of: {', '.join(ENCODINGS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            matrix = build_matrix(uuid.UUID(template_id), [uuid.UUID(pk) for pk in institution_ids])
+        except ValueError:
+            return Response({'detail': 'Invalid id.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'template': template_id,
+            'statuses': STATUSES,
+            'institutions': matrix.institutions,
+            'items': [
+                {'id': item['id'], 'code': item['code'], 'section_code': item['section__code']}
+                for item in matrix.items
+            ],
+            'shape': matrix.shape,
+            'encoding': encoding,
+            'data': matrix.encode(encoding),
+            **matrix.aggregates(),
+        })
+
+class ComplianceScorecardViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only access to the materialized compliance scorecards.
+
+    Listing requires ``?institution=`` (optionally narrowed with
+    ``?template=``) and returns that institution's template and section
+    totals from the scorecard index.
+    """
+    queryset = ComplianceScorecard.objects.select_related('section').order_by('section__order')
+    serializer_class = ComplianceScorecardSerializer
+    permission_classes = [IsAuthenticated]
+    # Bounded by the sections of the templates one institution is scored on,
+    # which is why list requires the institution filter.
+    pagination_class = None
+
+    def list(self, request, *args, **kwargs):
+        if not request.query_params.get('institution'):
+            return Response({'detail': 'institution is required.'}, status=400)
+        return super().list(request, *args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        institution_id = self.request.query_params.get('institution', None)
+        template_id = self.request.query_params.get('template', None)
+
+        if institution_id:
+            queryset = queryset.filter(institution_id=institution_id)
+        if template_id:
+            queryset = queryset.filter(template_id=template_id)
+
+        return queryset
+
+
+class ComplianceReportViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Generated PG compliance reports (see ``manage.py generate_reports``).
+
+    Filter with ``?institution=``. ``POST generate/`` queues a
+    ``pg.generate_reports`` job and returns it; poll ``/api/jobs/<id>/``
+    for progress.
+    """
+    queryset = ComplianceReport.objects.select_related('institution')
+    serializer_class = ComplianceReportSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        institution_id = self.request.query_params.get('institution', None)
+
+        if institution_id:
+            queryset = queryset.filter(institution_id=institution_id)
+
+        return queryset
+
+    @action(detail=False, methods=['post'])
+    def generate(self, request):
+        serializer = ComplianceReportGenerateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        institutions = serializer.validated_data['institutions']
+        job = enqueue(
+            'pg.generate_reports',
+            args={
+                'institutions': [str(pk) for pk in institutions] if institutions else None,
+                'force': serializer.validated_data['force'],
+            },
+            created_by=request.user,
+        )
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Download the report; sent by nginx when an accel prefix is configured."""
+        report = self.get_object()
+        filename = f"pg-report-{report.institution.name}.html"
+
+        # Reports live under MEDIA_ROOT like evidence, behind the same internal location.
+        prefix = settings.EVIDENCE_DOWNLOAD_ACCEL_PREFIX
+        if prefix:
+            response = HttpResponse(content_type='text/html; charset=utf-8')
+            response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(report.file.name)
+        else:
+            try:
+                response = FileResponse(report.file.open('rb'), content_type='text/html; charset=utf-8')
+            except FileNotFoundError:
+                raise Http404
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        response['Cache-Control'] = 'private, no-cache'
+        return response
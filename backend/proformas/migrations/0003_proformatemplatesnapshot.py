@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:10
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('proformas', '0002_proformaitem_code_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProformaTemplateSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('payload', models.BinaryField()),
+                ('payload_gzip', models.BinaryField()),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='proformas.proformatemplate')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['template', '-updated_at'], name='proforma_snapshot_latest_idx')],
+                'constraints': [models.UniqueConstraint(fields=('template', 'content_hash'), name='proforma_snapshot_unique_hash')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('proformas', '0003_proformatemplatesnapshot'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='proformaitem',
+            name='section',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='items', to='proformas.proformasection'),
+        ),
+        migrations.AlterField(
+            model_name='proformasection',
+            name='template',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='sections', to='proformas.proformatemplate'),
+        ),
+        migrations.AddIndex(
+            model_name='proformaitem',
+            index=models.Index(fields=['section', 'order'], name='item_section_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proformasection',
+            index=models.Index(fields=['template', 'order'], name='section_template_order_idx'),
+        ),
+    ]
@@ -15,7 +15,8 @@ class ProformaTemplate(BaseModel):
         return self.title
 
 class ProformaSection(BaseModel):
-    template = models.ForeignKey(ProformaTemplate, on_delete=models.CASCADE, related_name='sections')
+    # Indexed by section_template_order_idx.
+    template = models.ForeignKey(ProformaTemplate, on_delete=models.CASCADE, related_name='sections', db_index=False)
     code = models.CharField(max_length=100, blank=True, default="")
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True, default="")
@@ -24,12 +25,16 @@ class ProformaSection(BaseModel):
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['template', 'order'], name='section_template_order_idx'),
+        ]
 
     def __str__(self):
         return f"{self.template.code} - {self.title}"
 
 class ProformaItem(BaseModel):
-    section = models.ForeignKey(ProformaSection, on_delete=models.CASCADE, related_name='items')
+    # Indexed by item_section_order_idx.
+    section = models.ForeignKey(ProformaSection, on_delete=models.CASCADE, related_name='items', db_index=False)
     code = models.CharField(max_length=100, blank=True, default="")
     text = models.TextField()
     requirement_text = models.TextField(blank=True, default="")
@@ -44,6 +49,33 @@ class ProformaItem(BaseModel):
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['section', 'order'], name='item_section_order_idx'),
+        ]
 
     def __str__(self):
         return f"{self.section.title} - {self.text[:50]}"
+
+class ProformaTemplateSnapshot(BaseModel):
+    """
+    Immutable, content-addressed JSON rendering of a template's full tree.
+
+    A new row is stored whenever the compiled payload changes; the most
+    recently current row (by ``updated_at``) is served by the retrieve
+    endpoint.
+    """
+    template = models.ForeignKey(ProformaTemplate, on_delete=models.CASCADE, related_name='snapshots')
+    content_hash = models.CharField(max_length=64)
+    payload = models.BinaryField()
+    payload_gzip = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['template', 'content_hash'], name='proforma_snapshot_unique_hash'),
+        ]
+        indexes = [
+            models.Index(fields=['template', '-updated_at'], name='proforma_snapshot_latest_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.template_id} @ {self.content_hash[:12]}"
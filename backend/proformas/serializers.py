@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
 from .models import ProformaTemplate, ProformaSection, ProformaItem
 
-class ProformaItemSerializer(serializers.ModelSerializer):
+class ProformaItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ProformaItem
         fields = [
@@ -10,14 +11,14 @@ class ProformaItemSerializer(serializers.ModelSerializer):
             'max_score', 'weightage_percent', 'is_licensing_critical'
         ]
 
-class ProformaSectionSerializer(serializers.ModelSerializer):
+class ProformaSectionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = ProformaItemSerializer(many=True, read_only=True)
 
     class Meta:
         model = ProformaSection
         fields = ['id', 'code', 'title', 'description', 'order', 'weight', 'items']
 
-class ProformaTemplateSerializer(serializers.ModelSerializer):
+class ProformaTemplateSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     sections = ProformaSectionSerializer(many=True, read_only=True)
 
     class Meta:
@@ -0,0 +1,47 @@
+"""
+Keep template snapshots in step with the catalog.
+
+Saving or deleting a template, section or item drops the stored snapshots
+of every template it belongs (or belonged) to, inside the writing
+transaction; the next retrieve compiles a fresh one. ``bulk_create``,
+``bulk_update`` and ``QuerySet.update()`` send no signals, so callers using
+them must call ``compile_snapshot`` afterwards, as ``seed_pmdc_pg`` does.
+"""
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_init, post_save
+
+from .models import ProformaItem, ProformaSection, ProformaTemplate, ProformaTemplateSnapshot
+
+# The field pointing at each model's parent in the template tree.
+PARENT_FIELDS = {
+    ProformaTemplate: 'id',
+    ProformaSection: 'template_id',
+    ProformaItem: 'section_id',
+}
+
+
+def _parent(sender, instance):
+    return instance.__dict__.get(PARENT_FIELDS[sender])
+
+
+def _capture(sender, instance, **kwargs):
+    instance._snapshot_parent = _parent(sender, instance)
+
+
+def _discard(sender, instance, **kwargs):
+    parents = {_parent(sender, instance), getattr(instance, '_snapshot_parent', None)} - {None}
+    if not parents:
+        return
+    if sender is ProformaItem:
+        condition = Q(template__sections__in=parents)
+    else:
+        condition = Q(template_id__in=parents)
+    ProformaTemplateSnapshot.objects.filter(condition).delete()
+    instance._snapshot_parent = _parent(sender, instance)
+
+
+for model in PARENT_FIELDS:
+    uid = model.__name__
+    post_init.connect(_capture, sender=model, dispatch_uid=f'snapshot-capture-{uid}')
+    post_save.connect(_discard, sender=model, dispatch_uid=f'snapshot-save-{uid}')
+    post_delete.connect(_discard, sender=model, dispatch_uid=f'snapshot-delete-{uid}')
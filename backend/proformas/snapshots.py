@@ -0,0 +1,51 @@
+import gzip
+import hashlib
+
+from rest_framework.renderers import JSONRenderer
+
+from .models import ProformaTemplate, ProformaTemplateSnapshot
+from .serializers import ProformaTemplateSerializer
+
+
+def _snapshots(template_id):
+    return ProformaTemplateSnapshot.objects.filter(template_id=template_id).order_by('-updated_at')
+
+
+def latest_snapshot(template_id):
+    return _snapshots(template_id).first()
+
+
+async def alatest_snapshot(template_id):
+    return await _snapshots(template_id).afirst()
+
+
+def compile_snapshot(template):
+    """
+    Render ``template`` exactly as the retrieve endpoint would and store it.
+
+    Returns the snapshot for the current content, creating it only if no
+    snapshot with the same hash exists yet.
+    """
+    template = (
+        ProformaTemplate.objects
+        .prefetch_related('sections__items')
+        .get(pk=template.pk)
+    )
+    payload = JSONRenderer().render(ProformaTemplateSerializer(template).data)
+    content_hash = hashlib.sha256(payload).hexdigest()
+
+    latest = latest_snapshot(template.pk)
+    if latest is not None and latest.content_hash == content_hash:
+        return latest
+    snapshot, created = ProformaTemplateSnapshot.objects.get_or_create(
+        template=template,
+        content_hash=content_hash,
+        defaults={
+            'payload': payload,
+            'payload_gzip': gzip.compress(payload, mtime=0),
+        },
+    )
+    if not created:
+        # Content reverted to an earlier version: make that snapshot current again.
+        snapshot.save(update_fields=['updated_at'])
+    return snapshot
@@ -0,0 +1,128 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+import yaml
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from modules.models import Module
+from .models import ProformaItem, ProformaSection, ProformaTemplate
+
+
+def create_template(module, code, sections=2, items=3):
+    template = ProformaTemplate.objects.create(module=module, code=code, title=f'Template {code}')
+    for section_order in range(1, sections + 1):
+        section = ProformaSection.objects.create(template=template, title=f'Section {section_order}', order=section_order)
+        for item_order in range(1, items + 1):
+            ProformaItem.objects.create(section=section, text=f'Item {item_order}', order=item_order)
+    return template
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class ProformaTemplateQueryCountTests(APITestCase):
+    """Template endpoints read a constant number of queries however large the tree is."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', is_staff=True)
+        cls.module = Module.objects.create(code='PG', display_name='Postgraduate')
+        cls.template = create_template(cls.module, 'T1')
+        create_template(cls.module, 'T2', sections=3, items=4)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_list(self):
+        # Templates, then sections and items prefetched.
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/proformas/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_list_does_not_grow_with_templates(self):
+        create_template(self.module, 'T3', sections=4, items=5)
+        with self.assertNumQueries(3):
+            self.client.get('/api/proformas/')
+
+    def test_list_without_sections(self):
+        with self.assertNumQueries(1):
+            self.client.get('/api/proformas/?fields=id,code,title')
+
+    def test_retrieve_through_serializer(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/proformas/{self.template.pk}/?fields=id,sections')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['sections']), 2)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class ProformaTemplateSnapshotTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', is_staff=True)
+        cls.template = create_template(Module.objects.create(code='PG', display_name='Postgraduate'), 'T1')
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/proformas/{self.template.pk}/'
+
+    def test_catalog_edits_are_served(self):
+        self.client.get(self.url)
+        item = ProformaItem.objects.filter(section__template=self.template).first()
+        item.text = 'Edited'
+        item.save()
+        self.assertContains(self.client.get(self.url), 'Edited')
+
+        item.delete()
+        self.assertNotContains(self.client.get(self.url), 'Edited')
+
+    def test_gzip_refused_with_zero_quality(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='br, gzip;q=0.5')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_if_none_match_compares_whole_tags(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"other", {etag}').status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"x{etag[1:]}').status_code, 200)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag[:-1] + '-gz"').status_code, 200)
+
+
+class ProformaTemplateResponseCacheTests(APITestCase):
+    """Seeding the catalog drops cached template responses."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client.force_authenticate(self.user)
+
+    def seed(self, *args):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('seed_pmdc_pg', *args, stdout=StringIO())
+
+    def test_reseeding_drops_cached_templates(self):
+        self.seed()
+        self.assertEqual(self.client.get('/api/proformas/')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/proformas/')['X-Cache'], 'HIT')
+
+        # Item edits are written with bulk_update, which sends no signals.
+        data = yaml.safe_load((Path(settings.BASE_DIR).parent / 'docs' / 'MODULE_PG_PMD2023.yaml').read_text())
+        data['sections'][0]['items'][0]['text'] = 'Edited by a reseed'
+        with tempfile.NamedTemporaryFile('w', suffix='.yaml') as edited:
+            yaml.safe_dump(data, edited)
+            edited.flush()
+            self.seed('--yaml', edited.name)
+
+        response = self.client.get('/api/proformas/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertContains(response, 'Edited by a reseed')
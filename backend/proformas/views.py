@@ -1,9 +1,90 @@
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
-from .models import ProformaTemplate
+from core.async_views import AsyncDispatchMixin
+from core.pagination import CodeCursorPagination
+from core.response_cache import CachedResponseMixin
+from core.routing import ReplicaReadMixin
+from core.serializers import field_requested
+from .models import ProformaItem, ProformaSection, ProformaTemplate
 from .serializers import ProformaTemplateSerializer
+from .snapshots import alatest_snapshot, compile_snapshot
+
+
+def _accepts_gzip(header):
+    """Whether an ``Accept-Encoding`` header allows gzip; ``q=0`` refuses a coding."""
+    qualities = {}
+    for part in header.split(','):
+        coding, *params = (piece.strip() for piece in part.split(';'))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    for coding in ('gzip', 'x-gzip', '*'):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def _etag_matches(etag, header):
+    """Weak ``If-None-Match`` comparison of ``etag`` against each listed tag."""
+    tags = parse_etags(header)
+    return '*' in tags or any(tag.removeprefix('W/') == etag for tag in tags)
 
-class ProformaTemplateViewSet(viewsets.ReadOnlyModelViewSet):
+
+class ProformaTemplateViewSet(AsyncDispatchMixin, CachedResponseMixin, ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     queryset = ProformaTemplate.objects.all()
     serializer_class = ProformaTemplateSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CodeCursorPagination
+    cache_scope = 'proformas'
+    cache_models = (ProformaTemplate, ProformaSection, ProformaItem)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if field_requested(self.request, 'sections'):
+            queryset = queryset.prefetch_related('sections__items')
+        return queryset
+
+    async def retrieve(self, request, *args, **kwargs):
+        """
+        Serve the template's precompiled snapshot with a strong ETag.
+
+        Answers a matching ``If-None-Match`` with 304 and serves the stored
+        gzip variant to clients that accept it. Requests using ``?fields=``
+        or ``?expand=`` go through the serializer instead.
+        """
+        if 'fields' in request.query_params or 'expand' in request.query_params:
+            return await sync_to_async(super().retrieve)(request, *args, **kwargs)
+        try:
+            template_id = uuid.UUID(str(kwargs[self.lookup_field]))
+        except ValueError:
+            raise Http404
+        snapshot = await alatest_snapshot(template_id)
+        if snapshot is None:
+            snapshot = await sync_to_async(lambda: compile_snapshot(self.get_object()))()
+
+        use_gzip = _accepts_gzip(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        etag = f'"{snapshot.content_hash}{"-gz" if use_gzip else ""}"'
+        if _etag_matches(etag, request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponse(status=304)
+        elif use_gzip:
+            response = HttpResponse(bytes(snapshot.payload_gzip), content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(bytes(snapshot.payload), content_type='application/json')
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ['Accept-Encoding', 'Authorization'])
+        return response
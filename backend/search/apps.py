@@ -0,0 +1,24 @@
+from django.apps import AppConfig
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import post_migrate
+
+
+def reinstall_sqlite_indexes(sender, using, **kwargs):
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    if ('search', '0001_initial') not in MigrationRecorder(connection).applied_migrations():
+        return
+    from . import indexes
+
+    indexes.install(connection)
+    indexes.rebuild(connection)
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+
+    def ready(self):
+        post_migrate.connect(reinstall_sqlite_indexes, sender=self)
@@ -0,0 +1,126 @@
+"""
+Full-text indexes over checklist items and review comments.
+
+Each ``Source`` names a table and the text columns to index. The index is
+kept up to date by the database itself, so every write path (ORM saves,
+``bulk_create``/``bulk_update``, raw SQL) is covered:
+
+* PostgreSQL: a stored generated ``search_vector`` tsvector column on the
+  source table, with a GIN index.
+* SQLite: an external-content FTS5 table keyed on the source table's
+  rowid, maintained by insert/update/delete triggers.
+
+``install`` creates these for the connection's vendor and is run by the
+search app's migration. On SQLite, Django rebuilds a table (dropping its
+triggers) when a later migration alters it, so ``install`` also runs after
+every ``migrate`` there; see ``SearchConfig``.
+"""
+from dataclasses import dataclass
+
+SEARCH_CONFIG = 'english'
+WEIGHTS = ('A', 'B', 'C', 'D')
+
+
+@dataclass(frozen=True)
+class Source:
+    table: str
+    columns: tuple
+
+    @property
+    def fts_table(self):
+        return f'search_{self.table}_fts'
+
+    @property
+    def gin_index(self):
+        return f'search_{self.table}_gin'
+
+
+SOURCES = {
+    'item': Source('proformas_proformaitem', ('text', 'requirement_text', 'required_evidence_type')),
+    'compliance': Source('pg_pgitemcompliance', ('comment',)),
+    'item_status': Source('assignments_itemstatus', ('comment',)),
+}
+
+
+def _postgres_vector(source):
+    return ' || '.join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce({column}, '')), '{weight}')"
+        for column, weight in zip(source.columns, WEIGHTS)
+    )
+
+
+def _postgres_install(cursor, source):
+    cursor.execute(
+        f"ALTER TABLE {source.table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({_postgres_vector(source)}) STORED"
+    )
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS {source.gin_index} ON {source.table} USING gin (search_vector)"
+    )
+
+
+def _postgres_uninstall(cursor, source):
+    cursor.execute(f"DROP INDEX IF EXISTS {source.gin_index}")
+    cursor.execute(f"ALTER TABLE {source.table} DROP COLUMN IF EXISTS search_vector")
+
+
+def _sqlite_install(cursor, source):
+    columns = ', '.join(source.columns)
+    new_values = ', '.join(f'new.{column}' for column in source.columns)
+    old_values = ', '.join(f'old.{column}' for column in source.columns)
+    fts = source.fts_table
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{columns}, content='{source.table}', content_rowid='rowid', "
+        f"tokenize='porter unicode61')"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source.table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.rowid, {new_values}); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source.table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.rowid, {old_values}); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {source.table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.rowid, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.rowid, {new_values}); END"
+    )
+
+
+def _sqlite_uninstall(cursor, source):
+    for suffix in ('ai', 'ad', 'au'):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {source.fts_table}_{suffix}")
+    cursor.execute(f"DROP TABLE IF EXISTS {source.fts_table}")
+
+
+def install(connection):
+    with connection.cursor() as cursor:
+        for source in SOURCES.values():
+            if connection.vendor == 'postgresql':
+                _postgres_install(cursor, source)
+            elif connection.vendor == 'sqlite':
+                _sqlite_install(cursor, source)
+
+
+def uninstall(connection):
+    with connection.cursor() as cursor:
+        for source in SOURCES.values():
+            if connection.vendor == 'postgresql':
+                _postgres_uninstall(cursor, source)
+            elif connection.vendor == 'sqlite':
+                _sqlite_uninstall(cursor, source)
+
+
+def rebuild(connection):
+    """
+    Re-index every row. PostgreSQL's generated columns never drift; on
+    SQLite the FTS tables are rebuilt from their content tables, which also
+    repairs rowids changed by ``VACUUM``.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for source in SOURCES.values():
+            cursor.execute(f"INSERT INTO {source.fts_table}({source.fts_table}) VALUES ('rebuild')")
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from search import indexes
+
+
+class Command(BaseCommand):
+    help = "Recreate missing full-text index objects and re-index every row."
+
+    def handle(self, *args, **options):
+        indexes.install(connection)
+        indexes.rebuild(connection)
+        self.stdout.write(
+            self.style.SUCCESS(f"Search indexes rebuilt for {', '.join(indexes.SOURCES)}.")
+        )
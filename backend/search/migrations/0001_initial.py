@@ -0,0 +1,25 @@
+from django.db import migrations
+
+from search import indexes
+
+
+def install(apps, schema_editor):
+    indexes.install(schema_editor.connection)
+    indexes.rebuild(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    indexes.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0002_assignment_assignment_created_idx_and_more'),
+        ('pg', '0004_compliancereport'),
+        ('proformas', '0003_proformatemplatesnapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
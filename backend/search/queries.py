@@ -0,0 +1,161 @@
+"""
+Ranked, highlighted queries against the ``search.indexes`` full-text indexes.
+
+Each searchable type is an ordinary queryset (so filters such as
+institution or template are plain ORM lookups) narrowed to the full-text
+matches, with two vendor-specific expressions added: a rank and a
+highlighted snippet.
+
+PostgreSQL parses the query with ``websearch_to_tsquery`` (quoted phrases,
+``or`` and ``-term`` work) and ranks with ``ts_rank_cd``. SQLite matches
+every word of the query through FTS5 and ranks with ``bm25``; the FTS5
+table is joined to the source table on rowid, so the index is searched once
+per query and ``bm25()``/``snippet()`` read the match in place. Snippets
+mark matches with ``<mark>``; the rest of the text is HTML-escaped.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, TextField
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+
+from assignments.models import ItemStatus
+from pg.models import PGItemCompliance
+from proformas.models import ProformaItem
+from .indexes import SEARCH_CONFIG, SOURCES
+
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_STOP = '\x03'
+# Relative weights of a source's columns, matching PostgreSQL's default
+# A/B/C/D rank weights.
+COLUMN_WEIGHTS = (1.0, 0.4, 0.2, 0.1)
+MAX_LIMIT = 100
+
+
+def _postgres_search(queryset, source, text):
+    """``queryset`` narrowed to rows matching ``text``, with rank and snippet expressions."""
+    table = source.table
+    tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+    options = (
+        f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+        "MaxFragments=2, MaxWords=24, MinWords=8"
+    )
+    document = "concat_ws(' ', {})".format(', '.join(f'{table}.{column}' for column in source.columns))
+    return (
+        queryset.filter(RawSQL(f"{table}.search_vector @@ {tsquery}", [text], output_field=BooleanField())),
+        RawSQL(f"ts_rank_cd({table}.search_vector, {tsquery})", [text], output_field=FloatField()),
+        RawSQL(
+            f"ts_headline('{SEARCH_CONFIG}', {document}, {tsquery}, %s)",
+            [text, options],
+            output_field=TextField(),
+        ),
+    )
+
+
+def _fts5_query(text):
+    # Quote each word so user input can never be parsed as FTS5 syntax.
+    return ' '.join(f'"{word}"' for word in re.findall(r'\w+', text))
+
+
+def _sqlite_search(queryset, source, text):
+    table, fts = source.table, source.fts_table
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS[:len(source.columns)])
+    # The ORM cannot join a table without a model; extra() adds it to FROM.
+    queryset = queryset.extra(
+        tables=[fts],
+        where=[f"{fts} MATCH %s", f"{fts}.rowid = {table}.rowid"],
+        params=[_fts5_query(text)],
+    )
+    return (
+        queryset,
+        RawSQL(f"-bm25({fts}, {weights})", [], output_field=FloatField()),
+        RawSQL(f"snippet({fts}, -1, char(2), char(3), '…', 24)", [], output_field=TextField()),
+    )
+
+
+def _items(institution=None, template=None):
+    queryset = ProformaItem.objects.all()
+    if template:
+        queryset = queryset.filter(section__template_id=template)
+    return queryset, {
+        'code': 'code',
+        'text': 'text',
+        'section_code': 'section__code',
+        'template': 'section__template_id',
+    }
+
+
+def _compliance(institution=None, template=None):
+    queryset = PGItemCompliance.objects.all()
+    if institution:
+        queryset = queryset.filter(institution_id=institution)
+    if template:
+        queryset = queryset.filter(item__section__template_id=template)
+    return queryset, {
+        'institution': 'institution_id',
+        'institution_name': 'institution__name',
+        'item': 'item_id',
+        'item_code': 'item__code',
+        'status': 'status',
+    }
+
+
+def _item_statuses(institution=None, template=None):
+    queryset = ItemStatus.objects.all()
+    if institution:
+        queryset = queryset.filter(assignment__program__institution_id=institution)
+    if template:
+        queryset = queryset.filter(assignment__template_id=template)
+    return queryset, {
+        'assignment': 'assignment_id',
+        'assignment_title': 'assignment__title',
+        'item': 'item_id',
+        'item_code': 'item__code',
+        'status': 'status',
+    }
+
+
+TYPES = {
+    'item': _items,
+    'compliance': _compliance,
+    'item_status': _item_statuses,
+}
+
+
+def highlight(snippet):
+    return escape(snippet or '').replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_STOP, '</mark>')
+
+
+def search(text, types=None, institution=None, template=None, limit=20):
+    """
+    Return up to ``limit`` results across ``types`` (default: all), best
+    first. Each result carries its ``type``, ``id``, ``rank``, highlighted
+    ``snippet`` and a few identifying fields of the matched row.
+    """
+    if not re.search(r'\w', text):
+        return []
+    limit = max(1, min(limit, MAX_LIMIT))
+    full_text_search = _postgres_search if connection.vendor == 'postgresql' else _sqlite_search
+
+    results = []
+    for name in types or TYPES:
+        queryset, fields = TYPES[name](institution=institution, template=template)
+        queryset, rank, snippet = full_text_search(queryset, SOURCES[name], text)
+        rows = (
+            queryset
+            .annotate(rank=rank)
+            .order_by('-rank')
+            .values('id', 'rank', *fields.values(), snippet=snippet)[:limit]
+        )
+        for row in rows:
+            results.append({
+                'type': name,
+                'id': row['id'],
+                'rank': row['rank'],
+                'snippet': highlight(row['snippet']),
+                **{alias: row[lookup] for alias, lookup in fields.items()},
+            })
+
+    results.sort(key=lambda row: row['rank'], reverse=True)
+    return results[:limit]
@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from modules.models import Module
+from organizations.models import Institution
+from pg.models import PGItemCompliance
+from proformas.models import ProformaItem, ProformaSection, ProformaTemplate
+
+
+class SearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reviewer', is_staff=True)
+        module = Module.objects.create(code='PG', display_name='Postgraduate')
+        template = ProformaTemplate.objects.create(module=module, code='T1', title='Template')
+        section = ProformaSection.objects.create(template=template, title='Section')
+        items = [
+            ProformaItem.objects.create(section=section, text='Faculty register maintained', order=1),
+            ProformaItem.objects.create(section=section, text='Library stocked', order=2),
+        ]
+        cls.institutions = [Institution.objects.create(name=f'Institution {n}') for n in range(2)]
+        PGItemCompliance.objects.create(institution=cls.institutions[0], item=items[0],
+                                        comment='Faculty shortage noted, faculty <b>register</b> incomplete')
+        PGItemCompliance.objects.create(institution=cls.institutions[1], item=items[0], comment='Faculty shortage')
+        PGItemCompliance.objects.create(institution=cls.institutions[1], item=items[1], comment='Library closed')
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def search(self, query):
+        # One query per type, whatever the number of matches.
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/search/?type=compliance&{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_ranks_and_highlights_matches(self):
+        results = self.search('q=faculty shortage')
+        self.assertEqual(len(results), 2)
+        self.assertGreater(results[0]['rank'], results[1]['rank'])
+        # bm25 favours the shorter comment.
+        self.assertEqual(results[0]['snippet'], '<mark>Faculty</mark> <mark>shortage</mark>')
+        self.assertIn('<mark>Faculty</mark> <mark>shortage</mark>', results[1]['snippet'])
+        self.assertIn('&lt;b&gt;', results[1]['snippet'])
+
+    def test_filters_apply_with_the_match(self):
+        results = self.search(f'q=faculty&institution={self.institutions[1].pk}')
+        self.assertEqual([row['institution'] for row in results], [self.institutions[1].pk])
+        self.assertEqual(self.search('q=nothing'), [])
+
+    def test_all_types(self):
+        types = {row['type'] for row in self.client.get('/api/search/?q=faculty').data['results']}
+        self.assertEqual(types, {'item', 'compliance'})
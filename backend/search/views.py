@@ -0,0 +1,47 @@
+import time
+import uuid
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from . import queries
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search(request):
+    """
+    Full-text search over checklist items and review comments.
+
+    ``?q=`` is required. Narrow with ``?type=`` (repeatable: item,
+    compliance, item_status), ``?institution=``, ``?template=`` and
+    ``?limit=`` (default 20, at most 100).
+    """
+    text = request.query_params.get('q', '').strip()
+    types = request.query_params.getlist('type')
+    if not text:
+        return Response({'detail': 'q is required.'}, status=status.HTTP_400_BAD_REQUEST)
+    unknown = set(types) - set(queries.TYPES)
+    if unknown:
+        return Response(
+            {'detail': f"Unknown type: {', '.join(sorted(unknown))}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        institution = request.query_params.get('institution', None)
+        template = request.query_params.get('template', None)
+        institution = uuid.UUID(institution) if institution else None
+        template = uuid.UUID(template) if template else None
+        limit = int(request.query_params.get('limit', 20))
+    except ValueError:
+        return Response({'detail': 'Invalid filter value.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    started = time.perf_counter()
+    results = queries.search(text, types, institution=institution, template=template, limit=limit)
+    return Response({
+        'query': text,
+        'count': len(results),
+        'took_ms': round((time.perf_counter() - started) * 1000, 1),
+        'results': results,
+    })
@@ -7,6 +7,8 @@ import { Assignment } from "../../lib/types";
 export default function AssignmentsPage() {
   const [assignments, setAssignments] = useState<Assignment[]>([]);
   const [loading, setLoading] = useState(true);
+  const [next, setNext] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const router = useRouter();
 
   useEffect(() => {
@@ -17,11 +19,24 @@ export default function AssignmentsPage() {
     }
 
     getAssignments()
-      .then(setAssignments)
+      .then((page) => {
+        setAssignments(page.results);
+        setNext(page.next);
+      })
       .catch(() => setAssignments([]))
       .finally(() => setLoading(false));
   }, [router]);
 
+  const loadMore = () => {
+    setLoadingMore(true);
+    getAssignments(next)
+      .then((page) => {
+        setAssignments((current) => [...current, ...page.results]);
+        setNext(page.next);
+      })
+      .finally(() => setLoadingMore(false));
+  };
+
   if (loading) return <main style={{ padding: 24 }}><p>Loading...</p></main>;
 
   return (
@@ -51,12 +66,17 @@ export default function AssignmentsPage() {
                 <td style={{ border: "1px solid #ccc", padding: 8 }}>{assignment.program_name}</td>
                 <td style={{ border: "1px solid #ccc", padding: 8 }}>{assignment.template_title}</td>
                 <td style={{ border: "1px solid #ccc", padding: 8 }}>{assignment.status}</td>
-                <td style={{ border: "1px solid #ccc", padding: 8 }}>{assignment.item_statuses?.length || 0} items</td>
+                <td style={{ border: "1px solid #ccc", padding: 8 }}>{assignment.item_count ?? 0} items</td>
               </tr>
             ))}
           </tbody>
         </table>
       )}
+      {next && (
+        <button onClick={loadMore} disabled={loadingMore} style={{ marginTop: 16, padding: "8px 16px" }}>
+          {loadingMore ? "Loading..." : "Load more"}
+        </button>
+      )}
     </main>
   );
 }
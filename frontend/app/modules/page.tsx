@@ -7,6 +7,8 @@ import { Module } from "../../lib/types";
 export default function ModulesPage() {
   const [modules, setModules] = useState<Module[]>([]);
   const [loading, setLoading] = useState(true);
+  const [next, setNext] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const router = useRouter();
 
   useEffect(() => {
@@ -17,11 +19,24 @@ export default function ModulesPage() {
     }
 
     getModules()
-      .then(setModules)
+      .then((page) => {
+        setModules(page.results);
+        setNext(page.next);
+      })
       .catch(() => setModules([]))
       .finally(() => setLoading(false));
   }, [router]);
 
+  const loadMore = () => {
+    setLoadingMore(true);
+    getModules(next)
+      .then((page) => {
+        setModules((current) => [...current, ...page.results]);
+        setNext(page.next);
+      })
+      .finally(() => setLoadingMore(false));
+  };
+
   if (loading) return <main style={{ padding: 24 }}><p>Loading...</p></main>;
 
   return (
@@ -44,6 +59,11 @@ export default function ModulesPage() {
           ))}
         </ul>
       )}
+      {next && (
+        <button onClick={loadMore} disabled={loadingMore} style={{ marginTop: 16, padding: "8px 16px" }}>
+          {loadingMore ? "Loading..." : "Load more"}
+        </button>
+      )}
     </main>
   );
 }
@@ -7,6 +7,8 @@ import { ProformaTemplate, Institution, PGItemCompliance } from "../../lib/types
 export default function PGRegulationsPage() {
   const [templates, setTemplates] = useState<ProformaTemplate[]>([]);
   const [institutions, setInstitutions] = useState<Institution[]>([]);
+  const [templatesNext, setTemplatesNext] = useState<string | null>(null);
+  const [institutionsNext, setInstitutionsNext] = useState<string | null>(null);
   const [selectedTemplate, setSelectedTemplate] = useState<ProformaTemplate | null>(null);
   const [selectedInstitution, setSelectedInstitution] = useState<string>("");
   const [compliances, setCompliances] = useState<Record<string, PGItemCompliance>>({});
@@ -22,11 +24,13 @@ export default function PGRegulationsPage() {
     }
 
     Promise.all([getProformas(), getInstitutions()])
-      .then(([templatesData, institutionsData]) => {
-        setTemplates(templatesData);
-        setInstitutions(institutionsData);
+      .then(([templatesPage, institutionsPage]) => {
+        setTemplates(templatesPage.results);
+        setTemplatesNext(templatesPage.next);
+        setInstitutions(institutionsPage.results);
+        setInstitutionsNext(institutionsPage.next);
         // Auto-select PMDC-PG-2023 template if available
-        const pgTemplate = templatesData.find((t: ProformaTemplate) => t.code === "PMDC-PG-2023");
+        const pgTemplate = templatesPage.results.find((t: ProformaTemplate) => t.code === "PMDC-PG-2023");
         if (pgTemplate) {
           setSelectedTemplate(pgTemplate);
         }
@@ -41,7 +45,7 @@ export default function PGRegulationsPage() {
   useEffect(() => {
     if (selectedInstitution && selectedTemplate) {
       // Load existing compliances for this institution
-      getPGCompliances(selectedInstitution)
+      getPGCompliances(selectedInstitution, selectedTemplate.id)
         .then((data) => {
           const complianceMap: Record<string, PGItemCompliance> = {};
           data.forEach((c: PGItemCompliance) => {
@@ -53,6 +57,20 @@ export default function PGRegulationsPage() {
     }
   }, [selectedInstitution, selectedTemplate]);
 
+  const loadMoreTemplates = () => {
+    getProformas(templatesNext).then((page) => {
+      setTemplates((current) => [...current, ...page.results]);
+      setTemplatesNext(page.next);
+    });
+  };
+
+  const loadMoreInstitutions = () => {
+    getInstitutions(institutionsNext).then((page) => {
+      setInstitutions((current) => [...current, ...page.results]);
+      setInstitutionsNext(page.next);
+    });
+  };
+
   const handleStatusChange = async (itemId: string, status: string) => {
     if (!selectedInstitution) return;
 
@@ -151,9 +169,14 @@ export default function PGRegulationsPage() {
               </option>
             ))}
           </select>
+          {institutionsNext && (
+            <button onClick={loadMoreInstitutions} style={{ marginTop: 8, padding: "4px 12px" }}>
+              Load more institutions
+            </button>
+          )}
         </div>
 
-        {templates.length > 1 && (
+        {(templates.length > 1 || templatesNext) && (
           <div style={{ marginBottom: 16 }}>
             <label style={{ display: "block", marginBottom: 8, fontWeight: "bold" }}>
               Select Module:
@@ -179,6 +202,11 @@ export default function PGRegulationsPage() {
                 </option>
               ))}
             </select>
+            {templatesNext && (
+              <button onClick={loadMoreTemplates} style={{ marginTop: 8, padding: "4px 12px" }}>
+                Load more modules
+              </button>
+            )}
           </div>
         )}
       </div>
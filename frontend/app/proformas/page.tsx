@@ -7,6 +7,8 @@ import { ProformaTemplate } from "../../lib/types";
 export default function ProformasPage() {
   const [proformas, setProformas] = useState<ProformaTemplate[]>([]);
   const [loading, setLoading] = useState(true);
+  const [next, setNext] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const router = useRouter();
 
   useEffect(() => {
@@ -17,11 +19,24 @@ export default function ProformasPage() {
     }
 
     getProformas()
-      .then(setProformas)
+      .then((page) => {
+        setProformas(page.results);
+        setNext(page.next);
+      })
       .catch(() => setProformas([]))
       .finally(() => setLoading(false));
   }, [router]);
 
+  const loadMore = () => {
+    setLoadingMore(true);
+    getProformas(next)
+      .then((page) => {
+        setProformas((current) => [...current, ...page.results]);
+        setNext(page.next);
+      })
+      .finally(() => setLoadingMore(false));
+  };
+
   if (loading) return <main style={{ padding: 24 }}><p>Loading...</p></main>;
 
   return (
@@ -45,6 +60,11 @@ export default function ProformasPage() {
           ))}
         </ul>
       )}
+      {next && (
+        <button onClick={loadMore} disabled={loadingMore} style={{ marginTop: 16, padding: "8px 16px" }}>
+          {loadingMore ? "Loading..." : "Load more"}
+        </button>
+      )}
     </main>
   );
 }
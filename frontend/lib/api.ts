@@ -20,6 +20,16 @@ function getAuthHeaders() {
   return accessToken ? { Authorization: `Bearer ${accessToken}` } : {};
 }
 
+// List endpoints are cursor-paginated ({ next, previous, results }). Views
+// load one page at a time and pass `next` back in to fetch the following
+// page on demand.
+export type Page<T> = { next: string | null; results: T[] };
+
+async function getPage<T = any>(url: string): Promise<Page<T>> {
+  const response = await axios.get(url, { headers: getAuthHeaders() });
+  return { next: response.data.next, results: response.data.results };
+}
+
 export async function getDashboardSummary() {
   const response = await axios.get(`${API_BASE}/dashboard/summary/`, {
     headers: getAuthHeaders(),
@@ -34,18 +44,12 @@ export async function getModuleById(id: string) {
   return response.data;
 }
 
-export async function getModules() {
-  const response = await axios.get(`${API_BASE}/modules/`, {
-    headers: getAuthHeaders(),
-  });
-  return response.data;
+export async function getModules(next?: string | null) {
+  return getPage(next || `${API_BASE}/modules/`);
 }
 
-export async function getProformas() {
-  const response = await axios.get(`${API_BASE}/proformas/`, {
-    headers: getAuthHeaders(),
-  });
-  return response.data;
+export async function getProformas(next?: string | null) {
+  return getPage(next || `${API_BASE}/proformas/`);
 }
 
 export async function getProformaById(id: string) {
@@ -55,38 +59,33 @@ export async function getProformaById(id: string) {
   return response.data;
 }
 
-export async function getAssignments() {
-  const response = await axios.get(`${API_BASE}/assignments/`, {
-    headers: getAuthHeaders(),
-  });
-  return response.data;
+export async function getAssignments(next?: string | null) {
+  return getPage(next || `${API_BASE}/assignments/`);
 }
 
 export async function getAssignmentById(id: string) {
-  const response = await axios.get(`${API_BASE}/assignments/${id}/`, {
+  const response = await axios.get(`${API_BASE}/assignments/${id}/?expand=item_statuses`, {
     headers: getAuthHeaders(),
   });
   return response.data;
 }
 
-export async function getInstitutions() {
-  const response = await axios.get(`${API_BASE}/organizations/institutions/`, {
-    headers: getAuthHeaders(),
-  });
-  return response.data;
+export async function getInstitutions(next?: string | null) {
+  return getPage(next || `${API_BASE}/organizations/institutions/`);
 }
 
-export async function getPGCompliances(institutionId?: string, itemId?: string) {
-  let url = `${API_BASE}/pg/compliance/`;
-  const params = new URLSearchParams();
-  if (institutionId) params.append('institution', institutionId);
-  if (itemId) params.append('item', itemId);
-  if (params.toString()) url += `?${params.toString()}`;
-  
-  const response = await axios.get(url, {
-    headers: getAuthHeaders(),
-  });
-  return response.data;
+// One institution's rows for one template: bounded by the template's item
+// count, so the few pages (of up to 500 rows) are all fetched.
+export async function getPGCompliances(institutionId: string, templateId: string) {
+  const params = new URLSearchParams({ institution: institutionId, template: templateId, page_size: "500" });
+  let results: any[] = [];
+  let next: string | null = `${API_BASE}/pg/compliance/?${params.toString()}`;
+  while (next) {
+    const page: Page<any> = await getPage(next);
+    results = results.concat(page.results);
+    next = page.next;
+  }
+  return results;
 }
 
 export async function createPGCompliance(data: {
@@ -112,3 +111,55 @@ export async function updatePGCompliance(id: string, data: {
   });
   return response.data;
 }
+
+export async function bulkUpsertPGCompliance(rows: {
+  institution: string;
+  item: string;
+  status?: string;
+  comment?: string;
+  evidence_url?: string;
+}[]) {
+  const response = await axios.post(`${API_BASE}/pg/compliance/bulk/`, rows, {
+    headers: getAuthHeaders(),
+  });
+  return response.data;
+}
+
+export async function getPGComplianceMatrix(templateId: string, institutionIds?: string[]) {
+  const params = new URLSearchParams({ template: templateId });
+  (institutionIds || []).forEach((id) => params.append('institution', id));
+  const response = await axios.get(`${API_BASE}/pg/compliance/matrix/?${params.toString()}`, {
+    headers: getAuthHeaders(),
+  });
+  return response.data;
+}
+
+// Expand a matrix response's `data` into one status code per cell (row-major).
+export function decodeComplianceMatrix(matrix: { encoding: string; data: string | number[] }) {
+  if (matrix.encoding === 'rle') {
+    const runs = matrix.data as number[];
+    const cells: number[] = [];
+    for (let i = 0; i < runs.length; i += 2) {
+      for (let n = 0; n < runs[i + 1]; n++) cells.push(runs[i]);
+    }
+    return Uint8Array.from(cells);
+  }
+  return Uint8Array.from(atob(matrix.data as string), (c) => c.charCodeAt(0));
+}
+
+export async function search(query: string, options: {
+  types?: ('item' | 'compliance' | 'item_status')[];
+  institution?: string;
+  template?: string;
+  limit?: number;
+} = {}) {
+  const params = new URLSearchParams({ q: query });
+  (options.types || []).forEach((type) => params.append('type', type));
+  if (options.institution) params.append('institution', options.institution);
+  if (options.template) params.append('template', options.template);
+  if (options.limit) params.append('limit', String(options.limit));
+  const response = await axios.get(`${API_BASE}/search/?${params.toString()}`, {
+    headers: getAuthHeaders(),
+  });
+  return response.data;
+}
@@ -59,7 +59,8 @@ export type Assignment = {
   program_name: string;
   title: string;
   status: string;
-  item_statuses: ItemStatus[];
+  item_statuses?: ItemStatus[];
+  item_count?: number;
   created_at: string;
   updated_at: string;
 };